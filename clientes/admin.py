@@ -1,13 +1,17 @@
 from django.contrib import admin
+from core.changelist import KeysetPaginationAdminMixin
 from organization.admin import EnterpriseFilteredAdminMixin
 from .models import Client
+from .search import build_client_search_q
 
 
 @admin.register(Client)
-class ClientAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
+class ClientAdmin(KeysetPaginationAdminMixin, EnterpriseFilteredAdminMixin, admin.ModelAdmin):
+    keyset_ordering = ("name", "id")
 
     list_display = ("name", "email", "cpf")
-    search_fields = ("name", "email", "cpf")
+    search_fields = ("name", "email", "cpf", "whatsapp")
+    search_help_text = "Busque por nome, e-mail, CPF ou WhatsApp."
     ordering = ("name",)
 
     # Domínio só aparece para superuser
@@ -27,6 +31,14 @@ class ClientAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
             return ["domain_display"] + base
         return base
 
+    # -----------------------------
+    # BUSCA — colunas normalizadas + índices trigram
+    # -----------------------------
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(build_client_search_q(search_term)), False
+
     # -----------------------------
     # FILTROS
     # -----------------------------
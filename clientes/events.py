@@ -0,0 +1,29 @@
+from outbox.services import OutboxService
+
+# Eventos de domínio (routing key do outbox)
+CLIENT_CREATED = "clientes.client.created"
+CLIENT_UPDATED = "clientes.client.updated"
+
+
+def client_event_payload(client):
+    return {
+        "id": str(client.id),
+        "enterprise_id": str(client.enterprise_id),
+        "name": client.name,
+        "email": client.email,
+        "cpf": client.cpf,
+        "whatsapp": client.whatsapp,
+    }
+
+
+def record_client_event(client, created):
+    """
+    Chamado por Client.save dentro da transação do próprio save: a linha do
+    client e a do outbox são gravadas (ou desfeitas) juntas.
+    """
+    OutboxService.record(
+        CLIENT_CREATED if created else CLIENT_UPDATED,
+        "client",
+        client.id,
+        client_event_payload(client),
+    )
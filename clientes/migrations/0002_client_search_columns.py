@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:47
+
+from django.contrib.postgres.operations import BtreeGinExtension, TrigramExtension
+from django.db import migrations, models
+
+from clientes.search import normalize_name, only_digits, normalize_whatsapp
+
+
+def backfill_search_columns(apps, schema_editor):
+    Client = apps.get_model("clientes", "Client")
+
+    batch = []
+    for client in Client.objects.only("id", "name", "cpf", "whatsapp").iterator(chunk_size=2000):
+        client.name_search = normalize_name(client.name)
+        client.cpf_digits = only_digits(client.cpf)
+        client.whatsapp_e164 = normalize_whatsapp(client.whatsapp)
+        batch.append(client)
+
+        if len(batch) >= 2000:
+            Client.objects.bulk_update(batch, ["name_search", "cpf_digits", "whatsapp_e164"])
+            batch = []
+
+    if batch:
+        Client.objects.bulk_update(batch, ["name_search", "cpf_digits", "whatsapp_e164"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0001_initial'),
+        ('organization', '0008_schedulingconfig'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        BtreeGinExtension(),
+        migrations.AddField(
+            model_name='client',
+            name='cpf_digits',
+            field=models.CharField(blank=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='name_search',
+            field=models.CharField(blank=True, default='', editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='whatsapp_e164',
+            field=models.CharField(blank=True, default='', editable=False, max_length=21),
+        ),
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+        # índices GIN criados sem bloquear escrita em 0003 (CONCURRENTLY)
+    ]
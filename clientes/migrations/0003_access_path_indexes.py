@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:50
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0002_client_search_columns'),
+        ('organization', '0009_access_path_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='client',
+            index=models.Index(fields=['enterprise', 'name', 'id'], name='client_ent_name_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(models.F('enterprise'), django.contrib.postgres.indexes.OpClass('name_search', name='gin_trgm_ops'), name='client_name_search_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(models.F('enterprise'), django.contrib.postgres.indexes.OpClass('cpf_digits', name='gin_trgm_ops'), name='client_cpf_digits_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(models.F('enterprise'), django.contrib.postgres.indexes.OpClass('whatsapp_e164', name='gin_trgm_ops'), name='client_whatsapp_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(models.F('enterprise'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='client_email_upper_trgm'),
+        ),
+    ]
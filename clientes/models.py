@@ -1,7 +1,11 @@
 import uuid
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.core.exceptions import ValidationError
 from organization.models import Enterprise
+from .events import record_client_event
+from .search import normalize_name, only_digits, normalize_whatsapp
 
 
 class Client(models.Model):
@@ -51,6 +55,11 @@ class Client(models.Model):
         verbose_name="WhatsApp"
     )
 
+    # ---- Colunas normalizadas para busca (preenchidas no save) ----
+    name_search = models.CharField(max_length=150, blank=True, default="", editable=False)
+    cpf_digits = models.CharField(max_length=14, blank=True, default="", editable=False)
+    whatsapp_e164 = models.CharField(max_length=21, blank=True, default="", editable=False)
+
     # ---- Endereço (opcional) ----
     address_street = models.CharField(max_length=150, blank=True, null=True, verbose_name="Rua")
     address_number = models.CharField(max_length=20, blank=True, null=True, verbose_name="Número")
@@ -78,9 +87,59 @@ class Client(models.Model):
             ),
         ]
 
+        # Busca trigram escopada por enterprise (requer pg_trgm + btree_gin)
+        indexes = [
+            # Changelist do admin (paginação keyset por nome)
+            models.Index(
+                fields=["enterprise", "name", "id"],
+                name="client_ent_name_id_idx",
+            ),
+            GinIndex(
+                "enterprise",
+                OpClass("name_search", name="gin_trgm_ops"),
+                name="client_name_search_trgm",
+            ),
+            GinIndex(
+                "enterprise",
+                OpClass("cpf_digits", name="gin_trgm_ops"),
+                name="client_cpf_digits_trgm",
+            ),
+            GinIndex(
+                "enterprise",
+                OpClass("whatsapp_e164", name="gin_trgm_ops"),
+                name="client_whatsapp_trgm",
+            ),
+            GinIndex(
+                "enterprise",
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="client_email_upper_trgm",
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
+    def normalize_search_fields(self):
+        self.name_search = normalize_name(self.name)
+        self.cpf_digits = only_digits(self.cpf)
+        self.whatsapp_e164 = normalize_whatsapp(self.whatsapp)
+
+    def save(self, *args, **kwargs):
+        self.normalize_search_fields()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {
+                "name_search", "cpf_digits", "whatsapp_e164"
+            }
+
+        # o evento do outbox vai no mesmo commit: erro ao gravar o evento
+        # desfaz o save
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            record_client_event(self, created)
+
     def clean(self):
         """
         Validações adicionais:
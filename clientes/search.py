@@ -0,0 +1,79 @@
+import re
+import unicodedata
+
+from django.db.models import Q
+
+
+# ============================================================
+# NORMALIZAÇÃO DOS CAMPOS DE BUSCA
+# ============================================================
+def normalize_name(value):
+    """
+    Remove acentos, converte para minúsculas e colapsa espaços.
+    "  José  da SILVA " -> "jose da silva"
+    """
+    if not value:
+        return ""
+
+    decomposed = unicodedata.normalize("NFKD", value)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(without_accents.lower().split())
+
+
+def only_digits(value):
+    if not value:
+        return ""
+    return re.sub(r"\D", "", value)
+
+
+def normalize_whatsapp(value, default_country="55"):
+    """
+    Converte o WhatsApp para E.164.
+    Números nacionais (DDD + número) recebem o código do país padrão.
+    "(11) 98888-7777" -> "+5511988887777"
+    """
+    digits = only_digits(value)
+    if not digits:
+        return ""
+
+    # 10 ou 11 dígitos = DDD + número sem código do país
+    if len(digits) in (10, 11):
+        digits = default_country + digits
+
+    return f"+{digits}"
+
+
+# ============================================================
+# BUSCA NOS CAMPOS NORMALIZADOS (pg_trgm)
+# ============================================================
+MIN_DIGITS_SEARCH = 3
+
+
+def build_client_search_q(term, prefix=""):
+    """
+    Monta o filtro de busca de clientes sobre as colunas normalizadas.
+
+    Os `contains` viram `LIKE '%x%'` sobre colunas já normalizadas,
+    atendidos pelos índices GIN trigram (enterprise_id + coluna). O e-mail
+    continua com busca parcial em todo termo ("gmail", "joao123" também
+    acham pelo e-mail): `icontains` vira `UPPER(email) LIKE`, atendido pelo
+    trigram sobre UPPER(email).
+    `prefix` permite buscar através de relações (ex: "client__").
+    """
+    term = (term or "").strip()
+    if not term:
+        return Q()
+
+    by_email = Q(**{f"{prefix}email__icontains": term})
+    if "@" in term:
+        return by_email
+
+    digits = only_digits(term)
+    if digits and len(digits) >= MIN_DIGITS_SEARCH and not re.search(r"[^\d\s().+\-/]", term):
+        return (
+            Q(**{f"{prefix}cpf_digits__contains": digits})
+            | Q(**{f"{prefix}whatsapp_e164__contains": digits})
+            | by_email
+        )
+
+    return Q(**{f"{prefix}name_search__contains": normalize_name(term)}) | by_email
@@ -0,0 +1,35 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import User
+
+from clientes.events import CLIENT_CREATED, CLIENT_UPDATED
+from clientes.models import Client
+from management.models import Contract
+from outbox.models import OutboxEvent
+
+
+@pytest.fixture
+def enterprise():
+    owner = User.objects.create(username="owner-outbox")
+    return Contract.objects.create(domain="empresa-outbox", user=owner).enterprise
+
+
+@pytest.mark.django_db
+def test_save_records_created_and_updated_events(enterprise):
+    client = Client.objects.create(enterprise=enterprise, name="Cliente Outbox")
+    client.name = "Cliente Outbox 2"
+    client.save()
+
+    events = OutboxEvent.objects.filter(aggregate_id=str(client.id)).order_by("id")
+    assert [e.event_type for e in events] == [CLIENT_CREATED, CLIENT_UPDATED]
+    assert events.last().payload["name"] == "Cliente Outbox 2"
+
+
+@pytest.mark.django_db
+def test_outbox_failure_rolls_back_client_write(enterprise):
+    with patch("clientes.events.OutboxService.record", side_effect=RuntimeError("outbox fora")), \
+            pytest.raises(RuntimeError):
+        Client.objects.create(enterprise=enterprise, name="Sem Evento")
+
+    assert not Client.objects.filter(name="Sem Evento").exists()
@@ -0,0 +1,47 @@
+from clientes.search import (
+    build_client_search_q,
+    normalize_name,
+    normalize_whatsapp,
+    only_digits,
+)
+
+
+def test_normalize_name_removes_accents_case_and_extra_spaces():
+    assert normalize_name("  José  da SILVA ") == "jose da silva"
+    assert normalize_name("Conceição Araújo") == "conceicao araujo"
+    assert normalize_name(None) == ""
+
+
+def test_only_digits_strips_cpf_mask():
+    assert only_digits("123.456.789-09") == "12345678909"
+    assert only_digits(None) == ""
+
+
+def test_normalize_whatsapp_adds_country_code_to_national_numbers():
+    assert normalize_whatsapp("(11) 98888-7777") == "+5511988887777"
+    assert normalize_whatsapp("+55 11 98888-7777") == "+5511988887777"
+    assert normalize_whatsapp("") == ""
+
+
+def test_search_q_picks_normalized_column_by_term_shape():
+    """
+    - texto livre -> name_search normalizado
+    - números/máscara -> cpf_digits ou whatsapp_e164
+    - e-mail -> busca parcial case-insensitive (em todo termo)
+    """
+    by_name = build_client_search_q("José", prefix="client__")
+    assert ("client__name_search__contains", "jose") in by_name.children
+    assert ("client__email__icontains", "José") in by_name.children
+
+    by_digits = build_client_search_q("123.456")
+    assert ("cpf_digits__contains", "123456") in by_digits.children
+    assert ("whatsapp_e164__contains", "123456") in by_digits.children
+    assert ("email__icontains", "123.456") in by_digits.children
+
+    by_domain = build_client_search_q("gmail")
+    assert ("email__icontains", "gmail") in by_domain.children
+
+    by_email = build_client_search_q("Ana@Mail.com")
+    assert by_email.children == [("email__icontains", "Ana@Mail.com")]
+
+    assert not build_client_search_q("   ")
@@ -1,6 +1,10 @@
 from django.contrib import admin
 from django.contrib.admin import AdminSite
-from organization.models import Enterprise
+from django.http import JsonResponse
+from django.urls import path
+
+from core.utils import invalidation_bus
+from organization.tenant_cache import TenantCacheService
 
 
 class CustomAdminSite(AdminSite):
@@ -13,16 +17,37 @@ class CustomAdminSite(AdminSite):
 
         enterprise_id = request.session.get("enterprise_id")
         if enterprise_id:
-            try:
-                enterprise = Enterprise.objects.get(id=enterprise_id)
-                ctx["site_header"] = enterprise.name
-                ctx["site_title"] = enterprise.name
+            name = TenantCacheService.enterprise_name(enterprise_id)
+            if name is not None:
+                ctx["site_header"] = name
+                ctx["site_title"] = name
                 ctx["index_title"] = "Administração"
-            except Enterprise.DoesNotExist:
-                pass
 
         return ctx
 
+    def get_urls(self):
+        return [
+            path(
+                "cache-invalidation/metrics/",
+                self.admin_view(self.cache_invalidation_metrics),
+                name="cache_invalidation_metrics",
+            ),
+            path(
+                "messaging/metrics/",
+                self.admin_view(self.messaging_metrics),
+                name="messaging_metrics",
+            ),
+        ] + super().get_urls()
+
+    def cache_invalidation_metrics(self, request):
+        return JsonResponse(invalidation_bus.metrics())
+
+    def messaging_metrics(self, request):
+        # import tardio: kombu só quando a métrica é consultada
+        from infra.messaging import async_publisher
+
+        return JsonResponse(async_publisher.metrics())
+
 
 custom_admin_site = CustomAdminSite(name="custom_admin")
 
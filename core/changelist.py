@@ -0,0 +1,108 @@
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import F
+from django.db.models.fields.tuple_lookups import Tuple, TupleGreaterThan
+
+from core.utils.pagination import (
+    cached_enterprise_count,
+    decode_cursor,
+    encode_cursor,
+    planner_estimated_rows,
+    table_estimated_rows,
+)
+
+CURSOR_VAR = "cursor"
+
+
+# ============================================================
+# CHANGELIST COM PAGINAÇÃO KEYSET
+# ============================================================
+class KeysetChangeList(ChangeList):
+    """
+    ChangeList que pagina por "seek" em vez de OFFSET:
+
+        WHERE (date, start_time, id) > (%s, %s, %s) ORDER BY date, start_time, id LIMIT n+1
+
+    Toda página custa o mesmo que a primeira. O total exibido é estimado
+    (contador em cache por enterprise, EXPLAIN ou pg_class.reltuples).
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filtros, busca e ordenação sempre voltam para a primeira página
+        if not new_params or CURSOR_VAR not in new_params:
+            remove = [*(remove or []), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+
+    def get_results(self, request):
+        keyset = list(self.model_admin.keyset_ordering)
+        per_page = self.list_per_page
+
+        queryset = self.queryset.order_by(*keyset)
+
+        cursor = decode_cursor(
+            request.GET.get(CURSOR_VAR), [self.lookup_opts.get_field(f) for f in keyset]
+        )
+        if cursor:
+            queryset = queryset.filter(
+                TupleGreaterThan(Tuple(*(F(f) for f in keyset)), cursor)
+            )
+
+        rows = list(queryset[: per_page + 1])
+        has_next = len(rows) > per_page
+        result_list = rows[:per_page]
+
+        self.next_cursor_url = None
+        if has_next:
+            last = result_list[-1]
+            token = encode_cursor(
+                [getattr(last, self.lookup_opts.get_field(f).attname) for f in keyset]
+            )
+            self.next_cursor_url = self.get_query_string({CURSOR_VAR: token})
+        self.first_page_url = self.get_query_string() if cursor else None
+
+        self.result_count = self.model_admin.get_estimated_count(request, self)
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.result_list = result_list
+        self.can_show_all = False
+        self.multi_page = has_next or bool(cursor)
+        self.paginator = None
+
+
+# ============================================================
+# MIXIN PARA O MODELADMIN
+# ============================================================
+class KeysetPaginationAdminMixin:
+    """
+    Ativa o KeysetChangeList. `keyset_ordering` precisa terminar em uma
+    coluna única (ex: id) e ter um índice correspondente.
+    """
+
+    keyset_ordering = ("id",)
+    change_list_template = "admin/keyset_change_list.html"
+    sortable_by = ()
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_estimated_count(self, request, cl):
+        filtered = bool(cl.query) or bool(cl.has_active_filters)
+
+        if filtered:
+            return planner_estimated_rows(cl.queryset)
+
+        if request.user.is_superuser:
+            estimate = table_estimated_rows(self.model)
+            if estimate is not None:
+                return estimate
+            return planner_estimated_rows(cl.queryset)
+
+        return cached_enterprise_count(
+            cl.queryset, request.session.get("enterprise_id")
+        )
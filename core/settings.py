@@ -38,13 +38,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    
+    'django.contrib.postgres',
+
     'organization',
     'products',
     'management',
     'perfil',
     'clientes',
     'schedule',
+    'outbox',
 ]
 
 MIDDLEWARE = [
@@ -116,6 +118,9 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://host.docker.internal:6379/1")
 
+# Token do scrape em /metrics/ (vazio = endpoint fechado, responde 403)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
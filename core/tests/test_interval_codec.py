@@ -0,0 +1,25 @@
+import pickle
+
+from core.utils import interval_codec
+
+
+def test_roundtrip_with_metadata():
+    pairs = [(480, 545), (600, 725), (0, 1439)]
+    data = interval_codec.encode(pairs, {"v": "3.1.7"})
+
+    assert interval_codec.decode(data) == ({"v": "3.1.7"}, pairs)
+    assert interval_codec.decode_meta(data) == {"v": "3.1.7"}
+
+
+def test_packed_entry_is_smaller_than_pickled_dicts():
+    windows = [{"start": "08:00", "end": "09:05"}, {"start": "10:00", "end": "12:05"}]
+    pickled = pickle.dumps({"version": "3.1.7", "windows": windows})
+    packed = interval_codec.encode([(480, 545), (600, 725)], {"v": "3.1.7"})
+
+    assert len(packed) < len(pickled) / 3
+
+
+def test_text_metadata_is_stored_raw():
+    data = interval_codec.encode([(1, 2)], "3.1.7")
+    assert data[4:9] == b"3.1.7"
+    assert interval_codec.decode(data) == ("3.1.7", [(1, 2)])
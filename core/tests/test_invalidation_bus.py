@@ -0,0 +1,25 @@
+import json
+import time
+
+from core.utils import invalidation_bus
+
+
+def test_chunks_respect_notify_payload_limit():
+    keys = [f"{i:036d}" for i in range(500)]
+    chunks = list(invalidation_bus._chunks("ns", keys))
+
+    assert [k for chunk in chunks for k in chunk] == keys
+    assert all(
+        len(json.dumps({"ns": "ns", "keys": chunk, "ts": time.time()})) <= 8000
+        for chunk in chunks
+    )
+
+
+def test_dispatch_calls_handlers_and_tracks_lag():
+    received = []
+    invalidation_bus.subscribe("test_dispatch", received.extend)
+
+    invalidation_bus.dispatch(json.dumps({"ns": "test_dispatch", "keys": ["a", "b"], "ts": time.time() - 2}))
+
+    assert received == ["a", "b"]
+    assert invalidation_bus.metrics()["last_lag_seconds"] >= 2
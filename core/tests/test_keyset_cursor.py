@@ -0,0 +1,26 @@
+from datetime import date, time
+import uuid
+
+from core.utils.pagination import decode_cursor, encode_cursor
+from schedule.models import Scheduling
+
+FIELDS = [Scheduling._meta.get_field(f) for f in ("date", "start_time", "id")]
+
+
+def test_cursor_roundtrip_converts_values_with_field_types():
+    row_id = uuid.uuid4()
+    token = encode_cursor([date(2026, 3, 1), time(9, 30), row_id])
+
+    assert decode_cursor(token, FIELDS) == [date(2026, 3, 1), time(9, 30), row_id]
+
+
+def test_tampered_cursor_is_ignored():
+    """
+    Valor que o campo não aceita (data inválida, uuid quebrado, tipo errado)
+    volta None: o changelist mostra a primeira página em vez de um 500.
+    """
+    assert decode_cursor(encode_cursor(["2026-13-40", "09:30", uuid.uuid4()]), FIELDS) is None
+    assert decode_cursor(encode_cursor(["2026-03-01", "09:30", "x"]), FIELDS) is None
+    assert decode_cursor(encode_cursor(["2026-03-01", "09:30"]), FIELDS) is None
+    assert decode_cursor("bm90LWpzb24", FIELDS) is None
+    assert decode_cursor("WzEsMiwzXQ", FIELDS) is None  # [1,2,3]
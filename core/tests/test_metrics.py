@@ -0,0 +1,75 @@
+import json
+import os
+import urllib.request
+
+from core.utils import metrics
+
+
+def test_render_counter_gauge_and_histogram_in_prometheus_format():
+    consumed = metrics.counter("test_consumed_total", "Recebidas", ["queue"])
+    consumed.labels(queue="a").inc()
+    consumed.labels(queue="a").inc(2)
+    metrics.gauge("test_depth", "Profundidade", function=lambda: 7)
+    latency = metrics.histogram("test_seconds", "Latência", buckets=(0.1, 1))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = metrics.render()
+
+    assert "# TYPE test_consumed_total counter" in text
+    assert 'test_consumed_total{queue="a"} 3' in text
+    assert "test_depth 7" in text
+    assert 'test_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_seconds_bucket{le="1.0"} 2' in text
+    assert 'test_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_seconds_count 3" in text
+
+    # mesmo nome → mesma métrica
+    assert metrics.counter("test_consumed_total", "Recebidas", ["queue"]) is consumed
+
+
+def test_http_server_serves_metrics():
+    metrics.counter("test_http_total", "Scrapes").inc()
+    server = metrics.start_http_server(0, addr="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+
+    assert "test_http_total 1" in body
+
+
+def test_multiprocess_render_sums_counters_and_labels_gauges_by_pid(tmp_path):
+    requests = metrics.counter("test_mp_requests_total", "Requisições")
+    requests.inc(2)
+    metrics.gauge("test_mp_depth", "Profundidade", function=lambda: 4)
+
+    # snapshot de outro worker (e de um que já morreu, com gauge antigo)
+    other = metrics.snapshot()
+    other["metrics"]["test_mp_requests_total"]["series"] = [[[], 3]]
+    (tmp_path / "99999.json").write_text(json.dumps(other))
+    dead = metrics.snapshot()
+    dead["written_at"] = 0
+    dead["metrics"]["test_mp_requests_total"]["series"] = [[[], 5]]
+    (tmp_path / "88888.json").write_text(json.dumps(dead))
+
+    text = metrics.render_multiprocess(str(tmp_path))
+
+    assert "test_mp_requests_total 10.0" in text
+    assert f'test_mp_depth{{pid="{os.getpid()}"}} 4' in text
+    assert 'test_mp_depth{pid="99999"} 4' in text
+    assert 'pid="88888"' not in text
+
+
+def test_metrics_view_requires_configured_token(rf, settings):
+    from core.urls import metrics as metrics_view
+
+    settings.METRICS_TOKEN = ""
+    assert metrics_view(rf.get("/metrics/")).status_code == 403
+
+    settings.METRICS_TOKEN = "segredo"
+    assert metrics_view(rf.get("/metrics/")).status_code == 403
+    assert metrics_view(rf.get("/metrics/", HTTP_AUTHORIZATION="Bearer outro")).status_code == 403
+    assert metrics_view(rf.get("/metrics/", HTTP_AUTHORIZATION="Bearer segredo")).status_code == 200
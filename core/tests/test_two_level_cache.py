@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from core.utils.two_level_cache import LocalLRUCache, TwoLevelCache
+
+
+def test_local_lru_evicts_oldest_and_expires():
+    lru = LocalLRUCache(maxsize=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert lru.get("b", None) is None
+    assert lru.get("a") == 1
+
+    with patch("core.utils.two_level_cache.time.monotonic", return_value=10**9):
+        assert lru.get("a", None) is None
+
+
+@pytest.fixture
+def two_level():
+    with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}), \
+            patch("core.utils.invalidation_bus.ensure_listener"), \
+            patch("core.utils.invalidation_bus.publish"):
+        cache.clear()
+        yield TwoLevelCache("test_two_level")
+        cache.clear()
+
+
+def test_misses_load_together_and_hit_afterwards(two_level):
+    calls = []
+
+    def loader(keys):
+        calls.append(sorted(keys))
+        return {k: k.upper() for k in keys if k != "none"}
+
+    assert two_level.get_many(["a", "b", "none"], loader) == {"a": "A", "b": "B", "none": None}
+    assert two_level.get_many(["a", "b", "none"], loader) == {"a": "A", "b": "B", "none": None}
+    assert calls == [["a", "b", "none"]]
+
+    # L1 vazio: vem do Redis (L2) sem chamar o loader
+    two_level.local.clear()
+    assert two_level.get("a", lambda: "x") == "A"
+    assert calls == [["a", "b", "none"]]
+
+    two_level.invalidate("a")
+    assert two_level.get("a", lambda: "novo") == "novo"
+
+
+def test_invalidate_during_load_keeps_stale_value_out_of_redis(two_level):
+    """
+    O invalidate roda enquanto o loader ainda lê o valor antigo: o valor
+    volta para quem pediu, mas não fica no Redis nem no L1.
+    """
+    def loader(keys):
+        two_level.invalidate("a")  # escrita concorrente (outro processo)
+        return {"a": "velho"}
+
+    assert two_level.get_many(["a"], loader) == {"a": "velho"}
+    assert cache.get(two_level.shared_key("a")) is None
+    assert two_level.local.get("a", None) is None
+
+    assert two_level.get_many(["a"], lambda keys: {"a": "novo"}) == {"a": "novo"}
+    assert cache.get(two_level.shared_key("a")) == "novo"
@@ -14,18 +14,34 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.urls import path, include
 from django.views.generic import RedirectView
 from core.admin import custom_admin_site
+from core.utils import metrics as prometheus
 from django.shortcuts import redirect
 
 def clear_enterprise(request):
     request.session.pop("enterprise_id", None)
     return redirect("/admin/")  # middleware controla o resto
 
+def metrics(request):
+    # scrape do Prometheus: exige "Authorization: Bearer <METRICS_TOKEN>";
+    # sem token configurado o endpoint fica fechado (403)
+    token = settings.METRICS_TOKEN
+    if not token or request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponseForbidden()
+
+    # registra as métricas de publicação mesmo antes do primeiro envio
+    import infra.messaging.async_publisher  # noqa: F401
+
+    return HttpResponse(prometheus.render(), content_type=prometheus.CONTENT_TYPE)
+
 urlpatterns = [
     path('', RedirectView.as_view(url='/admin/', permanent=False)),
     path('perfil/', include('perfil.urls')),
     path("admin/clear-enterprise/", clear_enterprise, name="clear_enterprise"),
+    path("metrics/", metrics, name="metrics"),
     path('admin/', custom_admin_site.urls),
 ]
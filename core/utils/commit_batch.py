@@ -0,0 +1,53 @@
+"""
+Acumula itens durante a transação e entrega todos de uma vez no commit:
+um único on_commit por transação (e por `name`) em vez de um por linha.
+
+    on_commit_batch("availability_days", [(worker_id, date)], AvailabilityCacheService.bump_days)
+
+Um delete em cascata (Worker, Client, Enterprise) ou um queryset.delete()
+dispara um sinal por linha; com o lote o trabalho pós-commit (consultas,
+publicações) roda uma vez só.
+
+O lote fica na conexão enquanto o callback dele estiver pendente. Se a
+transação (ou o savepoint em que o lote nasceu) for desfeita, o Django
+descarta o callback e o próximo item abre um lote novo. Itens de um
+savepoint desfeito dentro de um lote mais antigo continuam no lote: o
+`flush` deve tolerar itens que não valem mais.
+"""
+from django.db import transaction
+
+
+class _Batch:
+
+    def __init__(self, flush):
+        self.flush = flush
+        self.items = []
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.flush(self.items)
+
+
+def _pending(connection, batch):
+    # entradas de run_on_commit: (savepoints, callback, robust)
+    return not batch.done and any(func is batch for _, func, _ in connection.run_on_commit)
+
+
+def on_commit_batch(name, items, flush, using=None):
+    """
+    Agenda `flush(itens)` para o commit da transação atual, juntando os
+    `items` de todas as chamadas com o mesmo `name`. Fora de transação
+    (autocommit) chama `flush` na hora, como o on_commit.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush(list(items))
+        return
+
+    batches = connection.__dict__.setdefault("_commit_batches", {})
+    batch = batches.get(name)
+    if batch is None or not _pending(connection, batch):
+        batch = batches[name] = _Batch(flush)
+        transaction.on_commit(batch, using=using)
+    batch.items.extend(items)
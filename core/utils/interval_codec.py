@@ -0,0 +1,88 @@
+"""
+Formato binário compacto para listas de intervalos em minutos do dia.
+
+    [magic u8][flags u8][tamanho dos metadados u16][metadados][pares u16 ...]
+
+Os pares (início, fim) vão como uint16 little-endian (4 bytes por
+intervalo). Metadados str vão como texto puro (o caso comum: uma versão,
+decodificada sem parser); outros valores usam msgpack quando disponível,
+senão JSON.
+"""
+import json
+import struct
+
+try:
+    import msgpack
+except ImportError:  # opcional
+    msgpack = None
+
+MAGIC = 0xA1
+FLAG_MSGPACK = 0x01
+FLAG_TEXT = 0x02
+
+_HEADER = struct.Struct("<BBH")
+
+
+def _pack_meta(meta):
+    if meta is None:
+        return 0, b""
+    if isinstance(meta, str):
+        return FLAG_TEXT, meta.encode()
+    if msgpack is not None:
+        return FLAG_MSGPACK, msgpack.packb(meta, use_bin_type=True)
+    return 0, json.dumps(meta, separators=(",", ":")).encode()
+
+
+def _unpack_meta(flags, raw):
+    if not raw:
+        return None
+    if flags & FLAG_TEXT:
+        return raw.decode()
+    if flags & FLAG_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Entrada gravada com msgpack, que não está instalado.")
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw)
+
+
+def _header(data):
+    if len(data) < _HEADER.size:
+        raise ValueError("Entrada binária truncada.")
+    magic, flags, meta_size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Entrada binária com formato desconhecido.")
+    return flags, meta_size
+
+
+def encode(pairs, meta=None):
+    """
+    pairs: [(início, fim), ...] em minutos (0–65535).
+    """
+    flags, meta_bytes = _pack_meta(meta)
+    values = [minute for pair in pairs for minute in pair]
+
+    return (
+        _HEADER.pack(MAGIC, flags, len(meta_bytes))
+        + meta_bytes
+        + struct.pack(f"<{len(values)}H", *values)
+    )
+
+
+def decode_meta(data):
+    """
+    Só os metadados (sem decodificar os intervalos).
+    """
+    flags, meta_size = _header(data)
+    return _unpack_meta(flags, bytes(data[_HEADER.size:_HEADER.size + meta_size]))
+
+
+def decode(data):
+    """
+    (metadados, [(início, fim), ...]).
+    """
+    flags, meta_size = _header(data)
+    body_start = _HEADER.size + meta_size
+
+    values = iter(struct.unpack_from(f"<{(len(data) - body_start) // 2}H", data, body_start))
+    meta = _unpack_meta(flags, bytes(data[_HEADER.size:body_start]))
+    return meta, list(zip(values, values))
@@ -0,0 +1,197 @@
+"""
+Barramento de invalidação entre processos via PostgreSQL LISTEN/NOTIFY.
+
+- `publish(namespace, keys)` faz `pg_notify` na conexão atual. Dentro de
+  uma transação o PostgreSQL só entrega no commit (e descarta no rollback).
+- Cada processo tem uma thread (`ensure_listener`) com conexão própria em
+  LISTEN que chama os handlers registrados por namespace (`subscribe`).
+- Se a thread cai ou fica sem heartbeat, `is_healthy()` vira False, os
+  handlers de reset limpam os caches locais e quem cacheia deve usar TTL
+  curto até o listener voltar.
+"""
+import json
+import logging
+import os
+import select
+import threading
+import time
+from collections import defaultdict
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+MAX_PAYLOAD_BYTES = 7000  # limite do NOTIFY é 8000
+POLL_INTERVAL = 5
+HEARTBEAT_TIMEOUT = 3 * POLL_INTERVAL
+RECONNECT_DELAY = 5
+
+_handlers = defaultdict(list)
+_reset_handlers = []
+
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+_metrics = {
+    "connected": False,
+    "last_heartbeat": 0.0,
+    "messages": 0,
+    "reconnects": 0,
+    "last_lag_seconds": None,
+    "max_lag_seconds": 0.0,
+    "total_lag_seconds": 0.0,
+}
+
+
+# ============================================================
+# REGISTRO
+# ============================================================
+def subscribe(namespace, callback):
+    """
+    callback(keys) é chamado na thread do listener a cada mensagem do namespace.
+    """
+    _handlers[namespace].append(callback)
+
+
+def on_reset(callback):
+    """
+    callback() é chamado quando o listener cai ou reconecta (mensagens
+    podem ter sido perdidas): limpe o cache local inteiro.
+    """
+    _reset_handlers.append(callback)
+
+
+# ============================================================
+# PUBLICAÇÃO
+# ============================================================
+def _chunks(namespace, keys):
+    chunk = []
+    for key in keys:
+        candidate = chunk + [str(key)]
+        if chunk and len(json.dumps({"ns": namespace, "keys": candidate, "ts": 0.0})) > MAX_PAYLOAD_BYTES:
+            yield chunk
+            candidate = [str(key)]
+        chunk = candidate
+    if chunk:
+        yield chunk
+
+
+def publish(namespace, keys, using="default"):
+    keys = list(keys)
+    if not keys:
+        return
+
+    with connections[using].cursor() as cursor:
+        for chunk in _chunks(namespace, keys):
+            payload = json.dumps({"ns": namespace, "keys": chunk, "ts": time.time()})
+            cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+
+
+def dispatch(payload):
+    message = json.loads(payload)
+
+    lag = max(0.0, time.time() - message.get("ts", time.time()))
+    _metrics["messages"] += 1
+    _metrics["last_lag_seconds"] = lag
+    _metrics["total_lag_seconds"] += lag
+    _metrics["max_lag_seconds"] = max(_metrics["max_lag_seconds"], lag)
+
+    for callback in _handlers.get(message["ns"], []):
+        try:
+            callback(message["keys"])
+        except Exception:
+            logger.exception("Erro no handler de invalidação de %s", message["ns"])
+
+
+# ============================================================
+# SAÚDE / MÉTRICAS
+# ============================================================
+def is_healthy():
+    return (
+        _listener_pid == os.getpid()
+        and _metrics["connected"]
+        and time.monotonic() - _metrics["last_heartbeat"] < HEARTBEAT_TIMEOUT
+    )
+
+
+def metrics():
+    messages = _metrics["messages"]
+    return {
+        **_metrics,
+        "healthy": is_healthy(),
+        "avg_lag_seconds": _metrics["total_lag_seconds"] / messages if messages else None,
+        "seconds_since_heartbeat": time.monotonic() - _metrics["last_heartbeat"],
+    }
+
+
+def _reset_local_caches():
+    for callback in _reset_handlers:
+        try:
+            callback()
+        except Exception:
+            logger.exception("Erro ao limpar cache local")
+
+
+# ============================================================
+# LISTENER (uma thread por processo; recriada após fork)
+# ============================================================
+def ensure_listener():
+    global _listener_pid
+
+    if _listener_pid == os.getpid():
+        return
+
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        _listener_pid = os.getpid()
+        _metrics["connected"] = False
+
+        # entradas herdadas do processo pai perderam as mensagens anteriores
+        _reset_local_caches()
+
+        threading.Thread(target=_listen_forever, name="cache-invalidation-listener", daemon=True).start()
+
+
+def _wait_notifies(raw):
+    """
+    Notificações recebidas em até POLL_INTERVAL (psycopg2 ou psycopg 3).
+    """
+    if hasattr(raw, "poll"):  # psycopg2
+        if select.select([raw], [], [], POLL_INTERVAL) != ([], [], []):
+            raw.poll()
+        notifies, raw.notifies[:] = list(raw.notifies), []
+        return notifies
+    return list(raw.notifies(timeout=POLL_INTERVAL))
+
+
+def _listen_forever(using="default"):
+    while True:
+        wrapper = connections.create_connection(using)
+        try:
+            wrapper.ensure_connection()
+            raw = wrapper.connection
+            raw.autocommit = True
+            raw.cursor().execute(f"LISTEN {CHANNEL}")
+
+            _metrics["connected"] = True
+            _metrics["last_heartbeat"] = time.monotonic()
+            _reset_local_caches()
+
+            while True:
+                for notify in _wait_notifies(raw):
+                    dispatch(notify.payload)
+                _metrics["last_heartbeat"] = time.monotonic()
+        except Exception:
+            logger.warning("Listener de invalidação caiu; caches locais em TTL curto", exc_info=True)
+        finally:
+            _metrics["connected"] = False
+            _metrics["reconnects"] += 1
+            _reset_local_caches()
+            try:
+                wrapper.close()
+            except Exception:
+                pass
+
+        time.sleep(RECONNECT_DELAY)
@@ -0,0 +1,406 @@
+"""
+Registro de métricas em memória do processo, exportado no formato texto do
+Prometheus (sem dependência externa).
+
+    consumed = counter("messaging_consumed_total", "Mensagens recebidas", ["queue"])
+    consumed.labels(queue="x").inc()
+
+    latency = histogram("messaging_handler_seconds", "Tempo do handler", ["queue"])
+    with latency.labels(queue="x").time():
+        ...
+
+`render()` gera o texto de todas as métricas; web expõe em /metrics
+(core/urls.py) e processos sem Django HTTP (consumer) usam
+`start_http_server(porta)`.
+
+Vários processos (gunicorn --workers N): com METRICS_MULTIPROC_DIR cada
+processo grava um snapshot `<pid>.json` no diretório a cada
+FLUSH_INTERVAL segundos, e o `render()` de qualquer worker soma counters e
+histogramas de todos os arquivos (inclusive de workers que já morreram,
+para não "zerar" counters). Gauges saem por processo, com label `pid`, só
+dos snapshots recentes. O diretório deve ser limpo ao iniciar o container.
+"""
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR")
+FLUSH_INTERVAL = 5
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ============================================================
+# SÉRIES (uma por combinação de labels)
+# ============================================================
+class _CounterValue:
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def get(self):
+        return self._value
+
+
+class _GaugeValue(_CounterValue):
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+
+class _HistogramValue:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+# ============================================================
+# MÉTRICAS
+# ============================================================
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _new_value(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        _ensure_flusher()
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, self._new_value())
+        return series
+
+    def _default(self):
+        # métrica sem labels: usa a série única direto (counter.inc())
+        return self.labels()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self):
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in series:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value.get())}"
+
+    def render(self):
+        return "\n".join([*self.header(), *self.samples()])
+
+    def snapshot(self):
+        with self._lock:
+            series = list(self._series.items())
+        return [[list(key), value.get()] for key, value in series]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_value(self):
+        return _CounterValue()
+
+    def inc(self, amount=1):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def _new_value(self):
+        return _GaugeValue()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def samples(self):
+        if self.function is not None:
+            # valor lido na hora da coleta (ex: profundidade de uma fila local)
+            yield f"{self.name} {_format_value(self.function())}"
+            return
+        yield from super().samples()
+
+    def snapshot(self):
+        if self.function is not None:
+            return [[[], self.function()]]
+        return super().snapshot()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def samples(self):
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in series:
+            yield from self._bucket_samples(key, *value.snapshot())
+
+    def _bucket_samples(self, key, counts, total):
+        cumulative = 0
+        for bound, count in zip([*self.buckets, float("inf")], counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, [("le", _format_value(float(bound)))])
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _format_labels(self.labelnames, key)
+        yield f"{self.name}_sum{labels} {_format_value(total)}"
+        yield f"{self.name}_count{labels} {cumulative}"
+
+    def snapshot(self):
+        with self._lock:
+            series = list(self._series.items())
+        return [[list(key), list(value.snapshot())] for key, value in series]
+
+
+# ============================================================
+# REGISTRO
+# ============================================================
+def _register(cls, name, *args, **kwargs):
+    """
+    Idempotente: o mesmo nome devolve a mesma métrica (módulos recarregados,
+    vários consumers no processo).
+    """
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Métrica {name} já registrada como {metric.kind}.")
+        return metric
+
+
+def counter(name, documentation, labelnames=()):
+    return _register(Counter, name, documentation, labelnames)
+
+
+def gauge(name, documentation, labelnames=(), function=None):
+    return _register(Gauge, name, documentation, labelnames, function=function)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def render():
+    if MULTIPROC_DIR:
+        return render_multiprocess(MULTIPROC_DIR)
+
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# ============================================================
+# MULTIPROCESSO (snapshots por pid num diretório compartilhado)
+# ============================================================
+def snapshot():
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return {
+        "written_at": time.time(),
+        "metrics": {
+            m.name: {
+                "kind": m.kind,
+                "documentation": m.documentation,
+                "labelnames": list(m.labelnames),
+                "buckets": list(getattr(m, "buckets", [])),
+                "series": m.snapshot(),
+            }
+            for m in metrics
+        },
+    }
+
+
+def write_snapshot(directory):
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot(), f)
+    os.replace(tmp, path)  # leitor nunca vê arquivo pela metade
+
+
+def _read_snapshots(directory):
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        yield os.path.basename(path)[:-len(".json")], data
+
+
+def render_multiprocess(directory, stale_after=FLUSH_INTERVAL * 3):
+    """
+    Soma counters/histogramas de todos os snapshots; gauges por pid, só de
+    processos que gravaram há menos de `stale_after` segundos.
+    """
+    write_snapshot(directory)
+    now = time.time()
+    merged = {}
+
+    for pid, data in _read_snapshots(directory):
+        fresh = now - data["written_at"] <= stale_after
+        for name, metric in data["metrics"].items():
+            target = merged.setdefault(name, {**metric, "series": {}})
+            for key, value in metric["series"]:
+                if metric["kind"] == "gauge":
+                    if fresh:
+                        target["series"][(*key, pid)] = value
+                elif metric["kind"] == "histogram":
+                    counts, total = target["series"].get(tuple(key), ([0] * len(value[0]), 0.0))
+                    target["series"][tuple(key)] = ([a + b for a, b in zip(counts, value[0])], total + value[1])
+                else:
+                    target["series"][tuple(key)] = target["series"].get(tuple(key), 0) + value
+
+    lines = []
+    for name in sorted(merged):
+        metric = merged[name]
+        lines += [f"# HELP {name} {metric['documentation']}", f"# TYPE {name} {metric['kind']}"]
+        if metric["kind"] == "gauge":
+            labelnames = [*metric["labelnames"], "pid"]
+            for key, value in metric["series"].items():
+                lines.append(f"{name}{_format_labels(labelnames, key)} {_format_value(value)}")
+        elif metric["kind"] == "histogram":
+            histogram = Histogram(name, metric["documentation"], metric["labelnames"], metric["buckets"])
+            for key, (counts, total) in metric["series"].items():
+                lines.extend(histogram._bucket_samples(key, counts, total))
+        else:
+            for key, value in metric["series"].items():
+                lines.append(f"{name}{_format_labels(metric['labelnames'], key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def _flush_forever(directory, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_snapshot(directory)
+        except OSError:
+            pass  # diretório indisponível: tenta no próximo ciclo
+
+
+def _ensure_flusher():
+    """
+    Uma thread por processo (recriada após o fork do gunicorn).
+    """
+    global _flusher_pid
+
+    if not MULTIPROC_DIR or _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        threading.Thread(
+            target=_flush_forever, args=(MULTIPROC_DIR, FLUSH_INTERVAL), name="metrics-flush", daemon=True,
+        ).start()
+
+
+# ============================================================
+# SERVIDOR HTTP (processos sem Django HTTP, ex: consumer)
+# ============================================================
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # sem log por scrape
+
+
+def start_http_server(port, addr="0.0.0.0"):
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,68 @@
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+
+
+def is_partitioned_table(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1
+              FROM pg_partitioned_table pt
+              JOIN pg_class c ON c.oid = pt.partrelid
+             WHERE c.relname = %s
+            """,
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+class PartitionAwareIndexMixin:
+    """
+    PostgreSQL não aceita CREATE/DROP INDEX CONCURRENTLY em tabela
+    particionada. Nesses casos cai para o CREATE/DROP INDEX comum
+    (que propaga para as partições); nas demais tabelas segue concorrente.
+    """
+
+    def _concurrently(self, schema_editor, model):
+        return not is_partitioned_table(schema_editor.connection, model._meta.db_table)
+
+
+class AddIndexConcurrentlyIfSupported(PartitionAwareIndexMixin, AddIndexConcurrently):
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(
+                model, self.index, concurrently=self._concurrently(schema_editor, model)
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(
+                model, self.index, concurrently=self._concurrently(schema_editor, model)
+            )
+
+
+class RemoveIndexConcurrentlyIfSupported(PartitionAwareIndexMixin, RemoveIndexConcurrently):
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            from_model_state = from_state.models[app_label, self.model_name_lower]
+            index = from_model_state.get_index_by_name(self.name)
+            schema_editor.remove_index(
+                model, index, concurrently=self._concurrently(schema_editor, model)
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            to_model_state = to_state.models[app_label, self.model_name_lower]
+            index = to_model_state.get_index_by_name(self.name)
+            schema_editor.add_index(
+                model, index, concurrently=self._concurrently(schema_editor, model)
+            )
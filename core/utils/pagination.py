@@ -0,0 +1,91 @@
+import base64
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+
+
+# ============================================================
+# CURSOR (keyset / seek pagination)
+# ============================================================
+def encode_cursor(values):
+    """
+    Serializa os valores da última linha da página em um token de URL.
+    """
+    raw = json.dumps([str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, fields):
+    """
+    Retorna os valores do cursor convertidos por `to_python` de cada campo
+    do keyset, ou None se o token for inválido (URL adulterada cai na
+    primeira página em vez de virar erro no banco).
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    if not all(isinstance(value, str) for value in values):
+        return None
+
+    try:
+        values = [field.to_python(value) for field, value in zip(fields, values)]
+    except ValidationError:
+        return None
+    if any(value is None for value in values):
+        return None
+    return values
+
+
+# ============================================================
+# CONTAGENS ESTIMADAS (sem COUNT(*))
+# ============================================================
+def table_estimated_rows(model, using="default"):
+    """
+    Estimativa do total de linhas da tabela via pg_class.reltuples.
+    Retorna None se a tabela nunca foi analisada (reltuples = -1).
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+def planner_estimated_rows(queryset):
+    """
+    Estimativa do planner para a query filtrada (EXPLAIN, sem executar).
+    """
+    query = queryset.order_by().query
+    sql, params = query.sql_with_params()
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_enterprise_count(queryset, enterprise_id, timeout=300):
+    """
+    Contador por enterprise guardado no cache (Redis).
+    Só faz o COUNT(*) quando a chave expira.
+    """
+    model = queryset.model
+    key = f"count:{model._meta.label_lower}:{enterprise_id}"
+    return cache.get_or_set(key, lambda: queryset.count(), timeout)
@@ -0,0 +1,46 @@
+import json
+
+from django.db import connections
+
+
+def explain(queryset):
+    """
+    Plano do PostgreSQL (EXPLAIN FORMAT JSON) para o queryset, sem executá-lo.
+    """
+    sql, params = queryset.query.sql_with_params()
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def iter_plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def seq_scanned_relations(queryset):
+    """
+    Tabelas lidas por Seq Scan no plano do queryset.
+    """
+    return {
+        node["Relation Name"]
+        for node in iter_plan_nodes(explain(queryset))
+        if node.get("Node Type") == "Seq Scan"
+    }
+
+
+def scanned_relations(queryset):
+    """
+    Todas as tabelas (ou partições) tocadas pelo plano do queryset.
+    """
+    return {
+        node["Relation Name"]
+        for node in iter_plan_nodes(explain(queryset))
+        if "Relation Name" in node
+    }
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from core.utils import invalidation_bus
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    LRU em memória do processo, com TTL por entrada. Thread-safe.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoLevelCache:
+    """
+    Cache de dados de referência: LRU local (L1) na frente do Redis (L2).
+
+    `invalidate` apaga no Redis e publica no invalidation_bus; o listener
+    de cada processo remove a chave do L1. Com o listener fora do ar o L1
+    usa `fallback_ttl` (curto) e é limpo a cada queda/reconexão.
+
+    Cada chave tem uma geração no Redis, incrementada pelo `invalidate`. O
+    resultado do loader só é gravado (com `add`) se a geração não mudou
+    durante o carregamento: um invalidate no meio não deixa o valor velho
+    no Redis por `shared_ttl`.
+    """
+
+    def __init__(self, namespace, maxsize=1024, local_ttl=300, shared_ttl=60 * 60, fallback_ttl=5):
+        self.namespace = namespace
+        self.local = LocalLRUCache(maxsize=maxsize, ttl=local_ttl)
+        self.shared_ttl = shared_ttl
+        self.fallback_ttl = fallback_ttl
+
+        invalidation_bus.subscribe(namespace, self.evict_local)
+        invalidation_bus.on_reset(self.local.clear)
+
+    def _local_ttl(self):
+        return None if invalidation_bus.is_healthy() else self.fallback_ttl
+
+    def shared_key(self, key):
+        return f"tlc:{self.namespace}:{key}"
+
+    def generation_key(self, key):
+        return f"tlc:gen:{self.namespace}:{key}"
+
+    def _generations(self, keys):
+        found = cache.get_many([self.generation_key(k) for k in keys])
+        return {key: found.get(self.generation_key(key), 0) for key in keys}
+
+    # ---------------------------------------------------------
+    # Leitura
+    # ---------------------------------------------------------
+    def get(self, key, loader):
+        return self.get_many([key], lambda missing: {key: loader()})[key]
+
+    def get_many(self, keys, loader):
+        """
+        {key: valor} para todas as chaves. As ausentes nos dois níveis são
+        carregadas juntas por `loader(chaves) -> {key: valor}`; as que o
+        loader não devolver ficam como None (também cacheado).
+        Internamente as chaves viram str (ex: UUID), como chegam no canal.
+        """
+        invalidation_bus.ensure_listener()
+
+        originals = {str(k): k for k in keys}
+        result = {}
+        missing = []
+        for key in originals:
+            value = self.local.get(key)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                result[key] = value
+
+        if missing:
+            shared = cache.get_many([self.shared_key(k) for k in missing])
+            to_load = []
+            for key in missing:
+                value = shared.get(self.shared_key(key), _MISSING)
+                if value is _MISSING:
+                    to_load.append(key)
+                else:
+                    result[key] = value
+                    self.local.set(key, value, ttl=self._local_ttl())
+
+            if to_load:
+                generations = self._generations(to_load)
+                loaded = {str(k): v for k, v in loader([originals[k] for k in to_load]).items()}
+                values = {key: loaded.get(key) for key in to_load}
+
+                # invalidadas durante o loader: devolve o valor, mas não cacheia
+                unchanged = self._generations(to_load)
+                for key, value in values.items():
+                    if unchanged[key] != generations[key]:
+                        continue
+                    cache.add(self.shared_key(key), value, timeout=self.shared_ttl)
+                    self.local.set(key, value, ttl=self._local_ttl())
+                result.update(values)
+
+        return {originals[k]: v for k, v in result.items()}
+
+    # ---------------------------------------------------------
+    # Invalidação
+    # ---------------------------------------------------------
+    def invalidate(self, *keys):
+        keys = [str(k) for k in keys]
+        for key in keys:
+            self.local.delete(key)
+            self._bump_generation(key)
+        cache.delete_many([self.shared_key(k) for k in keys])
+        invalidation_bus.publish(self.namespace, keys)
+
+    def _bump_generation(self, key):
+        # vive o bastante para cobrir qualquer carregamento em andamento
+        generation_key = self.generation_key(key)
+        cache.add(generation_key, 0, timeout=self.shared_ttl)
+        try:
+            cache.incr(generation_key)
+        except ValueError:
+            # expirou entre o add e o incr
+            cache.set(generation_key, 1, timeout=self.shared_ttl)
+
+    def evict_local(self, keys):
+        for key in keys:
+            self.local.delete(key)
@@ -21,6 +21,12 @@ if [ "$DJANGO_SUPERUSER_USERNAME" ] && [ "$DJANGO_SUPERUSER_EMAIL" ] && [ "$DJAN
   python manage.py createsuperuser --noinput || echo "Superusuário já existe ou erro ao criar"
 fi
 
+# Snapshots de métricas por worker (core/utils/metrics.py): começa limpo
+if [ "$METRICS_MULTIPROC_DIR" ]; then
+  rm -rf "$METRICS_MULTIPROC_DIR"
+  mkdir -p "$METRICS_MULTIPROC_DIR"
+fi
+
 # Executar o comando passado (gunicorn ou consumer)
 echo "Executando comando: $@"
 exec "$@"
\ No newline at end of file
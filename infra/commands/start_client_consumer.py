@@ -4,6 +4,12 @@ from infra.messaging.consumer.client_consumer import start_consumer
 class Command(BaseCommand):
     help = 'Inicia o consumer de atualização de client'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--metrics-port', type=int, default=None,
+            help='Porta do endpoint /metrics (padrão: CONSUMER_METRICS_PORT)',
+        )
+
     def handle(self, *args, **kwargs):
         self.stdout.write("Iniciando consumer...")
-        start_consumer()
+        start_consumer(metrics_port=kwargs['metrics_port'])
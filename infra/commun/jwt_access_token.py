@@ -1,8 +1,18 @@
 import os
+import threading
 import jwt
 from datetime import datetime, timedelta, timezone
 
+TOKEN_TTL = timedelta(minutes=60)
+# token em cache é reassinado quando falta menos que isso para o exp
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
 class JwtAccessToken:
+  _cached_token = None
+  _cached_exp = None
+  _cache_lock = threading.Lock()
+
   def __init__(self):
     self.token = self.generate_jwt()
 
@@ -16,16 +26,44 @@ class JwtAccessToken:
       return client_id
 
 
-  def generate_jwt(self) -> str:
+  def get_key_id(self) -> str | None:
+      # kid no header: o consumidor escolhe a chave pública (rotação)
+      return os.environ.get('JWT_KEY_ID') or None
+
+
+  def generate_jwt(self, now=None) -> str:
       private_key = self.get_private_key()
+      now = now or datetime.now(timezone.utc)
       payload = {
           "iss": self.get_client_id(),
           "aud": "ex-dashboard",
-          "exp": datetime.now(timezone.utc) + timedelta(minutes=60),
-          "iat": datetime.now(timezone.utc),
+          "exp": now + TOKEN_TTL,
+          "iat": now,
       }
-      token = jwt.encode(payload, private_key, algorithm="RS256")
+      kid = self.get_key_id()
+      headers = {"kid": kid} if kid else None
+      token = jwt.encode(payload, private_key, algorithm="RS256", headers=headers)
       return token
-  
+
+  @classmethod
+  def cached(cls) -> str:
+      """
+      Token assinado compartilhado pelo processo; a assinatura RS256 só é
+      refeita quando o token está a menos de REFRESH_MARGIN do exp.
+      """
+      now = datetime.now(timezone.utc)
+      with cls._cache_lock:
+          if cls._cached_token is None or now >= cls._cached_exp - REFRESH_MARGIN:
+              instance = cls.__new__(cls)
+              cls._cached_token = instance.generate_jwt(now)
+              cls._cached_exp = now + TOKEN_TTL
+          return cls._cached_token
+
+  @classmethod
+  def clear_cache(cls):
+      with cls._cache_lock:
+          cls._cached_token = None
+          cls._cached_exp = None
+
   def __str__(self) -> str:
-    return self.token
\ No newline at end of file
+    return self.token
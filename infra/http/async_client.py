@@ -0,0 +1,138 @@
+"""
+httpx.AsyncClient compartilhado por processo (e por event loop).
+
+- Pool com limite de conexões e keep-alive, timeouts separados por fase.
+- HTTP/2 quando o pacote `h2` está instalado (HTTP_HTTP2=0 desliga).
+- `JwtAuth`: Authorization montado a cada requisição com
+  `JwtAccessToken.cached()` (renovado antes do exp); um 401 força um token
+  novo e repete a requisição uma vez.
+- `backoff()`: espera com jitter para as retentativas do HttpClient.
+- `gather_limited()`: fan-out com no máximo `limit` chamadas em voo.
+"""
+import asyncio
+import os
+import random
+import threading
+import weakref
+
+import httpx
+
+from infra.commun.jwt_access_token import JwtAccessToken
+
+MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 100))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+KEEPALIVE_EXPIRY = 30
+
+LIMITS = httpx.Limits(
+    max_connections=MAX_CONNECTIONS,
+    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=KEEPALIVE_EXPIRY,
+)
+TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0)
+
+# Retentativa (só métodos idempotentes)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 5.0
+
+
+def http2_available():
+    if os.environ.get("HTTP_HTTP2", "1") == "0":
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class JwtAuth(httpx.Auth):
+
+    def auth_flow(self, request):
+        request.headers["Authorization"] = f"Bearer {JwtAccessToken.cached()}"
+        response = yield request
+
+        if response.status_code == 401:
+            # token rejeitado (chave rotacionada, relógio): assina de novo
+            JwtAccessToken.clear_cache()
+            request.headers["Authorization"] = f"Bearer {JwtAccessToken.cached()}"
+            yield request
+
+
+def build_async_client(transport=None, **overrides):
+    """
+    Client com a configuração padrão; `transport` (ex: httpx.MockTransport)
+    substitui a rede nos testes.
+    """
+    options = dict(
+        auth=JwtAuth(),
+        headers={"Content-Type": "application/json"},
+        limits=LIMITS,
+        timeout=TIMEOUT,
+        http2=http2_available(),
+    )
+    if transport is not None:
+        options["transport"] = transport
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+# ============================================================
+# CLIENT COMPARTILHADO (um por event loop)
+# ============================================================
+_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_async_client():
+    """
+    O pool do httpx fica preso ao loop em que as conexões foram abertas:
+    um client por loop (o dicionário solta o client junto com o loop).
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = _clients[loop] = build_async_client()
+        return client
+
+
+async def close_async_client():
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+# ============================================================
+# RETENTATIVA E FAN-OUT
+# ============================================================
+def backoff(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX, retry_after=None):
+    """
+    Full jitter: aleatório entre 0 e base * 2^tentativa (até `cap`).
+    Retry-After numérico do servidor tem precedência (também limitado).
+    """
+    if retry_after is not None:
+        try:
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+async def gather_limited(calls, limit=10, return_exceptions=False):
+    """
+    Executa `calls` (funções sem argumento que retornam awaitables, ex:
+    `lambda: client.get(url)`) com no máximo `limit` em voo. Resultados na
+    ordem de entrada.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call):
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls), return_exceptions=return_exceptions)
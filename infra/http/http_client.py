@@ -1,82 +1,71 @@
+import asyncio
+import time
+
 import httpx
-import json
-from commun.jwt_access_token import JwtAccessToken
+from infra.http.async_client import (
+    IDEMPOTENT_METHODS, MAX_RETRIES, RETRY_STATUSES, backoff, get_async_client,
+)
+from infra.http.http_logging import ASYNC_LOGGING, HttpLogger, configure_async_logging
 
 class HttpClient:
-    def __init__(self):
-        self.base_headers = {
-            "Authorization": f"Bearer {JwtAccessToken()}",
-            "Content-Type": "application/json",
-        }
-        self.client = httpx.AsyncClient(headers=self.base_headers)
+    """
+    Usa o AsyncClient compartilhado do processo (pool, timeouts, JWT
+    renovado a cada requisição). Métodos idempotentes são repetidos com
+    backoff em erro de transporte ou 429/502/503/504.
+    """
+
+    def __init__(self, http_logger=None, client=None, max_retries=MAX_RETRIES, backoff=backoff):
+        if http_logger is None and ASYNC_LOGGING:
+            # log de cada chamada formatado e escrito fora do event loop
+            configure_async_logging()
+        self.http_logger = http_logger or HttpLogger()
+        self._client = client
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    @property
+    def client(self):
+        # resolvido no loop em que a chamada roda
+        return self._client or get_async_client()
 
     async def get(self, url, params=None, headers=None):
-        merged_headers = self._merge_headers(headers)
-        print(f"\n[GET] {url}")
-        print(f"Headers: {merged_headers}")
-        print(f"Params: {params}")
-
-        response = await self.client.get(url, headers=merged_headers, params=params)
-
-        self._log_response(response)
-        return response
+        return await self._request("GET", url, headers, params=params)
 
     async def post(self, url, data=None, headers=None):
-        merged_headers = self._merge_headers(headers)
-        print(f"\n[POST] {url}")
-        print(f"Headers: {merged_headers}")
-        print(f"Data: {data}")
+        return await self._request("POST", url, headers, json=data)
 
-        response = await self.client.post(url, headers=merged_headers, json=data)
-
-        self._log_response(response)
-        return response
-    
     async def put(self, url, data=None, headers=None):
-        merged_headers = self._merge_headers(headers)
-        print(f"\n[PUT] {url}")
-        print(f"Headers: {merged_headers}")
-        print(f"Data: {data}")
-
-        response = await self.client.put(url, headers=merged_headers, json=data)
-
-        self._log_response(response)
-        return response
+        return await self._request("PUT", url, headers, json=data)
 
     async def patch(self, url, data=None, headers=None):
-        merged_headers = self._merge_headers(headers)
-        print(f"\n[PATCH] {url}")
-        print(f"Headers: {merged_headers}")
-        print(f"Data: {data}")
-
-        response = await self.client.patch(url, headers=merged_headers, json=data)
-
-        self._log_response(response)
-        return response
+        return await self._request("PATCH", url, headers, json=data)
 
     async def delete(self, url, headers=None):
-        merged_headers = self._merge_headers(headers)
-        print(f"\n[DELETE] {url}")
-        print(f"Headers: {merged_headers}")
-
-        response = await self.client.delete(url, headers=merged_headers)
-
-        self._log_response(response)
-        return response
-
-    def _log_response(self, response: httpx.Response):
-        print(f"Response Status: {response.status_code}")
-        try:
-            print("Response JSON:", json.dumps(response.json(), indent=2))
-        except Exception:
-            print("Response Text:", response.text)
-
-    def _merge_headers(self, headers):
-        if headers:
-            merged = self.base_headers.copy()
-            merged.update(headers)
-            return merged
-        return self.base_headers
+        return await self._request("DELETE", url, headers)
+
+    async def _request(self, method, url, headers=None, params=None, json=None):
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        self.http_logger.request(method, url, headers, params=params, data=json)
+
+        for attempt in range(retries + 1):
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, headers=headers, params=params, json=json)
+            except httpx.TransportError as e:
+                self.http_logger.error(method, url, e, time.perf_counter() - started)
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+
+            self.http_logger.response(method, url, response, time.perf_counter() - started)
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+
+            await response.aclose()
+            await asyncio.sleep(self.backoff(attempt, retry_after=response.headers.get("Retry-After")))
 
     async def close(self):
-        await self.client.aclose()
+        # o client compartilhado é fechado por close_async_client()
+        if self._client is not None:
+            await self._client.aclose()
@@ -0,0 +1,174 @@
+"""
+Log estruturado das chamadas do HttpClient.
+
+- Uma linha por chamada (INFO): método, URL, status, duração e tamanho, em
+  `extra["http"]` para formatters JSON.
+- Corpo da resposta só em DEBUG, amostrado (`sample_rate`) e truncado em
+  `body_limit` caracteres; erro (status >= 400) sempre loga o corpo truncado.
+- Headers sensíveis (Authorization, Cookie...) nunca vão para o log.
+- `configure_async_logging()` troca os handlers do logger por um
+  QueueHandler que não formata: a formatação e o I/O rodam na thread do
+  QueueListener, fora do event loop. O HttpClient liga o sink ao ser criado.
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger("infra.http")
+
+SENSITIVE_HEADERS = frozenset({
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "set-cookie",
+    "x-api-key",
+})
+REDACTED = "***"
+
+SAMPLE_RATE = float(os.environ.get("HTTP_LOG_SAMPLE_RATE", 0.1))
+BODY_LIMIT = int(os.environ.get("HTTP_LOG_BODY_LIMIT", 2048))
+
+
+def redact_headers(headers):
+    if not headers:
+        return {}
+    return {
+        name: REDACTED if name.lower() in SENSITIVE_HEADERS else value
+        for name, value in dict(headers).items()
+    }
+
+
+def truncate(text, limit=BODY_LIMIT):
+    if text is None or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text) - limit} caracteres omitidos)"
+
+
+class HttpLogger:
+
+    def __init__(self, log=logger, sample_rate=SAMPLE_RATE, body_limit=BODY_LIMIT):
+        self.log = log
+        self.sample_rate = sample_rate
+        self.body_limit = body_limit
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def request(self, method, url, headers=None, params=None, data=None):
+        # checado antes de montar os campos: em produção (INFO) não custa nada
+        if not self.log.isEnabledFor(logging.DEBUG) or not self._sampled():
+            return
+
+        fields = {
+            "method": method,
+            "url": str(url),
+            "headers": redact_headers(headers),
+            "params": params,
+            "body": truncate(repr(data), self.body_limit) if data is not None else None,
+        }
+        self.log.debug("HTTP %s %s", method, url, extra={"http": fields})
+
+    def response(self, method, url, response, elapsed):
+        status = response.status_code
+        level = logging.WARNING if status >= 400 else logging.INFO
+        if not self.log.isEnabledFor(level):
+            return
+
+        fields = {
+            "method": method,
+            "url": str(url),
+            "status": status,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "size": len(response.content),
+        }
+        if status >= 400 or (self.log.isEnabledFor(logging.DEBUG) and self._sampled()):
+            # response.text só é decodificado quando o corpo vai para o log
+            fields["body"] = truncate(response.text, self.body_limit)
+
+        self.log.log(
+            level, "HTTP %s %s -> %s (%.1f ms)", method, url, status, fields["elapsed_ms"],
+            extra={"http": fields},
+        )
+
+    def error(self, method, url, exc, elapsed):
+        fields = {
+            "method": method,
+            "url": str(url),
+            "error": type(exc).__name__,
+            "elapsed_ms": round(elapsed * 1000, 2),
+        }
+        self.log.error(
+            "HTTP %s %s falhou após %.1f ms: %s", method, url, fields["elapsed_ms"], exc,
+            extra={"http": fields},
+        )
+
+
+# ============================================================
+# SINK ASSÍNCRONO (QueueHandler + QueueListener)
+# ============================================================
+# HttpClient liga o sink no logger "infra.http" (HTTP_LOG_ASYNC=0 desliga)
+ASYNC_LOGGING = os.environ.get("HTTP_LOG_ASYNC", "1") != "0"
+
+_listeners = {}
+_listener_lock = threading.Lock()
+
+
+class DeferredFormatQueueHandler(QueueHandler):
+    """
+    O QueueHandler padrão chama self.format(record) no prepare(), na thread
+    que loga (o event loop). Aqui o registro vai para a fila como está e
+    os handlers do QueueListener formatam na thread dele. Os args do
+    HttpLogger são strings e números, seguros de ler em outra thread.
+    """
+
+    def prepare(self, record):
+        return copy.copy(record)
+
+
+def configure_async_logging(log=logger, handlers=None):
+    """
+    Move os handlers de `log` (ou `handlers`, ou um StreamHandler) para um
+    QueueListener. O logger fica só com o DeferredFormatQueueHandler, que
+    enfileira o registro sem formatar nem escrever. Idempotente por logger;
+    para no atexit.
+    """
+    with _listener_lock:
+        if log.name in _listeners:
+            return _listeners[log.name]
+
+        handlers = list(handlers or log.handlers or [logging.StreamHandler()])
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+
+        records = queue.SimpleQueue()
+        log.addHandler(DeferredFormatQueueHandler(records))
+        log.propagate = False
+
+        listener = _listeners[log.name] = QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(stop_async_logging, log)
+        return listener
+
+
+def stop_async_logging(log=logger):
+    """
+    Esvazia a fila (o listener processa o que faltou) e devolve os handlers
+    originais ao logger.
+    """
+    with _listener_lock:
+        listener = _listeners.pop(log.name, None)
+        if listener is None:
+            return
+
+        listener.stop()
+        for handler in list(log.handlers):
+            if isinstance(handler, QueueHandler):
+                log.removeHandler(handler)
+        for handler in listener.handlers:
+            log.addHandler(handler)
+        log.propagate = True
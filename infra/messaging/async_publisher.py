@@ -0,0 +1,218 @@
+"""
+Publicação assíncrona no RabbitMQ.
+
+O caminho da requisição só chama `enqueue_message` (fila em memória,
+limitada); uma thread por processo retira lotes e publica com
+`publish_batch` (pool de producers + retries). Assim uma instabilidade do
+broker não segura o save do admin.
+
+- Fila cheia: `enqueue_message` espera até `put_timeout` (back-pressure) e
+  depois descarta a mensagem, contando em `dropped`.
+- No encerramento do processo (atexit) a fila é drenada por até
+  `drain_timeout` segundos.
+- `metrics()` expõe profundidade da fila e latências de publicação.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict
+
+from core.utils import metrics as prometheus
+from infra.messaging.subscribe import publish_batch
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = int(os.environ.get("RABBITMQ_PUBLISH_QUEUE_SIZE", 10000))
+BATCH_SIZE = 100
+PUT_TIMEOUT = 0.05
+DRAIN_TIMEOUT = 10
+
+_STOP = object()
+
+DROPPED = prometheus.counter("messaging_publish_dropped_total", "Mensagens descartadas com a fila de publicação cheia")
+QUEUE_WAIT_SECONDS = prometheus.histogram(
+    "messaging_publish_queue_wait_seconds", "Espera na fila em memória até a publicação (por lote)",
+)
+
+
+class AsyncPublisher:
+
+    def __init__(self, maxsize=QUEUE_SIZE, batch_size=BATCH_SIZE, put_timeout=PUT_TIMEOUT,
+                 drain_timeout=DRAIN_TIMEOUT, url=None):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.drain_timeout = drain_timeout
+        self.url = url
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._pid = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "published": 0,
+            "failed": 0,
+            "dropped": 0,
+            "batches": 0,
+            "last_batch_seconds": None,
+            "max_batch_seconds": 0.0,
+            "total_batch_seconds": 0.0,
+            "last_queue_wait_seconds": None,
+            "max_queue_wait_seconds": 0.0,
+        }
+
+    # ---------------------------------------------------------
+    # Thread (uma por processo; recriada após fork)
+    # ---------------------------------------------------------
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # fila herdada do pai: os itens são dele, não deste processo
+                self._queue = queue.Queue(maxsize=self.maxsize)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="rabbitmq-publisher", daemon=True)
+            self._thread.start()
+            atexit.register(self.drain)
+
+    def _incr(self, **values):
+        with self._stats_lock:
+            for key, value in values.items():
+                self._stats[key] += value
+
+    # ---------------------------------------------------------
+    # Caminho da requisição
+    # ---------------------------------------------------------
+    def enqueue(self, payload: Dict[str, Any], routing_key: str) -> bool:
+        self.ensure_started()
+        try:
+            self._queue.put((payload, routing_key, time.monotonic()), timeout=self.put_timeout)
+        except queue.Full:
+            self._incr(dropped=1)
+            DROPPED.inc()
+            logger.error(f"Fila de publicação cheia; mensagem descartada: {routing_key}")
+            return False
+
+        self._incr(enqueued=1)
+        return True
+
+    # ---------------------------------------------------------
+    # Thread de publicação
+    # ---------------------------------------------------------
+    def _next_batch(self):
+        """
+        Bloqueia pelo primeiro item e junta o que mais já estiver na fila.
+        Retorna (lote, parar).
+        """
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _publish(self, batch):
+        started = time.monotonic()
+        published = publish_batch(((payload, key) for payload, key, _ in batch), url=self.url)
+        elapsed = time.monotonic() - started
+
+        wait = started - min(enqueued_at for _, _, enqueued_at in batch)
+        QUEUE_WAIT_SECONDS.observe(wait)
+        with self._stats_lock:
+            self._stats["published"] += published
+            self._stats["failed"] += len(batch) - published
+            self._stats["batches"] += 1
+            self._stats["last_batch_seconds"] = elapsed
+            self._stats["total_batch_seconds"] += elapsed
+            self._stats["max_batch_seconds"] = max(self._stats["max_batch_seconds"], elapsed)
+            self._stats["last_queue_wait_seconds"] = wait
+            self._stats["max_queue_wait_seconds"] = max(self._stats["max_queue_wait_seconds"], wait)
+
+        if published < len(batch):
+            logger.error(f"{len(batch) - published} mensagem(ns) não publicada(s) no RabbitMQ")
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                try:
+                    self._publish(batch)
+                except Exception:
+                    self._incr(failed=len(batch))
+                    logger.exception("Erro no publicador assíncrono")
+            if stop:
+                return
+
+    # ---------------------------------------------------------
+    # Encerramento
+    # ---------------------------------------------------------
+    def drain(self, timeout=None):
+        """
+        Publica o que estiver na fila e para a thread. Retorna True se a
+        fila foi esvaziada dentro do prazo.
+        """
+        if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+
+        timeout = self.drain_timeout if timeout is None else timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return False
+
+        self._thread.join(timeout)
+        drained = not self._thread.is_alive()
+        if drained:
+            self._pid = None
+        else:
+            logger.warning(f"Fila de publicação não drenada em {timeout}s ({self._queue.qsize()} restantes)")
+        return drained
+
+    # ---------------------------------------------------------
+    # Métricas
+    # ---------------------------------------------------------
+    def metrics(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        batches = stats["batches"]
+        return {
+            **stats,
+            "queue_depth": self._queue.qsize(),
+            "queue_maxsize": self.maxsize,
+            "running": self._pid == os.getpid() and self._thread is not None and self._thread.is_alive(),
+            "avg_batch_seconds": stats["total_batch_seconds"] / batches if batches else None,
+        }
+
+
+publisher = AsyncPublisher()
+
+prometheus.gauge(
+    "messaging_publish_queue_depth", "Mensagens na fila de publicação em memória",
+    function=lambda: publisher._queue.qsize(),
+)
+
+
+def enqueue_message(payload: Dict[str, Any], routing_key: str) -> bool:
+    return publisher.enqueue(payload, routing_key)
+
+
+def metrics():
+    return publisher.metrics()
@@ -1,23 +1,23 @@
-import django
 import json
 import logging
-from kombu import Connection, Exchange, Queue, Consumer
+import os
+from kombu import Connection, Exchange, Queue
+from core.utils import metrics
 from infra.messaging.subscribe import get_rabbitmq_url
-from ex_permissao_back.models.clients import Client
+from .dedupe import RedisDedupeStore, RedisVersionStore
+from .retry import RetryPolicy
+from .runtime import ConsumerRuntime, InvalidMessage
 from .verify_signature import verify_signature
 
-django.setup()
-
 
 client_aud_name = 'ex-permissao_back'
 client_id_env_name = 'PERMISSAO_BACK_JWT_CLIENT_ID'
 client_public_key_env_name = 'PERMISSAO_BACK_JWT_PUBLIC_KEY'
 
+KEY_FIELDS = ["public_key", "private_key"]
 
 logger = logging.getLogger(__name__)
 
-RABBIT_URL = get_rabbitmq_url()
-
 exchange = Exchange("amq.direct", type="direct")
 queue = Queue(
     name="dashboard/client/updated/on-permission-api",
@@ -26,43 +26,98 @@ queue = Queue(
 )
 
 
-def handle_message(body, message):
-    try:
-        print("Mensagem recebida:", body)
-        
-        if isinstance(body, str):
-            body = json.loads(body)
-
-        client_id = body['payload']['id_client']
-        public_key = body['payload']['public_key']
-        private_key = body['payload']['private_key']
-        
-        jwt_token = body['jwt']
-
-        if not verify_signature(jwt_token, client_public_key_env_name, client_aud_name, client_id_env_name ):
-            logger.error("Assinatura JWT inválida")
-            message.reject()
-            return
+def get_client_model():
+    # import tardio: o módulo é importado antes do django.setup() e o model
+    # só é necessário quando chega o primeiro lote
+    from ex_permissao_back.models.clients import Client
+    return Client
 
-        client = Client.objects.get(id=client_id)
-        client.public_key = public_key
-        client.private_key = private_key
-        client.save()
 
-        logger.info(f"Chaves do client {client_id} atualizadas com sucesso")
-        message.ack()
-    except Exception as e:
-        logger.error(f"Erro ao processar mensagem: {e}")
-        message.reject()
+def prepare_message(body):
+    """
+    Valida a mensagem na thread da conexão. Retorna (client_id, item);
+    o client_id define o worker, garantindo a ordem por client.
+    """
+    if isinstance(body, str):
+        body = json.loads(body)
 
-
-def start_consumer():
-    with Connection(RABBIT_URL) as conn:
-        with Consumer(conn, queues=[queue], callbacks=[handle_message], accept=["json"]):
-            logger.info("Consumer iniciado, aguardando mensagens...")
-            while True:
-                conn.drain_events()
+    try:
+        payload = body['payload']
+        client_id = payload['id_client']
+        item = {
+            'id': client_id,
+            'public_key': payload['public_key'],
+            'private_key': payload['private_key'],
+        }
+        jwt_token = body['jwt']
+    except (KeyError, TypeError) as e:
+        raise InvalidMessage(f"campo ausente: {e}")
+
+    if not verify_signature(jwt_token, client_public_key_env_name, client_aud_name, client_id_env_name):
+        raise InvalidMessage("Assinatura JWT inválida")
+
+    return client_id, item
+
+
+def apply_client_keys(items):
+    """
+    Um lote do mesmo worker: várias atualizações do mesmo client viram uma
+    (vale a última, na ordem de chegada) e tudo vai em um bulk_update.
+    """
+    latest = {str(item['id']): item for item in items}  # a última vence
+
+    Client = get_client_model()
+    clients = list(Client.objects.in_bulk(list(latest)).values())
+
+    missing = set(latest) - {str(client.pk) for client in clients}
+    if missing:
+        logger.warning(f"Clients não encontrados: {', '.join(sorted(missing))}")
+
+    for client in clients:
+        item = latest[str(client.pk)]
+        client.public_key = item['public_key']
+        client.private_key = item['private_key']
+
+    Client.objects.bulk_update(clients, KEY_FIELDS)
+    logger.info(f"Chaves de {len(clients)} client(s) atualizadas ({len(items)} mensagem(ns))")
+
+
+def build_runtime(connection, **overrides):
+    """
+    `overrides` troca partes do pipeline (handle_batch, dedupe...) no
+    harness de testes e no benchmark; em produção não é usado.
+    """
+    options = dict(
+        queues=[queue],
+        prepare=prepare_message,
+        handle_batch=apply_client_keys,
+        workers=int(os.environ.get('CLIENT_CONSUMER_WORKERS', 4)),
+        prefetch_count=int(os.environ.get('CLIENT_CONSUMER_PREFETCH', 64)),
+        batch_size=int(os.environ.get('CLIENT_CONSUMER_BATCH_SIZE', 50)),
+        # o produtor não manda message_id: o id é o hash do corpo (payload +
+        # jwt, que muda a cada hora), então o TTL acompanha a vida do token
+        dedupe=RedisDedupeStore("client-keys", ttl=60 * 60),
+        retry=RetryPolicy(queue),
+        # mensagem que volta do retry não sobrescreve chaves mais novas
+        versions=RedisVersionStore("client-keys"),
+    )
+    options.update(overrides)
+    return ConsumerRuntime(connection, **options)
+
+
+def start_consumer(metrics_port=None):
+    metrics_port = metrics_port or os.environ.get('CONSUMER_METRICS_PORT')
+    if metrics_port:
+        # processo sem HTTP do Django: o scrape vai direto neste servidor
+        metrics.start_http_server(int(metrics_port))
+        logger.info(f"Métricas em :{metrics_port}/metrics")
+
+    with Connection(get_rabbitmq_url()) as conn:
+        build_runtime(conn).run()
 
 
 if __name__ == "__main__":
+    import django
+
+    django.setup()
     start_consumer()
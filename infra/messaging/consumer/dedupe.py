@@ -0,0 +1,165 @@
+"""
+Registro de mensagens já processadas (idempotência do consumer).
+
+O runtime consulta o lote inteiro antes do trabalho no banco (`seen_many`,
+uma ida ao Redis) e marca os ids só depois do sucesso (`mark_many`). Uma
+reentrega de algo já aplicado vira só um ack.
+
+Os `*VersionStore` guardam, por chave (client), a versão da última mensagem
+aplicada: uma mensagem mais antiga que chega depois (voltando de uma fila de
+atraso) é descartada em vez de sobrescrever a mais nova.
+"""
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL = 60 * 60 * 24
+
+
+class RedisDedupeStore:
+    """
+    Uma chave por mensagem com TTL (SET ... EX). Compartilhado entre réplicas
+    do consumer.
+    """
+
+    def __init__(self, namespace, ttl=DEFAULT_TTL, client=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from django_redis import get_redis_connection
+
+            self._client = get_redis_connection("default")
+        return self._client
+
+    def _key(self, message_id):
+        return f"dedupe:{self.namespace}:{message_id}"
+
+    def seen_many(self, message_ids):
+        message_ids = list(message_ids)
+        if not message_ids:
+            return set()
+        values = self.client.mget([self._key(m) for m in message_ids])
+        return {m for m, value in zip(message_ids, values) if value is not None}
+
+    def mark_many(self, message_ids):
+        pipe = self.client.pipeline(transaction=False)
+        for message_id in message_ids:
+            pipe.set(self._key(message_id), 1, ex=self.ttl)
+        pipe.execute()
+
+
+class SQLiteDedupeStore:
+    """
+    Substituto local (um processo, sem Redis): tabela com expiração.
+    """
+
+    def __init__(self, path=":memory:", ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS seen_expires_at ON seen (expires_at)")
+
+    def seen_many(self, message_ids):
+        message_ids = list(message_ids)
+        if not message_ids:
+            return set()
+
+        placeholders = ",".join("?" * len(message_ids))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id FROM seen WHERE id IN ({placeholders}) AND expires_at > ?",
+                [*message_ids, time.time()],
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_many(self, message_ids):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO seen (id, expires_at) VALUES (?, ?)",
+                [(m, now + self.ttl) for m in message_ids],
+            )
+            self._db.execute("DELETE FROM seen WHERE expires_at <= ?", [now])
+
+
+# Só grava se a versão nova for maior (várias réplicas do consumer)
+_SET_MAX_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    local current = tonumber(redis.call('GET', key) or '0')
+    if tonumber(ARGV[i]) > current then
+        redis.call('SET', key, ARGV[i], 'EX', ARGV[#KEYS + 1])
+    end
+end
+"""
+
+
+class RedisVersionStore:
+
+    def __init__(self, namespace, ttl=DEFAULT_TTL, client=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._client = client
+        self._set_max = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from django_redis import get_redis_connection
+
+            self._client = get_redis_connection("default")
+        return self._client
+
+    def _key(self, key):
+        return f"version:{self.namespace}:{key}"
+
+    def get_versions(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([self._key(k) for k in keys])
+        return {k: int(value) for k, value in zip(keys, values) if value is not None}
+
+    def set_versions(self, versions):
+        if not versions:
+            return
+        if self._set_max is None:
+            self._set_max = self.client.register_script(_SET_MAX_SCRIPT)
+        self._set_max(
+            keys=[self._key(k) for k in versions],
+            args=[*versions.values(), self.ttl],
+        )
+
+
+class SQLiteVersionStore:
+
+    def __init__(self, path=":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("CREATE TABLE IF NOT EXISTS versions (key TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+    def get_versions(self, keys):
+        keys = [str(k) for k in keys]
+        if not keys:
+            return {}
+
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT key, version FROM versions WHERE key IN ({placeholders})", keys,
+            ).fetchall()
+        return dict(rows)
+
+    def set_versions(self, versions):
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO versions (key, version) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET version = MAX(version, excluded.version)",
+                [(str(k), v) for k, v in versions.items()],
+            )
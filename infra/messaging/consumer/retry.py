@@ -0,0 +1,85 @@
+"""
+Retentativa com filas de atraso em vez de reject imediato.
+
+Mensagem que falhou é republicada em `<fila>.retry.<segundos>`; a fila tem
+x-message-ttl e dead-letter de volta para a fila original, onde ela
+reaparece depois do atraso. Esgotadas as tentativas (ou mensagem inválida)
+ela vai para `<fila>.dlq`, onde fica para análise.
+
+A republicação leva `x-first-seen` (quando o runtime viu a mensagem pela
+primeira vez): é a versão que impede uma mensagem que voltou do atraso de
+sobrescrever uma mais nova da mesma chave.
+"""
+from kombu import Exchange, Queue
+
+RETRY_EXCHANGE = Exchange("dashboard.retry", type="direct")
+RETRY_HEADER = "x-retries"
+FIRST_SEEN_HEADER = "x-first-seen"
+DEFAULT_DELAYS = (5, 30, 120)
+
+
+class RetryPolicy:
+
+    def __init__(self, queue, delays=DEFAULT_DELAYS):
+        self.queue = queue
+        self.delays = tuple(delays)
+
+        self.retry_queues = [
+            Queue(
+                f"{queue.name}.retry.{delay}",
+                exchange=RETRY_EXCHANGE,
+                routing_key=f"{queue.name}.retry.{delay}",
+                queue_arguments={
+                    "x-message-ttl": delay * 1000,
+                    # exchange padrão + nome da fila: volta só para esta fila,
+                    # não para todas as ligadas à mesma routing key
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": queue.name,
+                },
+            )
+            for delay in self.delays
+        ]
+        self.dead_letter_queue = Queue(
+            f"{queue.name}.dlq",
+            exchange=RETRY_EXCHANGE,
+            routing_key=f"{queue.name}.dlq",
+        )
+
+    def declare(self, channel):
+        for queue in [*self.retry_queues, self.dead_letter_queue]:
+            queue(channel).declare()
+
+    @staticmethod
+    def attempts(message):
+        return int((message.headers or {}).get(RETRY_HEADER, 0))
+
+    def target(self, message, dead=False):
+        """
+        Fila de destino de uma falha: próxima fila de atraso ou a DLQ.
+        """
+        attempt = self.attempts(message)
+        if dead or attempt >= len(self.delays):
+            return self.dead_letter_queue
+        return self.retry_queues[attempt]
+
+    def republish(self, producer, message, dead=False, version=None):
+        """
+        Republica o corpo original (sem reserializar). Retorna a fila usada;
+        quem chama faz o ack da mensagem original em seguida.
+        """
+        target = self.target(message, dead)
+        headers = {**(message.headers or {}), RETRY_HEADER: self.attempts(message) + 1}
+        if version is not None:
+            headers.setdefault(FIRST_SEEN_HEADER, version)
+        producer.publish(
+            message.body,
+            exchange=RETRY_EXCHANGE,
+            routing_key=target.routing_key,
+            headers=headers,
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            message_id=message.properties.get("message_id"),
+            # versão do produtor (message_version) sobrevive ao retry
+            timestamp=message.properties.get("timestamp"),
+        )
+        return target
@@ -0,0 +1,454 @@
+"""
+Runtime de consumo concorrente para filas do RabbitMQ (kombu).
+
+    thread da conexão ── drain_events (prefetch_count limita o que está em voo)
+        │  prepare(body) -> (chave, item)   inválida → reject
+        ▼
+    fila do worker hash(chave) % workers   (mesma chave → mesmo worker → ordem)
+        │  junta até batch_size itens já na fila (ou espera batch_wait)
+        ▼
+    dedupe.seen_many(ids)                   já processadas → só ack
+    versions.get_versions(chaves)           mais antigas que a aplicada → só ack
+    handle_batch([item, ...])               erro → refaz por chave; só as
+                                            chaves que falham vão para retry
+    dedupe.mark_many(ids) / versions.set_versions(...)
+        │
+        ▼
+    fila de resultados → ack / republicação na thread da conexão (canal
+    não é thread-safe)
+
+Contadores, latência do handler e profundidade da fila (queue_declare
+passivo a cada `depth_interval`) vão para core.utils.metrics, com label
+`queue`.
+"""
+import hashlib
+import logging
+import queue
+import threading
+import time
+import zlib
+from collections import namedtuple
+from datetime import datetime, timezone
+from itertools import groupby
+
+from kombu import Consumer, Producer
+
+from core.utils import metrics
+from infra.messaging.consumer.retry import FIRST_SEEN_HEADER
+
+logger = logging.getLogger(__name__)
+
+# Resultado de cada mensagem (aplicado na thread da conexão)
+ACK = "ack"
+RETRY = "retry"
+DEAD = "dead"
+
+
+# ============================================================
+# MÉTRICAS (Prometheus)
+# ============================================================
+COUNTERS = {
+    "received": metrics.counter("messaging_consumed_total", "Mensagens recebidas pelo consumer", ["queue"]),
+    "acked": metrics.counter("messaging_acked_total", "Mensagens confirmadas (ack)", ["queue"]),
+    "rejected": metrics.counter("messaging_rejected_total", "Mensagens rejeitadas ou devolvidas", ["queue"]),
+    "duplicates": metrics.counter("messaging_duplicates_total", "Reentregas descartadas pelo dedupe", ["queue"]),
+    "retried": metrics.counter("messaging_retried_total", "Mensagens enviadas para fila de atraso", ["queue"]),
+    "dead_lettered": metrics.counter("messaging_dead_lettered_total", "Mensagens enviadas para a DLQ", ["queue"]),
+    "stale": metrics.counter("messaging_stale_total", "Mensagens mais antigas que a já aplicada", ["queue"]),
+}
+HANDLER_SECONDS = metrics.histogram(
+    "messaging_handler_seconds", "Duração de handle_batch por lote", ["queue"],
+)
+BATCH_SIZE = metrics.histogram(
+    "messaging_batch_size", "Mensagens por lote entregue ao handler", ["queue"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+QUEUE_DEPTH = metrics.gauge("messaging_queue_depth", "Mensagens prontas na fila (broker)", ["queue"])
+QUEUE_CONSUMERS = metrics.gauge("messaging_queue_consumers", "Consumers conectados na fila (broker)", ["queue"])
+
+# Intervalo entre leituras da profundidade das filas no broker
+DEPTH_INTERVAL = 15
+
+
+# Mensagem a caminho do worker (key normalizada para str)
+_Entry = namedtuple("_Entry", "item message message_id key version")
+
+
+class InvalidMessage(Exception):
+    """
+    Mensagem que nunca vai ser processada (assinatura, formato): reject sem
+    passar pelos workers.
+    """
+
+
+def default_message_id(body, message):
+    """
+    message_id do AMQP (publish_batch sempre define); sem ele, o hash do
+    corpo bruto.
+    """
+    return message.properties.get("message_id") or hashlib.sha256(message.body).hexdigest()
+
+
+def message_version(message):
+    """
+    Versão da mensagem para a ordem por chave (epoch em ns).
+
+    Vem do produtor: a propriedade `timestamp` do AMQP (segundos; o
+    RetryPolicy a preserva na republicação). Sem ela cai para o instante em
+    que a mensagem foi vista pela primeira vez (header do RetryPolicy), que
+    só ordena dentro de uma réplica: com várias réplicas e prefetch, uma
+    atualização antiga presa numa réplica pode receber versão maior que uma
+    nova já aplicada por outra, e a ordem entre réplicas não é garantida.
+    Empates (mesmo segundo) são aplicados na ordem de chegada.
+    """
+    timestamp = (message.properties or {}).get("timestamp")
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)  # py-amqp entrega em UTC
+        return int(timestamp.timestamp()) * 1_000_000_000
+    if timestamp:
+        return int(timestamp) * 1_000_000_000
+    return int((message.headers or {}).get(FIRST_SEEN_HEADER) or time.time_ns())
+
+
+class ConsumerRuntime:
+    """
+    `dedupe` (RedisDedupeStore / SQLiteDedupeStore) torna o processamento
+    idempotente; `retry` (RetryPolicy da fila) troca o reject por filas de
+    atraso + DLQ. Sem eles, falha = reject, como antes.
+
+    `versions` (RedisVersionStore / SQLiteVersionStore) mantém a ordem por
+    chave com retry: uma mensagem que volta do atraso depois de uma mais nova
+    da mesma chave ter sido aplicada é descartada (ack, conta em `stale`).
+    A versão sai de `version(message)` (padrão: message_version, timestamp
+    do produtor); um número de sequência do payload pode ser usado no lugar.
+    """
+
+    def __init__(self, connection, queues, prepare, handle_batch, workers=4, prefetch_count=64,
+                 batch_size=50, batch_wait=0, poll_interval=0.01, report_every=30, accept=("json",),
+                 dedupe=None, retry=None, message_id=default_message_id, depth_interval=DEPTH_INTERVAL,
+                 versions=None, version=message_version):
+        self.connection = connection
+        self.queues = queues
+        self.prepare = prepare
+        self.handle_batch = handle_batch
+        self.workers = workers
+        self.prefetch_count = prefetch_count
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.poll_interval = poll_interval
+        self.report_every = report_every
+        self.accept = list(accept)
+        self.dedupe = dedupe
+        self.retry = retry
+        self.versions = versions
+        self.version = version
+        self.message_id = message_id
+        self.depth_interval = depth_interval
+        self.name = ",".join(q.name for q in queues)
+
+        self._work_queues = [queue.Queue() for _ in range(workers)]
+        self._done = queue.Queue()
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "received": 0, "acked": 0, "rejected": 0, "batches": 0,
+            "duplicates": 0, "retried": 0, "dead_lettered": 0, "stale": 0,
+        }
+
+    # ---------------------------------------------------------
+    # Métricas
+    # ---------------------------------------------------------
+    def _incr(self, **values):
+        with self._stats_lock:
+            for key, value in values.items():
+                self._stats[key] += value
+
+        for key, value in values.items():
+            if key in COUNTERS:
+                COUNTERS[key].labels(queue=self.name).inc(value)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["in_flight"] = stats["received"] - stats["acked"] - stats["rejected"]
+        stats["avg_batch_size"] = (
+            (stats["acked"] + stats["rejected"]) / stats["batches"] if stats["batches"] else None
+        )
+        return stats
+
+    def _report(self, since, previous):
+        stats = self.stats()
+        elapsed = time.monotonic() - since
+        done = stats["acked"] + stats["rejected"] - previous
+        logger.info(
+            f"Consumer: {done / elapsed:.0f} msg/s, {stats['acked']} ack, "
+            f"{stats['rejected']} reject, {stats['duplicates']} duplicadas, "
+            f"{stats['retried']} retry, {stats['in_flight']} em voo, "
+            f"lote médio {stats['avg_batch_size'] or 0:.1f}"
+        )
+        return stats["acked"] + stats["rejected"]
+
+    def _poll_depth(self, channel):
+        """
+        queue_declare passivo: lê mensagens prontas e consumers sem criar a
+        fila. Usa um canal próprio (no AMQP um erro no declare fecha o canal).
+        Retorna o canal para a próxima leitura (None se precisa recriar).
+        """
+        try:
+            channel = channel or self.connection.channel()
+            dlq = [self.retry.dead_letter_queue] if self.retry is not None else []
+            for q in [*self.queues, *dlq]:
+                _, messages, consumers = q(channel).queue_declare(passive=True)
+                QUEUE_DEPTH.labels(queue=q.name).set(messages)
+                QUEUE_CONSUMERS.labels(queue=q.name).set(consumers)
+            return channel
+        except Exception as e:
+            logger.warning(f"Erro ao ler profundidade da fila: {e}")
+            return None
+
+    # ---------------------------------------------------------
+    # Thread da conexão
+    # ---------------------------------------------------------
+    def _partition(self, key):
+        return zlib.crc32(str(key).encode()) % self.workers
+
+    def _on_message(self, body, message):
+        self._incr(received=1)
+        version = self.version(message)
+        try:
+            key, item = self.prepare(body)
+        except InvalidMessage as e:
+            logger.error(f"Mensagem inválida: {e}")
+            self._done.put((message, DEAD, version))
+            return
+        except Exception:
+            logger.exception("Erro ao preparar mensagem")
+            self._done.put((message, RETRY, version))
+            return
+
+        entry = _Entry(item, message, self.message_id(body, message), str(key), version)
+        self._work_queues[self._partition(key)].put(entry)
+
+    def _fail(self, producer, message, outcome, version):
+        if self.retry is None:
+            message.reject()
+            self._incr(rejected=1)
+            return
+
+        try:
+            target = self.retry.republish(producer, message, dead=outcome == DEAD, version=version)
+        except Exception:
+            # sem conseguir republicar: devolve para a fila
+            logger.exception("Erro ao republicar mensagem para retry")
+            message.requeue()
+            self._incr(rejected=1)
+            return
+
+        message.ack()
+        if target is self.retry.dead_letter_queue:
+            self._incr(dead_lettered=1, acked=1)
+        else:
+            self._incr(retried=1, acked=1)
+
+    def _flush_acks(self, producer=None):
+        while True:
+            try:
+                message, outcome, version = self._done.get_nowait()
+            except queue.Empty:
+                return
+            if outcome == ACK:
+                message.ack()
+                self._incr(acked=1)
+            else:
+                self._fail(producer, message, outcome, version)
+
+    # ---------------------------------------------------------
+    # Workers
+    # ---------------------------------------------------------
+    def _next_batch(self, work_queue):
+        try:
+            batch = [work_queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        # batch_wait=0: só junta o que já chegou (o lote cresce sozinho
+        # enquanto o lote anterior está no banco, sem atrasar mensagens)
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(work_queue.get(timeout=remaining) if remaining > 0 else work_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _split_duplicates(self, batch):
+        """
+        (novas, duplicadas): já registradas no dedupe ou repetidas no lote.
+        """
+        seen = self.dedupe.seen_many({e.message_id for e in batch}) if self.dedupe else set()
+
+        fresh, duplicates = [], []
+        for entry in batch:
+            if entry.message_id in seen:
+                duplicates.append(entry)
+            else:
+                seen.add(entry.message_id)
+                fresh.append(entry)
+        return fresh, duplicates
+
+    def _split_stale(self, batch):
+        """
+        (atuais, antigas): antigas são mais velhas que a última versão já
+        aplicada da mesma chave (ex: voltaram do atraso depois de uma nova).
+        """
+        if self.versions is None:
+            return batch, []
+
+        applied = self.versions.get_versions({e.key for e in batch})
+        current, stale = [], []
+        for entry in batch:
+            (stale if entry.version < applied.get(entry.key, 0) else current).append(entry)
+        return current, stale
+
+    def _handle(self, batch):
+        """
+        Chama handle_batch; se o lote falha, refaz chave a chave para que só
+        as chaves com erro (e não o lote inteiro) sigam para retry.
+        Retorna (ok, falhas).
+        """
+        try:
+            with HANDLER_SECONDS.labels(queue=self.name).time():
+                self.handle_batch([e.item for e in batch])
+            return batch, []
+        except Exception:
+            logger.exception(f"Erro ao processar lote de {len(batch)} mensagem(ns)")
+
+        groups = [list(group) for _, group in groupby(sorted(batch, key=lambda e: e.key), key=lambda e: e.key)]
+        if len(groups) == 1:
+            return [], batch
+
+        ok, failed = [], []
+        for group in groups:  # sorted é estável: a ordem dentro da chave se mantém
+            try:
+                with HANDLER_SECONDS.labels(queue=self.name).time():
+                    self.handle_batch([e.item for e in group])
+                ok.extend(group)
+            except Exception:
+                logger.exception(f"Erro ao processar a chave {group[0].key}")
+                failed.extend(group)
+        return ok, failed
+
+    def _process(self, batch):
+        fresh, duplicates = self._split_duplicates(batch)
+        fresh, stale = self._split_stale(fresh)
+        if duplicates or stale:
+            self._incr(duplicates=len(duplicates), stale=len(stale))
+        for entry in duplicates + stale:
+            self._done.put((entry.message, ACK, entry.version))
+
+        if not fresh:
+            return
+
+        BATCH_SIZE.labels(queue=self.name).observe(len(fresh))
+        ok, failed = self._handle(fresh)
+
+        if ok and self.dedupe:
+            try:
+                self.dedupe.mark_many([e.message_id for e in ok])
+            except Exception:
+                # o trabalho já foi feito: só perde a proteção contra reentrega
+                logger.exception("Erro ao registrar mensagens no dedupe")
+
+        if ok and self.versions is not None:
+            latest = {}
+            for entry in ok:
+                latest[entry.key] = max(entry.version, latest.get(entry.key, 0))
+            try:
+                self.versions.set_versions(latest)
+            except Exception:
+                logger.exception("Erro ao registrar versões aplicadas")
+
+        for entry in ok:
+            self._done.put((entry.message, ACK, entry.version))
+        for entry in failed:
+            self._done.put((entry.message, RETRY, entry.version))
+
+    def _worker(self, work_queue):
+        while not (self._stop.is_set() and work_queue.empty()):
+            batch = self._next_batch(work_queue)
+            if not batch:
+                continue
+
+            try:
+                self._process(batch)
+            except Exception:
+                # dedupe fora do ar etc.: o lote volta por retry
+                logger.exception("Erro no worker do consumer")
+                for entry in batch:
+                    self._done.put((entry.message, RETRY, entry.version))
+
+            self._incr(batches=1)
+
+    # ---------------------------------------------------------
+    # Execução
+    # ---------------------------------------------------------
+    def stop(self):
+        self._stop.set()
+
+    def run(self, max_messages=None):
+        """
+        Consome até stop() (ou até `max_messages` concluídas, usado pelo
+        benchmark). Ao parar, espera os workers e confirma o que terminou.
+        """
+        threads = [
+            threading.Thread(target=self._worker, args=(work_queue,), name=f"consumer-worker-{n}", daemon=True)
+            for n, work_queue in enumerate(self._work_queues)
+        ]
+        for thread in threads:
+            thread.start()
+
+        report_at = time.monotonic() + self.report_every
+        since, previous = time.monotonic(), 0
+        depth_at, depth_channel = time.monotonic(), None
+
+        producer = Producer(self.connection.default_channel)
+        if self.retry is not None:
+            self.retry.declare(self.connection.default_channel)
+
+        with Consumer(
+            self.connection,
+            queues=self.queues,
+            callbacks=[self._on_message],
+            accept=self.accept,
+            prefetch_count=self.prefetch_count,
+        ):
+            logger.info(
+                f"Consumer iniciado (prefetch={self.prefetch_count}, workers={self.workers}, "
+                f"lote={self.batch_size})"
+            )
+            while not self._stop.is_set():
+                try:
+                    self.connection.drain_events(timeout=self.poll_interval)
+                except TimeoutError:  # socket.timeout
+                    pass
+
+                self._flush_acks(producer)
+
+                if max_messages is not None:
+                    stats = self.stats()
+                    if stats["acked"] + stats["rejected"] >= max_messages:
+                        self.stop()
+
+                if time.monotonic() >= report_at:
+                    previous = self._report(since, previous)
+                    since, report_at = time.monotonic(), time.monotonic() + self.report_every
+
+                if self.depth_interval and time.monotonic() >= depth_at:
+                    depth_channel = self._poll_depth(depth_channel)
+                    depth_at = time.monotonic() + self.depth_interval
+
+            for thread in threads:
+                thread.join()
+            self._flush_acks(producer)
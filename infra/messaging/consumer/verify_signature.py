@@ -1,10 +1,23 @@
+import hashlib
+import json
 import os
+import threading
+import time
 import jwt
 import logging
+from collections import OrderedDict
 from jwt import InvalidTokenError
+from jwt.algorithms import RSAAlgorithm
 
 logger = logging.getLogger(__name__)
 
+# Chave sem "kid" (env com um PEM só ou token sem kid no header)
+DEFAULT_KID = None
+# Tokens verificados guardados (LRU) até o exp
+MAX_CACHED_TOKENS = 4096
+# Intervalo mínimo entre releituras do env quando chega um kid desconhecido
+KEY_RELOAD_INTERVAL = 60
+
 
 def get_client_public_key(env_name: str) -> str:
     client_id = os.environ.get(env_name).replace("\\n", "\n")
@@ -17,25 +30,137 @@ def get_client_id(env_name: str) -> str:
     return client_id
 
 
+def parse_public_keys(raw: str) -> dict:
+    """
+    Env com um PEM → {None: chave}. Para rotação o env pode trazer um JSON
+    {"kid": "PEM", ...}; a primeira entrada também vale para tokens sem kid.
+    """
+    rsa = RSAAlgorithm(RSAAlgorithm.SHA256)
+
+    if raw.lstrip().startswith("{"):
+        pems = json.loads(raw, strict=False)  # PEM com quebras de linha reais
+        keys = {kid: rsa.prepare_key(pem.replace("\\n", "\n")) for kid, pem in pems.items()}
+        if keys:
+            keys[DEFAULT_KID] = next(iter(keys.values()))
+        return keys
+
+    return {DEFAULT_KID: rsa.prepare_key(raw)}
+
+
+class SignatureVerifier:
+    """
+    Verificador de JWT RS256 de um emissor. As chaves públicas são lidas e
+    parseadas uma vez (por kid) e tokens já verificados ficam em cache pelo
+    hash até o exp: o produtor reusa o mesmo token por uma hora.
+    """
+
+    def __init__(self, client_public_key_env_name: str, audience: str, client_id_env_name: str,
+                 max_cached_tokens: int = MAX_CACHED_TOKENS):
+        self.public_key_env_name = client_public_key_env_name
+        self.audience = audience
+        self.client_id_env_name = client_id_env_name
+        self.max_cached_tokens = max_cached_tokens
+
+        self._keys = None
+        self._keys_loaded_at = 0.0
+        self._issuer = None
+        self._verified = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalid": 0}
+
+    # ---------------------------------------------------------
+    # Chaves
+    # ---------------------------------------------------------
+    def load_keys(self):
+        self._keys = parse_public_keys(get_client_public_key(self.public_key_env_name))
+        self._issuer = get_client_id(self.client_id_env_name)
+        self._keys_loaded_at = time.monotonic()
+
+    def _key_for(self, kid):
+        if self._keys is None:
+            self.load_keys()
+
+        if kid not in self._keys and time.monotonic() - self._keys_loaded_at >= KEY_RELOAD_INTERVAL:
+            # kid novo: a chave pode ter sido rotacionada
+            self.load_keys()
+
+        try:
+            return self._keys[kid]
+        except KeyError:
+            raise InvalidTokenError(f"kid desconhecido: {kid}")
+
+    # ---------------------------------------------------------
+    # Verificação
+    # ---------------------------------------------------------
+    def _cached(self, digest):
+        entry = self._verified.get(digest)
+        if entry is None:
+            return None
+
+        claims, exp = entry
+        if exp <= time.time():
+            del self._verified[digest]
+            return None
+
+        self._verified.move_to_end(digest)
+        return claims
+
+    def _remember(self, digest, claims):
+        self._verified[digest] = (claims, claims["exp"])
+        self._verified.move_to_end(digest)
+        while len(self._verified) > self.max_cached_tokens:
+            self._verified.popitem(last=False)
+
+    def verify(self, token: str) -> dict | None:
+        digest = hashlib.sha256(token.encode()).hexdigest()
+
+        with self._lock:
+            claims = self._cached(digest)
+            self.stats["hits" if claims is not None else "misses"] += 1
+        if claims is not None:
+            return claims
+
+        # a verificação RSA roda fora do lock
+        try:
+            kid = jwt.get_unverified_header(token).get("kid", DEFAULT_KID)
+            with self._lock:
+                key = self._key_for(kid)
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=['RS256'],
+                audience=self.audience,
+                issuer=self._issuer,
+                options={
+                    "verify_signature": True,
+                    "verify_exp": True,
+                    "verify_aud": True,
+                    "verify_iss": True,
+                    "require": ["exp"],
+                }
+            )
+        except InvalidTokenError as e:
+            with self._lock:
+                self.stats["invalid"] += 1
+            logger.error(f"JWT inválido: {e}")
+            return None
+
+        with self._lock:
+            self._remember(digest, claims)
+        return claims
+
+
+_verifiers = {}
+_verifiers_lock = threading.Lock()
+
+
+def get_verifier(client_public_key_env_name: str, audience: str, client_id_env_name: str) -> SignatureVerifier:
+    key = (client_public_key_env_name, audience, client_id_env_name)
+    with _verifiers_lock:
+        if key not in _verifiers:
+            _verifiers[key] = SignatureVerifier(client_public_key_env_name, audience, client_id_env_name)
+        return _verifiers[key]
+
+
 def verify_signature(token: str, client_public_key_env_name: str, audience: str, client_id_env_name: str) -> dict | None:
-    try:
-
-        public_key = get_client_public_key(client_public_key_env_name)
-
-        decoded = jwt.decode(
-            token,
-            public_key,
-            algorithms=['RS256'],
-            audience=audience,
-            issuer=get_client_id(client_id_env_name),
-            options={
-                "verify_signature": True,
-                "verify_exp": True,
-                "verify_aud": True,
-                "verify_iss": True,
-            }
-        )
-        return decoded
-    except InvalidTokenError as e:
-        logger.error(f"JWT inválido: {e}")
-        return None
\ No newline at end of file
+    return get_verifier(client_public_key_env_name, audience, client_id_env_name).verify(token)
@@ -1,17 +1,27 @@
 import os
 import logging
-from typing import Dict, Any
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Tuple
 
-from commun.jwt_access_token import JwtAccessToken
+from infra.commun.jwt_access_token import JwtAccessToken
 
-from kombu import Connection, Exchange, Producer
+from kombu import Connection, Exchange
+from kombu.pools import producers
 from django.conf import settings
 
+from core.utils import metrics
+
 # Configurar logger
 logger = logging.getLogger(__name__)
 
 
 def get_rabbitmq_url() -> str:
+    # URL completa tem precedência (ex: memory:// nos testes e benchmarks)
+    if os.environ.get('RABBITMQ_URL'):
+        return os.environ['RABBITMQ_URL']
+
     # Obter as variáveis individuais do RabbitMQ
     # rabbit_user = os.environ.get('RABBITMQ_DEFAULT_USER') or getattr(settings, 'RABBITMQ_DEFAULT_USER')
     rabbit_user = os.environ.get('RABBITMQ_DEFAULT_USER')
@@ -27,41 +37,94 @@ def get_rabbitmq_url() -> str:
     return formatted_url
 
 
-def send_rabbitmq_message(payload: Dict[str, Any], routing_key: str, url: str = None) -> bool:
-    # Obter URL do RabbitMQ
+# ============================================================
+# PUBLICAÇÃO (pools de conexão/producer por processo)
+# ============================================================
+EXCHANGE = Exchange('amq.direct', type='direct')
+
+RETRY_POLICY = {
+    'interval_start': 0,  # Começa imediatamente
+    'interval_step': 2,   # Aumenta 2s por retry
+    'interval_max': 30,   # Máximo de 30s entre retries
+    'max_retries': 5,     # Tenta até 5 vezes
+}
+
+# Quem publica segurando locks (relay do outbox) desiste rápido: o evento
+# continua pendente e volta no próximo lote
+SHORT_RETRY_POLICY = {
+    'interval_start': 0,
+    'interval_step': 0.5,
+    'interval_max': 1,
+    'max_retries': 2,
+}
+
+_connections: Dict[str, Connection] = {}
+
+PUBLISHED = metrics.counter("messaging_published_total", "Mensagens publicadas no RabbitMQ", ["routing_key"])
+PUBLISH_FAILED = metrics.counter("messaging_publish_failed_total", "Lotes com erro na publicação")
+PUBLISH_RETRIES = metrics.counter("messaging_publish_retries_total", "Retentativas de publicação (reconexão)")
+PUBLISH_SECONDS = metrics.histogram("messaging_publish_seconds", "Duração de cada publish (inclui retries)")
+
+
+def _on_publish_retry(exc, interval):
+    # errback do connection.ensure: chamado a cada retentativa
+    PUBLISH_RETRIES.inc()
+    logger.warning(f"Retentando publicação em {interval}s: {exc}")
+
+
+def get_connection(url: str = None) -> Connection:
+    """
+    Uma Connection por URL; é a chave dos pools do kombu (a conexão TCP/AMQP
+    só é aberta pelo pool e reaproveitada entre publicações).
+    """
     rabbitmq_url = url or get_rabbitmq_url()
-    
-    # Estruturar a mensagem
-    message = {
-        'payload': payload,
-        'jwt': JwtAccessToken().token
-    }
-    
-    # Log para debug
-    logger.debug(f"Preparando envio para RabbitMQ: {routing_key} - {payload}")
-    
-    # Enviar a mensagem
+    if rabbitmq_url not in _connections:
+        _connections[rabbitmq_url] = Connection(rabbitmq_url)
+    return _connections[rabbitmq_url]
+
+
+def publish_batch(events: Iterable[Tuple], url: str = None, retry_policy: Dict[str, Any] = None) -> int:
+    """
+    Publica vários eventos (payload, routing_key[, message_id]) com um
+    producer do pool e o mesmo JWT. O message_id (uuid4 se omitido) é o que
+    o consumer usa para descartar reentregas. Retorna quantos foram
+    publicados antes de um eventual erro. `retry_policy` substitui o
+    RETRY_POLICY (ex: SHORT_RETRY_POLICY).
+    """
+    published = 0
+    retry_policy = {**(retry_policy or RETRY_POLICY), 'errback': _on_publish_retry}
+    token = JwtAccessToken.cached()
+
     try:
-        with Connection(rabbitmq_url) as conn:
-            # Use o exchange padrão amq.direct
-            exchange = Exchange('amq.direct', type='direct')
-            producer = Producer(conn)
-            
-            # Publica com a routing key apropriada
-            producer.publish(
-                message,
-                exchange=exchange,
-                routing_key=routing_key,
-                retry=True,
-                retry_policy={
-                    'interval_start': 0,  # Começa imediatamente
-                    'interval_step': 2,   # Aumenta 2s por retry
-                    'interval_max': 30,   # Máximo de 30s entre retries
-                    'max_retries': 5,     # Tenta até 5 vezes
-                },
-            )
-            logger.info(f"Mensagem enviada para RabbitMQ: {routing_key}")
-            return True
+        with producers[get_connection(url)].acquire(block=True) as producer:
+            for payload, routing_key, *message_id in events:
+                started = time.perf_counter()
+                producer.publish(
+                    {'payload': payload, 'jwt': token},
+                    exchange=EXCHANGE,
+                    routing_key=routing_key,
+                    message_id=message_id[0] if message_id else uuid.uuid4().hex,
+                    # ordem por chave no consumer (message_version); o
+                    # py-amqp serializa a propriedade a partir de datetime
+                    timestamp=datetime.now(timezone.utc),
+                    retry=True,
+                    retry_policy=retry_policy,
+                )
+                PUBLISH_SECONDS.observe(time.perf_counter() - started)
+                PUBLISHED.labels(routing_key=routing_key).inc()
+                published += 1
+                logger.debug(f"Mensagem enviada para RabbitMQ: {routing_key}")
     except Exception as e:
+        PUBLISH_FAILED.inc()
         logger.error(f"Erro ao enviar mensagem para RabbitMQ: {e}", exc_info=True)
-        return False 
\ No newline at end of file
+
+    return published
+
+
+def send_rabbitmq_message(payload: Dict[str, Any], routing_key: str, url: str = None) -> bool:
+    logger.debug(f"Preparando envio para RabbitMQ: {routing_key} - {payload}")
+
+    if publish_batch([(payload, routing_key)], url=url) == 1:
+        logger.info(f"Mensagem enviada para RabbitMQ: {routing_key}")
+        return True
+    return False
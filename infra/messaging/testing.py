@@ -0,0 +1,190 @@
+"""
+Stand-in local do RabbitMQ para testes e benchmarks.
+
+`MemoryBroker` aponta publicador e consumer para o transporte `memory://` do
+kombu (mensagens só entre threads do mesmo processo), gera um par de chaves
+RSA e configura os envs de JWT dos dois lados:
+
+    with MemoryBroker() as broker:
+        broker.publish_client_updates([("c1", "pub", "priv")])
+        with broker.connection() as conn:
+            build_runtime(conn, dedupe=SQLiteDedupeStore()).run(max_messages=1)
+
+`SQLiteClientStore` faz o papel do banco do consumer de client (o model de
+produção fica em outro serviço): mesma semântica de `apply_client_keys`, um
+UPDATE em lote por transação.
+"""
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from kombu import Connection, Producer, pools
+from kombu.transport import memory
+
+from infra.commun.jwt_access_token import JwtAccessToken
+from infra.messaging import subscribe
+from infra.messaging.consumer import client_consumer, verify_signature
+
+MEMORY_URL = "memory://"
+ISSUER = "permissao-back-test"
+
+
+def generate_key_pair():
+    """
+    (PEM privado, PEM público) RSA 2048.
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+def reset_memory_transport():
+    # o memory:// guarda filas e bindings em atributos de classe (processo)
+    memory.Channel.queues.clear()
+    memory.Channel.events.clear()
+    memory.Transport.global_state.clear()
+
+
+class MemoryBroker:
+
+    def __init__(self, issuer=ISSUER):
+        self.issuer = issuer
+        self.private_key, self.public_key = generate_key_pair()
+        self._saved_env = {}
+
+    # ---------------------------------------------------------
+    # Ciclo de vida
+    # ---------------------------------------------------------
+    def _set_env(self, **values):
+        for name, value in values.items():
+            self._saved_env.setdefault(name, os.environ.get(name))
+            os.environ[name] = value
+
+    def _reset_caches(self):
+        subscribe._connections.clear()
+        pools.reset()
+        JwtAccessToken.clear_cache()
+        verify_signature._verifiers.clear()
+
+    def __enter__(self):
+        self._set_env(
+            RABBITMQ_URL=MEMORY_URL,
+            # publicador deste serviço (publish_batch)
+            JWT_PRIVATE_KEY=self.private_key,
+            JWT_CLIENT_ID=self.issuer,
+            # emissor das mensagens de client (serviço de permissão)
+            **{
+                client_consumer.client_public_key_env_name: self.public_key,
+                client_consumer.client_id_env_name: self.issuer,
+            },
+        )
+        reset_memory_transport()
+        self._reset_caches()
+
+        with self.connection() as conn:
+            # amq.* já existe no RabbitMQ (o kombu não declara); no memory:// não
+            conn.default_channel.exchange_declare(subscribe.EXCHANGE.name, type=subscribe.EXCHANGE.type)
+            client_consumer.queue(conn.default_channel).declare()
+        return self
+
+    def __exit__(self, *exc):
+        for name, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        self._saved_env = {}
+
+        reset_memory_transport()
+        self._reset_caches()
+
+    def connection(self):
+        return Connection(MEMORY_URL)
+
+    # ---------------------------------------------------------
+    # Lado do serviço de permissão
+    # ---------------------------------------------------------
+    def sign(self, audience=client_consumer.client_aud_name, ttl=timedelta(hours=1)):
+        now = datetime.now(timezone.utc)
+        return jwt.encode(
+            {"iss": self.issuer, "aud": audience, "iat": now, "exp": now + ttl},
+            self.private_key,
+            algorithm="RS256",
+        )
+
+    def publish_client_updates(self, updates, token=None):
+        """
+        Publica ClientCreatedIntegrationEvent para cada
+        (client_id, public_key, private_key), com um token só (como o
+        produtor real). Retorna quantas foram publicadas.
+        """
+        token = token or self.sign()
+        queue = client_consumer.queue
+        published = 0
+        with self.connection() as conn:
+            producer = Producer(conn)
+            for client_id, public_key, private_key in updates:
+                producer.publish(
+                    {
+                        "payload": {"id_client": client_id, "public_key": public_key, "private_key": private_key},
+                        "jwt": token,
+                    },
+                    exchange=queue.exchange,
+                    routing_key=queue.routing_key,
+                    message_id=uuid.uuid4().hex,
+                )
+                published += 1
+        return published
+
+    def depth(self, queue):
+        with self.connection() as conn:
+            return queue(conn.default_channel).queue_declare(passive=True).message_count
+
+
+class SQLiteClientStore:
+    """
+    Tabela de clients (id, public_key, private_key) em SQLite; `apply_client_keys`
+    é o handle_batch do consumer.
+    """
+
+    def __init__(self, path=":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS clients (id TEXT PRIMARY KEY, public_key TEXT, private_key TEXT)"
+        )
+
+    def create(self, client_ids):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO clients (id, public_key, private_key) VALUES (?, '', '')",
+                [(client_id,) for client_id in client_ids],
+            )
+
+    def apply_client_keys(self, items):
+        latest = {str(item["id"]): item for item in items}  # a última vence
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "UPDATE clients SET public_key = ?, private_key = ? WHERE id = ?",
+                [(item["public_key"], item["private_key"], client_id) for client_id, item in latest.items()],
+            )
+            self._db.execute("COMMIT")
+
+    def keys(self):
+        with self._lock:
+            rows = self._db.execute("SELECT id, public_key, private_key FROM clients").fetchall()
+        return {client_id: (public_key, private_key) for client_id, public_key, private_key in rows}
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark do ConsumerRuntime no transporte em memória do kombu (sem
+RabbitMQ nem banco). O handler simula o custo de uma ida ao banco por lote
+mais um custo por item; compara o consumo um-a-um (como o consumer antigo)
+com prefetch + workers + micro-lotes.
+
+    python -m infra.scripts.consumer_benchmark --messages 5000 --clients 200
+"""
+import argparse
+import random
+import threading
+import time
+
+from kombu import Connection, Consumer, Exchange, Producer, Queue
+
+from infra.messaging.consumer.dedupe import SQLiteDedupeStore
+from infra.messaging.consumer.runtime import ConsumerRuntime
+
+URL = "memory://"
+EXCHANGE = Exchange("benchmark", type="direct")
+
+CONFIGS = [
+    # (nome, workers, prefetch, lote)
+    ("prefetch + 4 workers", 4, 64, 1),
+    ("prefetch + 4 workers + lote", 4, 64, 50),
+]
+
+
+def publish(queue, messages, clients, seed, duplicates=0.0):
+    """
+    Publica `messages` mensagens; uma fração `duplicates` delas é reentregue
+    (mesmo message_id) logo depois. Retorna o total publicado.
+    """
+    rnd = random.Random(seed)
+    total = 0
+    with Connection(URL) as conn:
+        queue(conn.default_channel).declare()
+        producer = Producer(conn)
+        for n in range(messages):
+            body = {"client": rnd.randrange(clients), "seq": n}
+            copies = 2 if rnd.random() < duplicates else 1
+            for _ in range(copies):
+                producer.publish(body, exchange=EXCHANGE, routing_key=queue.routing_key, message_id=f"m{n}")
+            total += copies
+    return total
+
+
+def handler(args):
+    """
+    handle_batch simulado + contador de mensagens fora de ordem por client.
+    """
+    last_seq = {}
+    out_of_order = [0]
+    lock = threading.Lock()
+
+    def handle_batch(items):
+        time.sleep(args.roundtrip_ms / 1000 + len(items) * args.item_ms / 1000)
+        with lock:
+            for item in items:
+                if item["seq"] < last_seq.get(item["client"], -1):
+                    out_of_order[0] += 1
+                last_seq[item["client"]] = item["seq"]
+
+    return handle_batch, out_of_order
+
+
+def run_inline(args):
+    """
+    Como o consumer antigo: drain_events → processa → ack, uma por vez.
+    """
+    queue = Queue("benchmark-inline", exchange=EXCHANGE, routing_key="benchmark-inline")
+    publish(queue, args.messages, args.clients, args.seed)
+    handle_batch, out_of_order = handler(args)
+    done = [0]
+
+    def on_message(body, message):
+        handle_batch([body])
+        message.ack()
+        done[0] += 1
+
+    with Connection(URL) as conn:
+        with Consumer(conn, queues=[queue], callbacks=[on_message], accept=["json"]):
+            started = time.monotonic()
+            while done[0] < args.messages:
+                conn.drain_events(timeout=1)
+            elapsed = time.monotonic() - started
+
+    print(f"{'um a um (consumer antigo)':<45} {args.messages / elapsed:>8.0f} msg/s  "
+          f"lote médio   1.0  fora de ordem {out_of_order[0]}")
+
+
+def run(name, workers, prefetch, batch_size, args, duplicates=0.0):
+    queue_name = f"benchmark-{workers}-{prefetch}-{batch_size}-{duplicates}"
+    queue = Queue(queue_name, exchange=EXCHANGE, routing_key=queue_name)
+    total = publish(queue, args.messages, args.clients, args.seed, duplicates)
+
+    handle_batch, out_of_order = handler(args)
+
+    with Connection(URL) as conn:
+        runtime = ConsumerRuntime(
+            conn,
+            queues=[queue],
+            prepare=lambda body: (body["client"], body),
+            handle_batch=handle_batch,
+            workers=workers,
+            prefetch_count=prefetch,
+            batch_size=batch_size,
+            report_every=3600,
+            dedupe=SQLiteDedupeStore() if duplicates else None,
+        )
+        started = time.monotonic()
+        runtime.run(max_messages=total)
+        elapsed = time.monotonic() - started
+
+    stats = runtime.stats()
+    print(
+        f"{name:<45} {total / elapsed:>8.0f} msg/s  "
+        f"lote médio {stats['avg_batch_size']:>5.1f}  fora de ordem {out_of_order[0]}  "
+        f"duplicadas {stats['duplicates']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--roundtrip-ms", type=float, default=2.0, help="custo fixo por lote (ida ao banco)")
+    parser.add_argument("--item-ms", type=float, default=0.05, help="custo por item do lote")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--duplicates", type=float, default=0.5,
+                        help="fração reentregue no cenário de tempestade (padrão: 0.5)")
+    args = parser.parse_args()
+
+    run_inline(args)
+    for config in CONFIGS:
+        run(*config, args)
+
+    # tempestade de reentregas: com dedupe as duplicadas só recebem ack
+    name, workers, prefetch, batch_size = CONFIGS[-1]
+    run(f"{name} + {args.duplicates:.0%} reentregas", workers, prefetch, batch_size, args, args.duplicates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark ponta a ponta do consumer de client no MemoryBroker: publica N
+ClientCreatedIntegrationEvent assinados, consome com o pipeline de produção
+(prepare_message com verificação do JWT, ConsumerRuntime, dedupe, retry) e
+grava as chaves num SQLite em disco. Reporta msg/s e latência do handler
+(p50/p99 por lote).
+
+    python -m infra.scripts.messaging_e2e_benchmark --messages 20000 --clients 500
+
+Com --min-rate o processo sai com código 1 se a vazão ficar abaixo do
+limite (regressão no CI).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from infra.messaging.consumer import client_consumer
+from infra.messaging.consumer.dedupe import SQLiteDedupeStore, SQLiteVersionStore
+from infra.messaging.testing import MemoryBroker, SQLiteClientStore
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def timed(handle_batch, durations):
+    lock = threading.Lock()
+
+    def handle(items):
+        started = time.perf_counter()
+        handle_batch(items)
+        with lock:
+            durations.append(time.perf_counter() - started)
+
+    return handle
+
+
+def run(args, db_path):
+    rnd = random.Random(args.seed)
+    client_ids = [f"client-{n}" for n in range(args.clients)]
+    updates = [
+        (rnd.choice(client_ids), f"pub-{n}", f"priv-{n}")
+        for n in range(args.messages)
+    ]
+
+    store = SQLiteClientStore(db_path)
+    store.create(client_ids)
+    durations = []
+
+    with MemoryBroker() as broker:
+        published = broker.publish_client_updates(updates)
+
+        with broker.connection() as conn:
+            runtime = client_consumer.build_runtime(
+                conn,
+                handle_batch=timed(store.apply_client_keys, durations),
+                dedupe=SQLiteDedupeStore(),
+                versions=SQLiteVersionStore(),
+                workers=args.workers,
+                prefetch_count=args.prefetch,
+                batch_size=args.batch_size,
+                report_every=3600,
+            )
+            started = time.monotonic()
+            runtime.run(max_messages=published)
+            elapsed = time.monotonic() - started
+
+    # a última atualização de cada client é a que fica no banco
+    expected = {client_id: (public_key, private_key) for client_id, public_key, private_key in updates}
+    keys = store.keys()
+    wrong = sum(1 for client_id, value in expected.items() if keys.get(client_id) != value)
+
+    stats = runtime.stats()
+    return {
+        "messages": published,
+        "rate": published / elapsed,
+        "p50_ms": percentile(durations, 0.50) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "avg_batch_size": stats["avg_batch_size"] or 0,
+        "rejected": stats["rejected"],
+        "wrong": wrong,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--prefetch", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-rate", type=float, default=None, help="msg/s mínima (falha abaixo disso)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run(args, os.path.join(tmp, "clients.sqlite3"))
+
+    print(
+        f"{result['messages']} mensagens  {result['rate']:.0f} msg/s  "
+        f"handler p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms  "
+        f"lote médio {result['avg_batch_size']:.1f}  rejeitadas {result['rejected']}  "
+        f"clients divergentes {result['wrong']}"
+    )
+
+    if result["wrong"] or result["rejected"]:
+        sys.exit("Resultado divergente do publicado")
+    if args.min_rate is not None and result["rate"] < args.min_rate:
+        sys.exit(f"Vazão {result['rate']:.0f} msg/s abaixo do mínimo {args.min_rate:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import asyncio
+import itertools
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from infra.commun.jwt_access_token import JwtAccessToken
+from infra.http.async_client import build_async_client, close_async_client, gather_limited, get_async_client
+from infra.http.http_client import HttpClient
+
+
+@pytest.fixture
+def tokens():
+    counter = itertools.count(1)
+    JwtAccessToken.clear_cache()
+    with patch.object(JwtAccessToken, "generate_jwt", side_effect=lambda now=None: f"token-{next(counter)}"):
+        yield
+    JwtAccessToken.clear_cache()
+
+
+def make_client(handler):
+    return HttpClient(client=build_async_client(transport=httpx.MockTransport(handler)), backoff=lambda *a, **k: 0)
+
+
+def test_idempotent_requests_are_retried_and_post_is_not(tokens):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(503 if len(calls) < 3 else 200)
+
+    async def scenario():
+        client = make_client(handler)
+        get = await client.get("http://api/items")
+        calls.clear()
+        post = await client.post("http://api/items", data={"a": 1})
+        await client.close()
+        return get, post
+
+    get, post = asyncio.run(scenario())
+    assert get.status_code == 200
+    assert post.status_code == 503
+    assert calls == ["POST"]
+
+
+def test_transport_errors_are_retried(tokens):
+    attempts = []
+
+    def handler(request):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("recusada", request=request)
+        return httpx.Response(200)
+
+    async def scenario():
+        client = make_client(handler)
+        response = await client.get("http://api")
+        await client.close()
+        return response
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert len(attempts) == 2
+
+
+def test_unauthorized_forces_a_new_token(tokens):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(401 if len(seen) == 1 else 200)
+
+    async def scenario():
+        client = make_client(handler)
+        first = await client.get("http://api")
+        second = await client.get("http://api")
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.status_code == second.status_code == 200
+    assert seen == ["Bearer token-1", "Bearer token-2", "Bearer token-2"]
+
+
+def test_gather_limited_bounds_concurrency_and_keeps_order():
+    in_flight, peak = [0], [0]
+
+    async def call(n):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.001)
+        in_flight[0] -= 1
+        return n
+
+    results = asyncio.run(gather_limited([lambda n=n: call(n) for n in range(20)], limit=3))
+    assert results == list(range(20))
+    assert peak[0] == 3
+
+
+def test_shared_client_is_reused_within_a_loop():
+    async def scenario():
+        first = get_async_client()
+        same = get_async_client() is first
+        await close_async_client()
+        return same, first.is_closed
+
+    assert asyncio.run(scenario()) == (True, True)
@@ -0,0 +1,49 @@
+import threading
+from unittest.mock import patch
+
+from infra.messaging.async_publisher import AsyncPublisher
+
+
+def test_enqueue_returns_immediately_and_drain_publishes_in_batches():
+    release = threading.Event()
+    batches = []
+
+    def slow_publish(events, url=None):
+        release.wait(5)
+        events = list(events)
+        batches.append(events)
+        return len(events)
+
+    publisher = AsyncPublisher(maxsize=100, batch_size=10)
+    with patch("infra.messaging.async_publisher.publish_batch", side_effect=slow_publish):
+        for n in range(25):
+            assert publisher.enqueue({"n": n}, "test")
+
+        assert publisher.metrics()["enqueued"] == 25
+        release.set()
+        assert publisher.drain(timeout=5)
+
+    assert [payload["n"] for batch in batches for payload, _ in batch] == list(range(25))
+    assert all(len(batch) <= 10 for batch in batches)
+
+    metrics = publisher.metrics()
+    assert metrics["published"] == 25
+    assert metrics["queue_depth"] == 0
+    assert not metrics["running"]
+
+
+def test_full_queue_drops_after_put_timeout():
+    release = threading.Event()
+
+    def blocked_publish(events, url=None):
+        release.wait(5)
+        return len(list(events))
+
+    publisher = AsyncPublisher(maxsize=2, batch_size=1, put_timeout=0.01)
+    with patch("infra.messaging.async_publisher.publish_batch", side_effect=blocked_publish):
+        results = [publisher.enqueue({"n": n}, "test") for n in range(5)]
+        release.set()
+        publisher.drain(timeout=5)
+
+    assert results.count(False) >= 2
+    assert publisher.metrics()["dropped"] == results.count(False)
@@ -0,0 +1,251 @@
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kombu import Connection, Exchange, Producer, Queue
+
+from core.utils import metrics
+from infra.messaging.consumer import client_consumer
+from infra.messaging.consumer.dedupe import SQLiteDedupeStore, SQLiteVersionStore
+from infra.messaging.consumer.retry import FIRST_SEEN_HEADER, RETRY_HEADER, RetryPolicy
+from infra.messaging.consumer.runtime import ConsumerRuntime, InvalidMessage
+
+URL = "memory://"
+
+
+def test_runtime_keeps_order_per_key_and_rejects_invalid():
+    exchange = Exchange("test-runtime", type="direct")
+    queue = Queue("test-runtime", exchange=exchange, routing_key="test-runtime")
+
+    with Connection(URL) as conn:
+        queue(conn.default_channel).declare()
+        producer = Producer(conn)
+        for n in range(200):
+            producer.publish({"key": n % 7, "seq": n}, exchange=exchange, routing_key="test-runtime")
+        producer.publish({"invalid": True}, exchange=exchange, routing_key="test-runtime")
+
+    seen = {}
+    lock = threading.Lock()
+
+    def prepare(body):
+        if "invalid" in body:
+            raise InvalidMessage("sem chave")
+        return body["key"], body
+
+    def handle_batch(items):
+        with lock:
+            for item in items:
+                seen.setdefault(item["key"], []).append(item["seq"])
+
+    with Connection(URL) as conn:
+        runtime = ConsumerRuntime(
+            conn, [queue], prepare, handle_batch, workers=3, prefetch_count=16, batch_size=10,
+        )
+        runtime.run(max_messages=201)
+
+    assert all(seqs == sorted(seqs) for seqs in seen.values())
+    assert sum(len(seqs) for seqs in seen.values()) == 200
+    assert runtime.stats()["acked"] == 200
+    assert runtime.stats()["rejected"] == 1
+
+
+def test_apply_client_keys_collapses_updates_into_one_bulk_update():
+    clients = {"c1": SimpleNamespace(pk="c1"), "c2": SimpleNamespace(pk="c2")}
+    model = MagicMock()
+    model.objects.in_bulk.return_value = clients
+
+    items = [
+        {"id": "c1", "public_key": "p1", "private_key": "k1"},
+        {"id": "c2", "public_key": "p2", "private_key": "k2"},
+        {"id": "c1", "public_key": "p1-new", "private_key": "k1-new"},
+    ]
+    with patch.object(client_consumer, "get_client_model", return_value=model):
+        client_consumer.apply_client_keys(items)
+
+    assert sorted(model.objects.in_bulk.call_args.args[0]) == ["c1", "c2"]
+    model.objects.bulk_update.assert_called_once()
+    assert clients["c1"].public_key == "p1-new"
+    assert clients["c2"].private_key == "k2"
+
+
+def test_prepare_message_rejects_bad_signature():
+    body = {"payload": {"id_client": "c1", "public_key": "p", "private_key": "k"}, "jwt": "x"}
+    with patch.object(client_consumer, "verify_signature", return_value=None):
+        with pytest.raises(InvalidMessage):
+            client_consumer.prepare_message(body)
+
+
+def publish_raw(queue, bodies):
+    with Connection(URL) as conn:
+        queue(conn.default_channel).declare()
+        producer = Producer(conn)
+        for message_id, body in bodies:
+            producer.publish(body, exchange=queue.exchange, routing_key=queue.routing_key, message_id=message_id)
+
+
+def test_redelivered_messages_are_applied_once():
+    exchange = Exchange("test-dedupe", type="direct")
+    queue = Queue("test-dedupe", exchange=exchange, routing_key="test-dedupe")
+    bodies = [(f"m{n}", {"key": n % 3, "seq": n}) for n in range(30)]
+    publish_raw(queue, bodies + bodies[:20])  # tempestade de reentregas
+
+    applied = []
+    with Connection(URL) as conn:
+        runtime = ConsumerRuntime(
+            conn, [queue], lambda body: (body["key"], body), applied.extend,
+            workers=2, batch_size=8, dedupe=SQLiteDedupeStore(),
+        )
+        runtime.run(max_messages=50)
+
+    assert sorted(item["seq"] for item in applied) == list(range(30))
+    assert runtime.stats()["duplicates"] == 20
+    assert runtime.stats()["acked"] == 50
+
+
+def test_failures_go_to_delay_queue_then_dead_letter():
+    exchange = Exchange("test-retry", type="direct")
+    queue = Queue("test-retry", exchange=exchange, routing_key="test-retry")
+    retry = RetryPolicy(queue, delays=(1,))
+    publish_raw(queue, [("m1", {"key": 1})])
+
+    def failing(items):
+        raise RuntimeError("banco fora do ar")
+
+    def consume_once():
+        with Connection(URL) as conn:
+            runtime = ConsumerRuntime(conn, [queue], lambda body: (body["key"], body), failing, retry=retry)
+            runtime.run(max_messages=1)
+        return runtime.stats()
+
+    assert consume_once()["retried"] == 1
+
+    with Connection(URL) as conn:
+        delayed = retry.retry_queues[0](conn.default_channel).get(no_ack=True)
+    assert delayed.headers[RETRY_HEADER] == 1
+    assert delayed.properties["message_id"] == "m1"
+
+    # o TTL da fila de atraso devolve à fila original (aqui, à mão)
+    with Connection(URL) as conn:
+        Producer(conn).publish(
+            delayed.body, exchange=exchange, routing_key="test-retry",
+            headers=delayed.headers, content_type=delayed.content_type,
+            content_encoding=delayed.content_encoding, message_id="m1",
+        )
+    assert consume_once()["dead_lettered"] == 1
+
+    with Connection(URL) as conn:
+        dead = retry.dead_letter_queue(conn.default_channel).get(no_ack=True)
+    assert dead.headers[RETRY_HEADER] == 2
+
+
+def test_runtime_exports_counters_latency_and_queue_depth():
+    exchange = Exchange("test-metrics", type="direct")
+    queue = Queue("test-metrics", exchange=exchange, routing_key="test-metrics")
+
+    with Connection(URL) as conn:
+        queue(conn.default_channel).declare()
+        producer = Producer(conn)
+        for n in range(30):
+            producer.publish({"key": n}, exchange=exchange, routing_key="test-metrics")
+
+    with Connection(URL) as conn:
+        runtime = ConsumerRuntime(
+            conn, [queue], lambda body: (body["key"], body), lambda items: None, workers=2, depth_interval=0.01,
+        )
+        runtime.run(max_messages=30)
+
+    text = metrics.render()
+    assert 'messaging_consumed_total{queue="test-metrics"} 30' in text
+    assert 'messaging_acked_total{queue="test-metrics"} 30' in text
+    assert 'messaging_handler_seconds_count{queue="test-metrics"}' in text
+    assert 'messaging_queue_depth{queue="test-metrics"}' in text
+
+
+def test_only_the_failing_key_is_retried():
+    exchange = Exchange("test-partial", type="direct")
+    queue = Queue("test-partial", exchange=exchange, routing_key="test-partial")
+    retry = RetryPolicy(queue, delays=(1,))
+    publish_raw(queue, [(f"m{n}", {"key": n % 2, "seq": n}) for n in range(10)])
+
+    applied = []
+
+    def handle_batch(items):
+        if any(item["key"] == 1 for item in items):
+            raise RuntimeError("client 1 quebrado")
+        applied.extend(items)
+
+    with Connection(URL) as conn:
+        runtime = ConsumerRuntime(
+            conn, [queue], lambda body: (body["key"], body), handle_batch,
+            workers=1, batch_size=10, retry=retry,
+        )
+        runtime.run(max_messages=10)
+
+    with Connection(URL) as conn:
+        delayed = retry.retry_queues[0](conn.default_channel)
+        retried = [delayed.get(no_ack=True) for _ in range(5)]
+
+    assert sorted(item["seq"] for item in applied) == [0, 2, 4, 6, 8]
+    assert runtime.stats()["retried"] == 5
+    assert [m.payload["seq"] for m in retried] == [1, 3, 5, 7, 9]
+    assert all(FIRST_SEEN_HEADER in m.headers for m in retried)
+
+
+def test_retried_message_older_than_applied_version_is_skipped():
+    exchange = Exchange("test-stale", type="direct")
+    queue = Queue("test-stale", exchange=exchange, routing_key="test-stale")
+    versions = SQLiteVersionStore()
+    versions.set_versions({"c1": 200})
+
+    with Connection(URL) as conn:
+        queue(conn.default_channel).declare()
+        producer = Producer(conn)
+        # voltou do atraso (visto em 100) depois de uma versão 200 aplicada
+        producer.publish({"key": "c1", "seq": "velha"}, exchange=exchange, routing_key="test-stale",
+                         headers={FIRST_SEEN_HEADER: 100})
+        producer.publish({"key": "c2", "seq": "nova"}, exchange=exchange, routing_key="test-stale")
+
+    applied = []
+    with Connection(URL) as conn:
+        runtime = ConsumerRuntime(
+            conn, [queue], lambda body: (body["key"], body), applied.extend, versions=versions,
+        )
+        runtime.run(max_messages=2)
+
+    assert [item["seq"] for item in applied] == ["nova"]
+    assert runtime.stats()["stale"] == 1
+    assert versions.get_versions(["c1"]) == {"c1": 200}
+    assert "c2" in versions.get_versions(["c2"])
+
+
+def test_producer_timestamp_orders_updates_across_replicas():
+    """
+    Réplica A aplica a atualização publicada às 12:00:10; a de 12:00:05,
+    que estava presa no prefetch da réplica B, chega depois e é descartada
+    (com o instante de chegada como versão, ela sobrescreveria a nova).
+    """
+    exchange = Exchange("test-replicas", type="direct")
+    queue = Queue("test-replicas", exchange=exchange, routing_key="test-replicas")
+    versions = SQLiteVersionStore()
+
+    def publish(seq, second):
+        with Connection(URL) as conn:
+            queue(conn.default_channel).declare()
+            Producer(conn).publish(
+                {"key": "c1", "seq": seq}, exchange=exchange, routing_key="test-replicas",
+                timestamp=datetime(2026, 1, 1, 12, 0, second, tzinfo=timezone.utc),
+            )
+
+    applied = []
+    for seq, second in (("nova", 10), ("velha", 5)):
+        publish(seq, second)
+        with Connection(URL) as conn:
+            replica = ConsumerRuntime(
+                conn, [queue], lambda body: (body["key"], body), applied.extend, versions=versions,
+            )
+            replica.run(max_messages=1)
+
+    assert [item["seq"] for item in applied] == ["nova"]
+    assert replica.stats()["stale"] == 1
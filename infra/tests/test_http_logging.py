@@ -0,0 +1,101 @@
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+import httpx
+
+from infra.http import http_client
+from infra.http.http_logging import (
+    REDACTED, HttpLogger, configure_async_logging, redact_headers, stop_async_logging,
+)
+
+
+def test_redacts_sensitive_headers():
+    headers = redact_headers({"Authorization": "Bearer segredo", "Content-Type": "application/json"})
+    assert headers == {"Authorization": REDACTED, "Content-Type": "application/json"}
+
+
+def test_info_logs_summary_without_body_and_errors_log_truncated_body(caplog):
+    http_logger = HttpLogger(sample_rate=1, body_limit=10)
+    ok = httpx.Response(200, json={"items": list(range(1000))})
+    failed = httpx.Response(500, text="x" * 100)
+
+    with caplog.at_level(logging.INFO, logger="infra.http"):
+        http_logger.request("GET", "http://api/items", {"Authorization": "Bearer segredo"})
+        http_logger.response("GET", "http://api/items", ok, 0.012)
+        http_logger.response("GET", "http://api/items", failed, 0.5)
+
+    ok_record, failed_record = caplog.records
+    assert ok_record.http["status"] == 200
+    assert ok_record.http["elapsed_ms"] == 12.0
+    assert "body" not in ok_record.http
+    assert failed_record.levelno == logging.WARNING
+    assert failed_record.http["body"].startswith("x" * 10 + "...")
+    assert "segredo" not in caplog.text
+
+
+def test_debug_request_log_is_redacted(caplog):
+    with caplog.at_level(logging.DEBUG, logger="infra.http"):
+        HttpLogger(sample_rate=1).request("POST", "http://api", {"Authorization": "Bearer segredo"}, data={"a": 1})
+
+    assert caplog.records[0].http["headers"] == {"Authorization": REDACTED}
+
+
+def test_async_sink_moves_handlers_to_listener():
+    log = logging.getLogger("infra.http.test-sink")
+    log.setLevel(logging.INFO)
+    records = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    collect = Collect()
+    log.addHandler(collect)
+    try:
+        configure_async_logging(log)
+        assert all(isinstance(handler, QueueHandler) for handler in log.handlers)
+
+        HttpLogger(log=log).response("GET", "http://api", httpx.Response(204), 0.001)
+    finally:
+        stop_async_logging(log)
+        log.removeHandler(collect)
+
+    assert records[0].http["status"] == 204
+
+
+def test_async_sink_formats_on_listener_thread():
+    log = logging.getLogger("infra.http.test-format")
+    log.setLevel(logging.INFO)
+    threads = []
+
+    class ThreadFormatter(logging.Formatter):
+        def format(self, record):
+            threads.append(threading.current_thread())
+            return super().format(record)
+
+    class Format(logging.Handler):
+        def emit(self, record):
+            self.format(record)
+
+    handler = Format()
+    handler.setFormatter(ThreadFormatter())
+    log.addHandler(handler)
+    try:
+        configure_async_logging(log)
+        HttpLogger(log=log).response("GET", "http://api", httpx.Response(204), 0.001)
+    finally:
+        stop_async_logging(log)
+        log.removeHandler(handler)
+
+    assert threads and threading.main_thread() not in threads
+
+
+def test_http_client_enables_async_sink(monkeypatch):
+    calls = []
+    monkeypatch.setattr(http_client, "configure_async_logging", lambda: calls.append(True))
+
+    http_client.HttpClient()
+    http_client.HttpClient(http_logger=HttpLogger())
+
+    assert calls == [True]
@@ -0,0 +1,51 @@
+from kombu import Consumer, Queue
+
+from infra.messaging import subscribe
+from infra.messaging.consumer import client_consumer
+from infra.messaging.consumer.dedupe import SQLiteDedupeStore, SQLiteVersionStore
+from infra.messaging.testing import MemoryBroker, SQLiteClientStore
+
+
+def test_client_updates_flow_end_to_end_into_the_store():
+    store = SQLiteClientStore()
+    store.create(["c1", "c2", "c3"])
+    updates = [(f"c{n % 3 + 1}", f"pub-{n}", f"priv-{n}") for n in range(300)]
+
+    with MemoryBroker() as broker:
+        published = broker.publish_client_updates(updates)
+        # assinatura de outro emissor: vai para a DLQ
+        broker.publish_client_updates([("c1", "x", "y")], token=MemoryBroker().sign())
+
+        with broker.connection() as conn:
+            runtime = client_consumer.build_runtime(
+                conn, handle_batch=store.apply_client_keys, dedupe=SQLiteDedupeStore(),
+                versions=SQLiteVersionStore(), workers=2,
+            )
+            runtime.run(max_messages=published + 1)
+
+        dlq_depth = broker.depth(runtime.retry.dead_letter_queue)
+
+    assert store.keys() == {
+        "c1": ("pub-297", "priv-297"),
+        "c2": ("pub-298", "priv-298"),
+        "c3": ("pub-299", "priv-299"),
+    }
+    assert runtime.stats()["dead_lettered"] == 1
+    assert dlq_depth == 1
+
+
+def test_publisher_uses_memory_broker():
+    queue = Queue("test.harness", exchange=subscribe.EXCHANGE, routing_key="test.harness")
+    received = []
+
+    with MemoryBroker() as broker:
+        with broker.connection() as conn:
+            queue(conn.default_channel).declare()
+
+        assert subscribe.send_rabbitmq_message({"n": 1}, "test.harness")
+
+        with broker.connection() as conn:
+            with Consumer(conn, [queue], callbacks=[lambda body, msg: (received.append(body), msg.ack())]):
+                conn.drain_events(timeout=1)
+
+    assert received[0]["payload"] == {"n": 1}
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from kombu import Connection, Consumer, Queue
+
+from infra.commun.jwt_access_token import JwtAccessToken, REFRESH_MARGIN, TOKEN_TTL
+from infra.messaging import subscribe
+
+URL = "memory://"
+
+
+@pytest.fixture
+def fake_signing():
+    JwtAccessToken.clear_cache()
+    with patch.object(JwtAccessToken, "generate_jwt", side_effect=lambda now=None: f"token-{now}") as sign:
+        yield sign
+    JwtAccessToken.clear_cache()
+
+
+def test_cached_token_is_reused_until_close_to_exp(fake_signing):
+    first = JwtAccessToken.cached()
+    assert JwtAccessToken.cached() == first
+    assert fake_signing.call_count == 1
+
+    later = datetime.now(timezone.utc) + TOKEN_TTL - REFRESH_MARGIN
+    with patch("infra.commun.jwt_access_token.datetime") as fake_datetime:
+        fake_datetime.now.return_value = later
+        assert JwtAccessToken.cached() != first
+    assert fake_signing.call_count == 2
+
+
+def test_publish_batch_uses_one_token_and_pooled_connection(fake_signing):
+    received = []
+    queue = Queue("test.batch", exchange=subscribe.EXCHANGE, routing_key="test.batch")
+    with Connection(URL) as conn:
+        # amq.* já existe no RabbitMQ (o kombu não declara); no memory:// não
+        conn.default_channel.exchange_declare("amq.direct", type="direct")
+        queue(conn.default_channel).declare()
+
+    published = subscribe.publish_batch(
+        [({"n": n}, "test.batch") for n in range(3)], url=URL
+    )
+    assert subscribe.send_rabbitmq_message({"n": 3}, "test.batch", url=URL)
+
+    with Connection(URL) as conn:
+        with Consumer(conn, [queue], callbacks=[lambda body, msg: (received.append(body), msg.ack())]):
+            for _ in range(4):
+                conn.drain_events(timeout=1)
+
+    assert published == 3
+    assert [m["payload"]["n"] for m in received] == [0, 1, 2, 3]
+    assert len({m["jwt"] for m in received}) == 1
+    assert fake_signing.call_count == 1
+    assert subscribe.get_connection(URL) is subscribe.get_connection(URL)
@@ -0,0 +1,78 @@
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from infra.messaging.consumer import verify_signature as vs
+
+AUD = "ex-test"
+ISS = "issuer-1"
+
+
+def keypair():
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private, public_pem
+
+
+def token(private, kid=None, exp_minutes=60):
+    now = datetime.now(timezone.utc)
+    payload = {"iss": ISS, "aud": AUD, "iat": now, "exp": now + timedelta(minutes=exp_minutes)}
+    return jwt.encode(payload, private, algorithm="RS256", headers={"kid": kid} if kid else None)
+
+
+@pytest.fixture
+def env(monkeypatch):
+    monkeypatch.setenv("TEST_ISS", ISS)
+
+    def set_keys(value):
+        monkeypatch.setenv("TEST_PUBLIC_KEY", value)
+
+    return set_keys
+
+
+def test_repeated_token_is_verified_once(env):
+    private, public_pem = keypair()
+    env(public_pem)
+    verifier = vs.SignatureVerifier("TEST_PUBLIC_KEY", AUD, "TEST_ISS")
+    tok = token(private)
+
+    with patch.object(vs.jwt, "decode", wraps=jwt.decode) as decode:
+        assert verifier.verify(tok)["iss"] == ISS
+        assert verifier.verify(tok)["iss"] == ISS
+
+    assert decode.call_count == 1
+    assert verifier.stats == {"hits": 1, "misses": 1, "invalid": 0}
+
+
+def test_keys_selected_by_kid(env):
+    old_private, old_pem = keypair()
+    new_private, new_pem = keypair()
+    env(json.dumps({"old": old_pem, "new": new_pem}))
+    verifier = vs.SignatureVerifier("TEST_PUBLIC_KEY", AUD, "TEST_ISS")
+
+    assert verifier.verify(token(old_private, kid="old"))
+    assert verifier.verify(token(new_private, kid="new"))
+    assert verifier.verify(token(old_private))  # sem kid: primeira chave
+    assert verifier.verify(token(new_private, kid="old")) is None
+    assert verifier.verify(token(new_private, kid="unknown")) is None
+
+
+def test_expired_cache_entry_is_verified_again(env):
+    private, public_pem = keypair()
+    env(public_pem)
+    verifier = vs.SignatureVerifier("TEST_PUBLIC_KEY", AUD, "TEST_ISS")
+    tok = token(private)
+
+    claims = verifier.verify(tok)
+    with patch.object(vs.time, "time", return_value=claims["exp"] + 1), \
+            patch.object(vs.jwt, "decode", wraps=jwt.decode) as decode:
+        verifier.verify(tok)
+
+    assert decode.call_count == 1  # entrada vencida não é servida do cache
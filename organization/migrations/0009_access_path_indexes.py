@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:50
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('organization', '0008_schedulingconfig'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='member',
+            index=models.Index(fields=['user', 'enterprise'], name='member_user_enterprise_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='member',
+            index=models.Index(fields=['enterprise', 'role'], name='member_enterprise_role_idx'),
+        ),
+    ]
@@ -144,6 +144,12 @@ class Member(models.Model):
                 name="unique_member_per_enterprise_cpf"
             ),
         ]
+        indexes = [
+            # Empresas do usuário (perfil / WorkerAdmin)
+            models.Index(fields=["user", "enterprise"], name="member_user_enterprise_idx"),
+            # Busca do owner / membros por papel
+            models.Index(fields=["enterprise", "role"], name="member_enterprise_role_idx"),
+        ]
 
     @property
     def id_enterprise(self):
@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from organization.models import Enterprise, SchedulingConfig
+from organization.tenant_cache import enterprise_name_cache, member_enterprises_cache
 from .models import Member
 
 
@@ -42,3 +44,25 @@ def create_scheduling_config(sender, instance, created, **kwargs):
     SchedulingConfig.objects.create(
         enterprise=instance
     )
+
+
+# =====================================
+# 🔥 Caches de tenant (invalidação entre processos)
+# =====================================
+@receiver(post_init, sender=Member)
+def remember_loaded_user(sender, instance, **kwargs):
+    instance._loaded_user_id = instance.__dict__.get("user_id")
+
+
+@receiver([post_save, post_delete], sender=Enterprise)
+def invalidate_enterprise_cache(sender, instance, **kwargs):
+    enterprise_id = instance.id
+    transaction.on_commit(lambda: enterprise_name_cache.invalidate(enterprise_id))
+
+
+@receiver([post_save, post_delete], sender=Member)
+def invalidate_member_cache(sender, instance, **kwargs):
+    user_ids = {u for u in (instance._loaded_user_id, instance.user_id) if u is not None}
+    instance._loaded_user_id = instance.user_id
+    if user_ids:
+        transaction.on_commit(lambda: member_enterprises_cache.invalidate(*user_ids))
@@ -0,0 +1,36 @@
+"""
+Dados de tenant lidos em toda requisição do painel (cabeçalho do admin,
+lista de empresas do usuário), servidos pelo TwoLevelCache e invalidados
+pelos sinais em organization/signals.py.
+"""
+from core.utils.two_level_cache import TwoLevelCache
+from organization.models import Enterprise, Member
+
+enterprise_name_cache = TwoLevelCache("enterprise_name", maxsize=4096)
+member_enterprises_cache = TwoLevelCache("member_enterprises", maxsize=4096)
+
+
+class TenantCacheService:
+
+    @staticmethod
+    def enterprise_name(enterprise_id):
+        """
+        Nome da empresa ou None se não existir.
+        """
+        return enterprise_name_cache.get(
+            enterprise_id,
+            lambda: Enterprise.objects.filter(id=enterprise_id).values_list("name", flat=True).first(),
+        )
+
+    @staticmethod
+    def member_enterprise_ids(user_id):
+        """
+        Ids (str) das empresas em que o usuário é membro.
+        """
+        return member_enterprises_cache.get(
+            user_id,
+            lambda: sorted({
+                str(enterprise_id)
+                for enterprise_id in Member.objects.filter(user_id=user_id).values_list("enterprise_id", flat=True)
+            }),
+        )
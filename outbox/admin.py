@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from .models import OutboxEvent
+
+
+# ============================================================
+# OUTBOX (somente leitura)
+# ============================================================
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "event_type", "aggregate_type", "aggregate_id", "created_at", "published_at", "attempts")
+    list_filter = ("event_type", "aggregate_type")
+    search_fields = ("aggregate_id",)
+    ordering = ("-id",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_module_permission(self, request):
+        return request.user.is_superuser
+
+    def has_view_permission(self, request, obj=None):
+        return request.user.is_superuser
@@ -0,0 +1,84 @@
+import signal
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from outbox.services import OutboxService
+
+PURGE_EVERY_SECONDS = 60 * 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Publica no RabbitMQ os eventos pendentes do outbox, em lotes "
+        "(SELECT ... FOR UPDATE SKIP LOCKED). Vários relays podem rodar em "
+        "paralelo; eventos do mesmo agregado saem em ordem."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Eventos por lote/transação (padrão: 100).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Espera em segundos quando não há eventos pendentes (padrão: 1).",
+        )
+        parser.add_argument(
+            "--purge-after-days",
+            type=int,
+            default=7,
+            help="Remove eventos publicados há mais de N dias (padrão: 7; 0 desativa).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Esvazia a fila uma vez e sai.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0 or options["poll_interval"] < 0:
+            raise CommandError("--batch-size e --poll-interval devem ser positivos.")
+
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        next_purge = 0.0
+
+        while not self._stopping:
+            if options["purge_after_days"] and time.monotonic() >= next_purge:
+                purged = OutboxService.purge_published(
+                    timezone.now() - timedelta(days=options["purge_after_days"])
+                )
+                if purged:
+                    self.stdout.write(f"{purged} eventos publicados removidos.")
+                next_purge = time.monotonic() + PURGE_EVERY_SECONDS
+
+            started = time.monotonic()
+            published, failed = OutboxService.relay_batch(batch_size=options["batch_size"])
+
+            if published or failed:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"{published} publicados, {failed} com falha ({elapsed * 1000:.0f} ms)")
+
+            # lote cheio: há mais pendentes, segue sem esperar
+            if published == options["batch_size"]:
+                continue
+            if options["once"]:
+                break
+
+            close_old_connections()
+            time.sleep(options["poll_interval"])
+
+        self.stdout.write(self.style.SUCCESS("Relay do outbox encerrado."))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
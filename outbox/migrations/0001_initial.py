@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:12
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=100, verbose_name='Evento')),
+                ('aggregate_type', models.CharField(max_length=50, verbose_name='Agregado')),
+                ('aggregate_id', models.CharField(max_length=64, verbose_name='ID do agregado')),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('published_at', models.DateTimeField(blank=True, null=True, verbose_name='Publicado em')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Último erro')),
+            ],
+            options={
+                'verbose_name': 'Evento (outbox)',
+                'verbose_name_plural': 'Eventos (outbox)',
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('published_at__isnull', True)), fields=['id'], name='outbox_pending_idx'), models.Index(fields=['published_at'], name='outbox_published_at_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('outbox', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='outboxevent',
+            index=models.Index(condition=models.Q(('published_at__isnull', True)), fields=['aggregate_type', 'aggregate_id', 'id'], name='outbox_pending_aggregate_idx'),
+        ),
+    ]
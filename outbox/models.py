@@ -0,0 +1,43 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    Evento de domínio gravado na mesma transação da mudança que o gerou.
+    O relay (manage.py relay_outbox) publica no RabbitMQ e marca
+    published_at; eventos do mesmo agregado saem na ordem de id.
+    """
+
+    event_type = models.CharField(max_length=100, verbose_name="Evento")
+    aggregate_type = models.CharField(max_length=50, verbose_name="Agregado")
+    aggregate_id = models.CharField(max_length=64, verbose_name="ID do agregado")
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    published_at = models.DateTimeField(null=True, blank=True, verbose_name="Publicado em")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    last_error = models.TextField(blank=True, default="", verbose_name="Último erro")
+
+    class Meta:
+        verbose_name = "Evento (outbox)"
+        verbose_name_plural = "Eventos (outbox)"
+        ordering = ["id"]
+        indexes = [
+            # fila do relay: só os pendentes, em ordem de id
+            models.Index(
+                fields=["id"],
+                name="outbox_pending_idx",
+                condition=models.Q(published_at__isnull=True),
+            ),
+            # relay: há evento anterior pendente do mesmo agregado?
+            models.Index(
+                fields=["aggregate_type", "aggregate_id", "id"],
+                name="outbox_pending_aggregate_idx",
+                condition=models.Q(published_at__isnull=True),
+            ),
+            models.Index(fields=["published_at"], name="outbox_published_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.aggregate_type}:{self.aggregate_id}"
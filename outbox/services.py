@@ -0,0 +1,134 @@
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from outbox.models import OutboxEvent
+
+# Namespace dos advisory locks por agregado (pg_try_advisory_xact_lock(ns, hash))
+AGGREGATE_LOCK_NAMESPACE = 4243
+
+# Os candidatos (pendentes mais antigos, LIMIT n, SKIP LOCKED) saem de uma
+# CTE materializada: o advisory lock do agregado só é tentado nesse
+# conjunto limitado (no WHERE da consulta com LIMIT o Postgres pode avaliar
+# a função em linhas além do lote). Um evento só sai se nenhum anterior do
+# mesmo agregado estiver pendente fora do lote (travado por outro relay que
+# ainda não publicou), então a ordem por agregado se mantém com vários
+# relays em paralelo.
+_CLAIM_SQL = """
+    WITH candidates AS MATERIALIZED (
+        SELECT id, aggregate_type, aggregate_id
+        FROM outbox_outboxevent
+        WHERE published_at IS NULL
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    SELECT c.id
+    FROM candidates c
+    WHERE NOT EXISTS (
+            SELECT 1
+            FROM outbox_outboxevent e
+            WHERE e.published_at IS NULL
+              AND e.aggregate_type = c.aggregate_type
+              AND e.aggregate_id = c.aggregate_id
+              AND e.id < c.id
+              AND e.id NOT IN (SELECT id FROM candidates)
+        )
+      AND pg_try_advisory_xact_lock(%s, hashtext(c.aggregate_type || ':' || c.aggregate_id))
+    ORDER BY c.id
+"""
+
+
+class OutboxService:
+
+    # ---------------------------------------------------------
+    # Gravação (chamar dentro da transação da mudança)
+    # ---------------------------------------------------------
+    @staticmethod
+    def event(event_type, aggregate_type, aggregate_id, payload):
+        return OutboxEvent(
+            event_type=event_type,
+            aggregate_type=aggregate_type,
+            aggregate_id=str(aggregate_id),
+            payload=payload,
+        )
+
+    @staticmethod
+    def record(event_type, aggregate_type, aggregate_id, payload):
+        event = OutboxService.event(event_type, aggregate_type, aggregate_id, payload)
+        event.save()
+        return event
+
+    @staticmethod
+    def record_many(events):
+        """
+        events: OutboxEvent não salvos (OutboxService.event); um INSERT.
+        """
+        return OutboxEvent.objects.bulk_create(events)
+
+    # ---------------------------------------------------------
+    # Relay
+    # ---------------------------------------------------------
+    @staticmethod
+    def message(event):
+        # event_id permite ao consumidor descartar entregas repetidas
+        return {
+            "event_id": event.id,
+            "event_type": event.event_type,
+            "aggregate_type": event.aggregate_type,
+            "aggregate_id": event.aggregate_id,
+            "occurred_at": event.created_at.isoformat(),
+            "data": event.payload,
+        }
+
+    @staticmethod
+    def relay_batch(batch_size=100, url=None):
+        """
+        Trava até `batch_size` eventos, publica em um lote e marca os
+        publicados, tudo na mesma transação. Retorna (publicados, falhas).
+        """
+        # import tardio: kombu / JWT só no processo do relay
+        from infra.messaging.subscribe import SHORT_RETRY_POLICY, publish_batch
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(_CLAIM_SQL, [batch_size, AGGREGATE_LOCK_NAMESPACE])
+                ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return 0, 0
+
+            events = list(OutboxEvent.objects.filter(id__in=ids).order_by("id"))
+            published = publish_batch(
+                (
+                    (OutboxService.message(event), event.event_type, f"outbox:{event.id}")
+                    for event in events
+                ),
+                url=url,
+                # os locks das linhas e dos agregados ficam presos durante a publicação
+                retry_policy=SHORT_RETRY_POLICY,
+            )
+
+            now = timezone.now()
+            OutboxEvent.objects.filter(id__in=[e.id for e in events[:published]]).update(
+                published_at=now, attempts=F("attempts") + 1
+            )
+
+            failed = events[published:]
+            if failed:
+                # o resto fica pendente e volta no próximo lote, na mesma ordem
+                OutboxEvent.objects.filter(id__in=[e.id for e in failed]).update(
+                    attempts=F("attempts") + 1,
+                    last_error="Falha ao publicar no RabbitMQ",
+                )
+
+        return published, len(failed)
+
+    @staticmethod
+    def purge_published(before):
+        """
+        Remove eventos publicados antes de `before`. Retorna quantos.
+        """
+        deleted, _ = OutboxEvent.objects.filter(
+            published_at__isnull=False, published_at__lt=before
+        ).delete()
+        return deleted
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+
+from infra.messaging.subscribe import SHORT_RETRY_POLICY
+from outbox.models import OutboxEvent
+from outbox.services import OutboxService
+
+
+def record(aggregate_id, n):
+    return OutboxService.record("test.event", "test", aggregate_id, {"n": n})
+
+
+@pytest.mark.django_db
+def test_relay_publishes_in_id_order_and_marks_published():
+    events = [record("a", 1), record("b", 1), record("a", 2)]
+    sent = []
+
+    def fake_publish(messages, url=None, retry_policy=None):
+        sent.extend(messages)
+        return len(sent)
+
+    with patch("infra.messaging.subscribe.publish_batch", side_effect=fake_publish):
+        assert OutboxService.relay_batch(batch_size=10) == (3, 0)
+
+    assert [message["event_id"] for message, _, _ in sent] == [e.id for e in events]
+    assert all(routing_key == "test.event" for _, routing_key, _ in sent)
+    assert [message_id for _, _, message_id in sent] == [f"outbox:{e.id}" for e in events]
+    assert not OutboxEvent.objects.filter(published_at__isnull=True).exists()
+
+
+@pytest.mark.django_db
+def test_failed_tail_stays_pending_for_next_batch():
+    first, second = record("a", 1), record("a", 2)
+
+    with patch("infra.messaging.subscribe.publish_batch", return_value=1):
+        assert OutboxService.relay_batch(batch_size=10) == (1, 1)
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.published_at is not None
+    assert second.published_at is None
+    assert second.attempts == 1
+
+
+@pytest.mark.django_db
+def test_relay_publishes_with_short_retry_policy():
+    record("a", 1)
+
+    with patch("infra.messaging.subscribe.publish_batch", return_value=1) as publish:
+        OutboxService.relay_batch(batch_size=10)
+
+    assert publish.call_args.kwargs["retry_policy"] == SHORT_RETRY_POLICY
+
+
+@pytest.mark.django_db(transaction=True)
+def test_event_waits_while_an_earlier_one_of_the_aggregate_is_locked_elsewhere():
+    """
+    Outro relay travou a1 e ainda não publicou: a2 (mesmo agregado) não sai
+    neste lote; b1 sai normalmente.
+    """
+    a1, a2, b1 = record("a", 1), record("a", 2), record("b", 1)
+    sent = []
+
+    def fake_publish(messages, url=None, retry_policy=None):
+        sent.extend(message["event_id"] for message, _, _ in messages)
+        return len(sent)
+
+    other = connection.copy()
+    try:
+        with other.cursor() as cursor:
+            other.set_autocommit(False)
+            cursor.execute("SELECT id FROM outbox_outboxevent WHERE id = %s FOR UPDATE", [a1.id])
+
+            with patch("infra.messaging.subscribe.publish_batch", side_effect=fake_publish):
+                assert OutboxService.relay_batch(batch_size=10) == (1, 0)
+        other.rollback()
+    finally:
+        other.close()
+
+    assert sent == [b1.id]
+    assert OutboxEvent.objects.filter(published_at__isnull=True).count() == 2
@@ -1,13 +1,14 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from organization.models import Enterprise
+from organization.tenant_cache import TenantCacheService
 
 @login_required
 def perfil(request):
     # Buscar todas empresas onde o usuário é membro
     enterprises = Enterprise.objects.filter(
-        members__user=request.user
-    ).distinct()
+        id__in=TenantCacheService.member_enterprise_ids(request.user.id)
+    )
 
     context = {
         "enterprises": enterprises,
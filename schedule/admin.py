@@ -1,14 +1,22 @@
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import JsonResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
 from django import forms
 import traceback
 
+from schedule.domain.services.availability_cache import AvailabilityCacheService
 from schedule.domain.services.available_time_service import AvailableTimeService
 from schedule.domain.services.scheduling_service import SchedulingService
 from schedule.forms import AppointmentForm, SchedulingAdminForm, WorkerAvailabilityForm
-from .models import Appointment, Worker, WorkerAvailability, Scheduling
+from schedule.widgets import EnterpriseAutocompleteSelect
+from core.changelist import KeysetPaginationAdminMixin
+from .models import Appointment, Worker, WorkerAvailability, Scheduling, SchedulingArchive, WaitlistEntry
 from organization.models import Enterprise, Member
 from clientes.models import Client
+from clientes.search import build_client_search_q
 
 
 # ============================================================
@@ -347,8 +355,9 @@ class WorkerAvailabilityAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
 # SCHEDULING ADMIN
 # ============================================================
 @admin.register(Scheduling)
-class SchedulingAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
+class SchedulingAdmin(KeysetPaginationAdminMixin, EnterpriseFilteredAdminMixin, admin.ModelAdmin):
     form = SchedulingAdminForm
+    keyset_ordering = ("date", "start_time", "id")
 
     list_display = (
         "date",
@@ -357,19 +366,228 @@ class SchedulingAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
         "duration",
         "worker",
         "client",
+        "status",
     )
 
     ordering = ("date", "start_time")
-    list_filter = ("date",)
+    list_filter = ("date", "status")
     search_fields = ("worker__user__username", "client__name")
     filter_horizontal = ("appointments",)
+    actions = ("mark_cancelled", "mark_no_show", "mark_done")
 
     class Media:
         js = (
             "/static/js/scheduling-filter-by-worker.js",
-            "/static/js/scheduling-edit-selected-appointments.js",
         )
 
+    # ------------------------------------------------------------
+    # Busca por cliente (índices trigram) ou profissional
+    # ------------------------------------------------------------
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+
+        clients = Client.objects.filter(build_client_search_q(search_term))
+        workers = Worker.objects.filter(user__username__icontains=search_term.strip())
+
+        if not request.user.is_superuser:
+            enterprise_id = request.session.get("enterprise_id")
+            clients = clients.filter(enterprise_id=enterprise_id)
+            workers = workers.filter(enterprise_id=enterprise_id)
+
+        queryset = queryset.filter(
+            Q(client_id__in=clients.values("id"))
+            | Q(worker_id__in=workers.values("id"))
+        )
+        return queryset, False
+
+    # ------------------------------------------------------------
+    # Status em lote (um UPDATE; agendamentos não são apagados)
+    # ------------------------------------------------------------
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def _change_status(self, request, queryset, status):
+        updated = SchedulingService.change_status(queryset, status)
+        label = dict(Scheduling.STATUS_CHOICES)[status]
+        self.message_user(request, f"{updated} agendamento(s) marcado(s) como {label.lower()}.")
+
+    @admin.action(description="Cancelar agendamentos selecionados")
+    def mark_cancelled(self, request, queryset):
+        self._change_status(request, queryset, Scheduling.STATUS_CANCELLED)
+
+    @admin.action(description="Marcar como não compareceu")
+    def mark_no_show(self, request, queryset):
+        self._change_status(request, queryset, Scheduling.STATUS_NO_SHOW)
+
+    @admin.action(description="Marcar como concluído")
+    def mark_done(self, request, queryset):
+        self._change_status(request, queryset, Scheduling.STATUS_DONE)
+
+    # ------------------------------------------------------------
+    # Autocomplete paginado (cliente / profissional / atendimentos)
+    # ------------------------------------------------------------
+    AUTOCOMPLETE_PAGE_SIZE = 20
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "autocomplete/<str:target>/",
+                self.admin_site.admin_view(self.autocomplete_view),
+                name="schedule_scheduling_autocomplete",
+            ),
+            path(
+                "worker-appointments/",
+                self.admin_site.admin_view(self.worker_appointments_view),
+                name="schedule_scheduling_worker_appointments",
+            ),
+            path(
+                "slots/",
+                self.admin_site.admin_view(self.slots_view),
+                name="schedule_scheduling_slots",
+            ),
+        ]
+        return custom_urls + urls
+
+    def _autocomplete_enterprise_id(self, request):
+        if request.user.is_superuser:
+            return request.GET.get("enterprise") or request.session.get("enterprise_id")
+        return request.session.get("enterprise_id")
+
+    def _autocomplete_clients(self, request, term):
+        qs = Client.objects.only("id", "name", "cpf")
+        if term:
+            qs = qs.filter(build_client_search_q(term))
+        return qs.order_by("name", "id"), lambda c: f"{c.name} ({c.cpf})" if c.cpf else c.name
+
+    def _autocomplete_workers(self, request, term):
+        # istartswith vira UPPER(col) LIKE 'X%': atendido pelos índices
+        # UPPER(...) text_pattern_ops de auth_user (schedule 0013)
+        qs = Worker.objects.select_related("user").filter(is_active=True)
+        if term:
+            qs = qs.filter(
+                Q(user__first_name__istartswith=term)
+                | Q(user__last_name__istartswith=term)
+                | Q(user__username__istartswith=term)
+            )
+        return qs.order_by("user__first_name", "id"), str
+
+    def _autocomplete_appointments(self, request, term):
+        qs = Appointment.objects.only("id", "name").filter(is_active=True)
+        worker_id = request.GET.get("worker")
+        if worker_id:
+            qs = qs.filter(workers__id=worker_id)
+        if term:
+            qs = qs.filter(name__istartswith=term)
+        return qs.order_by("name", "id"), str
+
+    def autocomplete_view(self, request, target):
+        """
+        Endpoint no formato do select2: {"results": [...], "pagination": {"more": bool}}.
+        Sem COUNT(*): busca uma linha a mais para saber se há próxima página.
+        """
+        builders = {
+            "client": self._autocomplete_clients,
+            "worker": self._autocomplete_workers,
+            "appointment": self._autocomplete_appointments,
+        }
+        if target not in builders:
+            return JsonResponse({"error": "Autocomplete inválido."}, status=404)
+
+        term = request.GET.get("term", "").strip()
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+
+        qs, label = builders[target](request, term)
+
+        enterprise_id = self._autocomplete_enterprise_id(request)
+        if enterprise_id:
+            qs = qs.filter(enterprise_id=enterprise_id)
+        elif not request.user.is_superuser:
+            qs = qs.none()
+
+        size = self.AUTOCOMPLETE_PAGE_SIZE
+        offset = (page - 1) * size
+        rows = list(qs[offset:offset + size + 1])
+
+        return JsonResponse({
+            "results": [{"id": str(obj.pk), "text": label(obj)} for obj in rows[:size]],
+            "pagination": {"more": len(rows) > size},
+        })
+
+    # ------------------------------------------------------------
+    # Opções do form em JSON (preenchidas no navegador, sem recarregar)
+    # ------------------------------------------------------------
+    def _request_worker(self, request):
+        worker_id = request.GET.get("worker")
+        if not worker_id:
+            return None
+
+        workers = Worker.objects.only("id", "enterprise_id")
+        if not request.user.is_superuser:
+            workers = workers.filter(enterprise_id=request.session.get("enterprise_id"))
+        try:
+            return workers.get(pk=worker_id)
+        except (Worker.DoesNotExist, ValueError, ValidationError):
+            return None
+
+    def worker_appointments_view(self, request):
+        worker = self._request_worker(request)
+        if worker is None:
+            return JsonResponse({"results": []})
+
+        rows = (
+            Appointment.objects.filter(workers__id=worker.pk, is_active=True)
+            .only("id", "name")
+            .order_by("name", "id")
+            .distinct()
+        )
+        return JsonResponse({
+            "results": [{"id": str(a.pk), "text": str(a)} for a in rows],
+        })
+
+    def slots_view(self, request):
+        """
+        Horários livres de profissional/data/atendimentos a partir do cache
+        de disponibilidade. A escolha é conferida de novo no clean do form.
+        """
+        worker = self._request_worker(request)
+        date_obj = AvailableTimeService.parse_date(request.GET.get("date", ""))
+        appointments = [a for a in request.GET.get("appointments", "").split(",") if a]
+
+        if worker is None or date_obj is None or not appointments:
+            return JsonResponse({"results": []})
+
+        slots = AvailabilityCacheService.time_ranges(
+            worker.pk, date_obj, appointments, worker.enterprise_id
+        )
+        return JsonResponse({
+            "results": [
+                {
+                    "id": slot["horario_inicio"],
+                    "text": f"das {slot['horario_inicio']} às {slot['horario_fim']}",
+                }
+                for slot in slots.values()
+            ],
+        })
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in ("client", "worker"):
+            kwargs["widget"] = EnterpriseAutocompleteSelect(
+                db_field,
+                self.admin_site,
+                url=reverse(
+                    f"{self.admin_site.name}:schedule_scheduling_autocomplete",
+                    kwargs={"target": db_field.name},
+                ),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
     # ------------------------------------------------------------
     # Filtrar FK conforme enterprise
     # ------------------------------------------------------------
@@ -391,23 +609,6 @@ class SchedulingAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
 
         return form
 
-    # ------------------------------------------------------------
-    # Filtrar tipos de atendimento pela agenda (worker)
-    # ------------------------------------------------------------
-    def formfield_for_manytomany(self, db_field, request, **kwargs):
-
-        if db_field.name == "appointments":
-            worker_id = request.GET.get("worker")
-
-            if worker_id:
-                kwargs["queryset"] = Appointment.objects.filter(
-                    workers__id=worker_id
-                ).distinct()
-            else:
-                kwargs["queryset"] = Appointment.objects.none()
-
-        return super().formfield_for_manytomany(db_field, request, **kwargs)
-
     # ------------------------------------------------------------
     # Campos exibidos (inclui schedule_option)
     # ------------------------------------------------------------
@@ -421,11 +622,23 @@ class SchedulingAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
             "notes",
         ]
 
+        if obj is not None:
+            fields.append("status")
+
         if request.user.is_superuser:
             fields.insert(0, "enterprise")
 
         return fields
 
+    # ------------------------------------------------------------
+    # Status só muda pelas ações (SchedulingService.change_status grava o
+    # evento no outbox e avisa a lista de espera; o form não faria isso)
+    # ------------------------------------------------------------
+    def get_readonly_fields(self, request, obj=None):
+        if obj is not None:
+            return ("status",)
+        return ()
+
     # ------------------------------------------------------------
     # Fieldsets visuais
     # ------------------------------------------------------------
@@ -470,3 +683,82 @@ class SchedulingAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
         scheduling = form.instance
         scheduling.update_duration_and_end_time()
         scheduling.save(update_fields=["duration", "end_time"])
+
+
+# ============================================================
+# LISTA DE ESPERA
+# ============================================================
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(EnterpriseFilteredAdminMixin, admin.ModelAdmin):
+
+    list_display = (
+        "client",
+        "worker",
+        "date_start",
+        "date_end",
+        "preferred_start",
+        "preferred_end",
+        "is_active",
+        "notified_at",
+    )
+    list_select_related = ("client", "worker__user")
+    list_filter = ("is_active", "date_start")
+    search_fields = ("client__name",)
+    readonly_fields = ("notified_at",)
+    filter_horizontal = ("appointments",)
+    ordering = ("date_start",)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in ("client", "worker") and not request.user.is_superuser:
+            enterprise_id = request.session.get("enterprise_id")
+            model = Client if db_field.name == "client" else Worker
+            kwargs["queryset"] = model.objects.filter(enterprise_id=enterprise_id)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if db_field.name == "appointments" and not request.user.is_superuser:
+            kwargs["queryset"] = Appointment.objects.filter(
+                enterprise_id=request.session.get("enterprise_id")
+            )
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
+
+# ============================================================
+# AGENDAMENTOS ARQUIVADOS (somente leitura)
+# ============================================================
+@admin.register(SchedulingArchive)
+class SchedulingArchiveAdmin(KeysetPaginationAdminMixin, EnterpriseFilteredAdminMixin, admin.ModelAdmin):
+    keyset_ordering = ("date", "start_time", "id")
+
+    list_display = (
+        "date",
+        "start_time",
+        "end_time",
+        "duration",
+        "get_worker",
+        "get_client",
+        "status",
+        "archived_at",
+    )
+    list_select_related = ("enterprise", "worker__user", "client")
+    ordering = ("date", "start_time")
+    list_filter = ("date", "status")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    # Referências sem constraint: via select_related (LEFT JOIN) um registro
+    # original já removido chega como None
+    def get_worker(self, obj):
+        return str(obj.worker) if obj.worker else "-"
+    get_worker.short_description = "Profissional"
+
+    def get_client(self, obj):
+        return str(obj.client) if obj.client else "-"
+    get_client.short_description = "Cliente"
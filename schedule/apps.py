@@ -5,3 +5,6 @@ class ScheduleConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'schedule'
     verbose_name = 'Agenda'
+
+    def ready(self):
+        import schedule.signals
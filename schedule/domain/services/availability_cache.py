@@ -0,0 +1,482 @@
+"""
+Cache das janelas livres por profissional/dia (sem depender da duração
+pedida: os horários finais saem de build_final_response na leitura).
+
+Cada entrada guarda a versão com que foi calculada. A versão combina três
+marcas no cache, trocadas quando algo muda:
+
+- empresa       → SchedulingConfig (tolerância);
+- profissional  → WorkerAvailability (grade semanal);
+- profissional/dia → agendamentos daquele dia.
+
+Uma entrada só é usada se a versão bate com a atual; o modo incremental do
+comando `precompute_availability` recalcula apenas as que não batem.
+
+Cada marca é "<ms da troca em base36>-<aleatório>", nunca repetida, com TTL
+(VERSION_TIMEOUT): se a chave expirar ou for despejada, a próxima leitura
+cria uma marca nova (em vez de voltar a 0 e casar com uma entrada antiga). O instante embutido diz quando
+a entrada ficou desatualizada, e é dele que conta o MAX_STALE_SECONDS.
+
+No Redis cada entrada é binária (core.utils.interval_codec): pares uint16
+de minutos + a versão nos metadados, ~4 bytes por janela.
+
+Na leitura há ainda um LRU local por processo, usado só enquanto o
+invalidation_bus está saudável: cada incremento de versão publica um NOTIFY
+que remove as entradas afetadas em todos os processos.
+"""
+import logging
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connections
+
+from core.utils import interval_codec, invalidation_bus
+from core.utils.two_level_cache import LocalLRUCache
+from schedule.domain.services.available_time_service import AvailableTimeService
+from schedule.domain.services.reference_cache import ReferenceCacheService
+from schedule.models import Scheduling, Worker
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUT = 60 * 60 * 48
+# Marca de versão vive mais que qualquer entrada calculada com ela; sumiu
+# (TTL ou despejo), a próxima leitura cria outra e a entrada é recalculada
+VERSION_TIMEOUT = CACHE_TIMEOUT * 2
+
+# Stale-while-revalidate / single-flight
+MAX_STALE_SECONDS = 60
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 2
+WAIT_POLL_INTERVAL = 0.05
+
+local_windows = LocalLRUCache(maxsize=4096, ttl=60)
+
+
+def _local_key(worker_id, date_obj):
+    return f"{worker_id}:{date_obj.isoformat()}"
+
+
+def _evict_local_days(keys):
+    for key in keys:
+        local_windows.delete(key)
+
+
+def _base36(number):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    out = ""
+    while True:
+        number, rem = divmod(number, 36)
+        out = digits[rem] + out
+        if not number:
+            return out
+
+
+invalidation_bus.subscribe("availability_day", _evict_local_days)
+invalidation_bus.subscribe("availability_all", lambda keys: local_windows.clear())
+invalidation_bus.on_reset(local_windows.clear)
+
+
+class AvailabilityCacheService:
+
+    # ---------------------------------------------------------
+    # Chaves
+    # ---------------------------------------------------------
+    @staticmethod
+    def windows_key(worker_id, date_obj):
+        return f"availability:windows:{worker_id}:{date_obj.isoformat()}"
+
+    @staticmethod
+    def enterprise_version_key(enterprise_id):
+        return f"availability:version:enterprise:{enterprise_id}"
+
+    @staticmethod
+    def worker_version_key(worker_id):
+        return f"availability:version:worker:{worker_id}"
+
+    @staticmethod
+    def day_version_key(worker_id, date_obj):
+        return f"availability:version:day:{worker_id}:{date_obj.isoformat()}"
+
+    # ---------------------------------------------------------
+    # Versões
+    # ---------------------------------------------------------
+    @staticmethod
+    def new_version():
+        return f"{_base36(time.time_ns() // 1_000_000)}-{uuid.uuid4().hex[:6]}"
+
+    @staticmethod
+    def version_time(version):
+        """
+        Instante (epoch) da troca mais antiga entre as marcas de `version`
+        ("e.w.d"); 0 para marcas sem instante.
+        """
+        times = []
+        for part in (version or "").split("."):
+            stamp, sep, _ = part.partition("-")
+            try:
+                times.append(int(stamp, 36) / 1000 if sep else 0)
+            except ValueError:
+                times.append(0)
+        return min(times, default=0)
+
+    @staticmethod
+    def _bump(key):
+        cache.set(key, AvailabilityCacheService.new_version(), timeout=VERSION_TIMEOUT)
+
+    @staticmethod
+    def bump_enterprise(enterprise_id):
+        AvailabilityCacheService._bump(AvailabilityCacheService.enterprise_version_key(enterprise_id))
+        invalidation_bus.publish("availability_all", [enterprise_id])
+
+    @staticmethod
+    def bump_worker(worker_id):
+        AvailabilityCacheService._bump(AvailabilityCacheService.worker_version_key(worker_id))
+        invalidation_bus.publish("availability_all", [worker_id])
+
+    @staticmethod
+    def bump_days(worker_days):
+        worker_days = set(worker_days)
+        for worker_id, date_obj in worker_days:
+            AvailabilityCacheService._bump(AvailabilityCacheService.day_version_key(worker_id, date_obj))
+        invalidation_bus.publish(
+            "availability_day", [_local_key(worker_id, date_obj) for worker_id, date_obj in worker_days]
+        )
+
+    @staticmethod
+    def current_versions(enterprise_id, worker_days):
+        """
+        {(worker_id, date): "e.w.d"} lido com um único get_many (marcas
+        ausentes são criadas na hora).
+        """
+        worker_days = list(worker_days)
+        keys = {AvailabilityCacheService.enterprise_version_key(enterprise_id)}
+        for worker_id, date_obj in worker_days:
+            keys.add(AvailabilityCacheService.worker_version_key(worker_id))
+            keys.add(AvailabilityCacheService.day_version_key(worker_id, date_obj))
+
+        values = cache.get_many(list(keys))
+
+        missing = keys - values.keys()
+        if missing:
+            # nunca criada ou despejada: marca nova, não casa com entrada antiga
+            for key in missing:
+                version = AvailabilityCacheService.new_version()
+                if not cache.add(key, version, timeout=VERSION_TIMEOUT):
+                    version = cache.get(key, version)  # outro processo criou antes
+                values[key] = version
+
+        enterprise_version = values[AvailabilityCacheService.enterprise_version_key(enterprise_id)]
+
+        return {
+            (worker_id, date_obj): "{}.{}.{}".format(
+                enterprise_version,
+                values[AvailabilityCacheService.worker_version_key(worker_id)],
+                values[AvailabilityCacheService.day_version_key(worker_id, date_obj)],
+            )
+            for worker_id, date_obj in worker_days
+        }
+
+    # ---------------------------------------------------------
+    # Serialização (binária)
+    # ---------------------------------------------------------
+    @staticmethod
+    def encode_entry(version, windows, computed_at=None):
+        pairs = [
+            (AvailableTimeService.to_minutes(w["start"]), AvailableTimeService.to_minutes(w["end"]))
+            for w in windows
+        ]
+        computed_at = int(time.time() if computed_at is None else computed_at)
+        return interval_codec.encode(pairs, f"{version}@{computed_at}")
+
+    @staticmethod
+    def _split_meta(meta):
+        version, _, computed_at = (meta or "").partition("@")
+        return version or None, int(computed_at or 0)
+
+    @staticmethod
+    def entry_version(data):
+        if not isinstance(data, (bytes, bytearray)):
+            return None
+        return AvailabilityCacheService._split_meta(interval_codec.decode_meta(data))[0]
+
+    @staticmethod
+    def stale_for(cached_version, version):
+        """
+        Segundos desde a invalidação que tornou a entrada velha, pelo
+        instante das marcas atuais que diferem de `cached_version`.
+        """
+        changed = [
+            current
+            for cached, current in zip((cached_version or "").split("."), version.split("."))
+            if cached != current
+        ]
+        if not changed:
+            return float("inf")  # formato diferente: não dá para medir
+        return time.time() - AvailabilityCacheService.version_time(".".join(changed))
+
+    @staticmethod
+    def decode_entry(data):
+        """
+        (versão, calculado_em (epoch), janelas "HH:MM"); (None, 0, None)
+        para entradas ausentes.
+        """
+        if not isinstance(data, (bytes, bytearray)):
+            return None, 0, None
+        meta, pairs = interval_codec.decode(data)
+        version, computed_at = AvailabilityCacheService._split_meta(meta)
+        return version, computed_at, [
+            {"start": AvailableTimeService.to_str(start), "end": AvailableTimeService.to_str(end)}
+            for start, end in pairs
+        ]
+
+    # ---------------------------------------------------------
+    # Cálculo das janelas
+    # ---------------------------------------------------------
+    @staticmethod
+    def free_windows(template, date_obj, busy, overlap_tolerance):
+        schedule_window = AvailableTimeService.window_for_day(template, date_obj)
+        scheduled_items = [
+            {"start": s.start_time.strftime("%H:%M"), "end": s.end_time.strftime("%H:%M")}
+            for s in busy
+            if s.end_time
+        ]
+        free = AvailableTimeService.subtract_busy(schedule_window, scheduled_items)
+        return AvailableTimeService.apply_overlap_tolerance(
+            free, None, overlap_tolerance=overlap_tolerance
+        )
+
+    @staticmethod
+    def compute(enterprise_id, worker_days):
+        """
+        Janelas livres para os pares (profissional, dia) da empresa.
+        Só os agendamentos vêm do banco (uma consulta); grade e tolerância
+        vêm do ReferenceCacheService.
+        """
+        worker_days = list(worker_days)
+        if not worker_days:
+            return {}
+
+        worker_ids = {worker_id for worker_id, _ in worker_days}
+        dates = [date_obj for _, date_obj in worker_days]
+
+        templates = ReferenceCacheService.weekly_templates(worker_ids)
+        overlap_tolerance = ReferenceCacheService.overlap_tolerance(enterprise_id)
+
+        busy = {}
+        for sched in Scheduling.objects.filter(
+            enterprise_id=enterprise_id,
+            worker_id__in=worker_ids,
+            date__gte=min(dates),
+            date__lte=max(dates),
+            status__in=Scheduling.ACTIVE_STATUSES,
+        ).only("worker_id", "date", "start_time", "end_time").order_by("date", "start_time"):
+            busy.setdefault((sched.worker_id, sched.date), []).append(sched)
+
+        return {
+            (worker_id, date_obj): AvailabilityCacheService.free_windows(
+                templates.get(worker_id),
+                date_obj,
+                busy.get((worker_id, date_obj), []),
+                overlap_tolerance,
+            )
+            for worker_id, date_obj in worker_days
+        }
+
+    @staticmethod
+    def enterprise_worker_days(enterprise_id, start_date, days):
+        worker_ids = Worker.objects.filter(
+            enterprise_id=enterprise_id, is_active=True
+        ).values_list("id", flat=True)
+        return [
+            (worker_id, start_date + timedelta(days=offset))
+            for worker_id in worker_ids
+            for offset in range(days)
+        ]
+
+    # ---------------------------------------------------------
+    # Pré-cálculo (usado pelo comando, uma empresa por processo)
+    # ---------------------------------------------------------
+    @staticmethod
+    def stale_worker_days(versions):
+        """
+        Pares cuja entrada no cache falta ou foi calculada com outra versão.
+        """
+        keys = {
+            AvailabilityCacheService.windows_key(worker_id, date_obj): (worker_id, date_obj)
+            for worker_id, date_obj in versions
+        }
+        cached = cache.get_many(list(keys))
+        return [
+            worker_day
+            for key, worker_day in keys.items()
+            if AvailabilityCacheService.entry_version(cached.get(key)) != versions[worker_day]
+        ]
+
+    @staticmethod
+    def store(windows, versions):
+        cache.set_many(
+            {
+                AvailabilityCacheService.windows_key(worker_id, date_obj):
+                    AvailabilityCacheService.encode_entry(versions[(worker_id, date_obj)], value)
+                for (worker_id, date_obj), value in windows.items()
+            },
+            timeout=CACHE_TIMEOUT,
+        )
+
+    @staticmethod
+    def precompute_enterprise(enterprise_id, start_date, days, incremental=False):
+        """
+        Recalcula e grava no cache os próximos `days` dias da empresa.
+        Retorna (pares recalculados, total de pares).
+        """
+        all_days = AvailabilityCacheService.enterprise_worker_days(enterprise_id, start_date, days)
+
+        # versões lidas antes do cálculo: mudança no meio invalida a entrada
+        versions = AvailabilityCacheService.current_versions(enterprise_id, all_days)
+
+        worker_days = all_days
+        if incremental:
+            worker_days = AvailabilityCacheService.stale_worker_days(versions)
+
+        windows = AvailabilityCacheService.compute(enterprise_id, worker_days)
+        AvailabilityCacheService.store(windows, versions)
+        return len(windows), len(all_days)
+
+    # ---------------------------------------------------------
+    # Leitura (páginas públicas)
+    # ---------------------------------------------------------
+    @staticmethod
+    def get_windows(worker_id, date_obj, enterprise_id):
+        """
+        Janelas livres do cache se a versão for a atual. Entrada invalidada
+        há até MAX_STALE_SECONDS é servida enquanto uma thread
+        recalcula; sem entrada utilizável, só uma requisição por
+        profissional/dia calcula (single-flight) e as demais esperam.
+        """
+        invalidation_bus.ensure_listener()
+        local_key = _local_key(worker_id, date_obj)
+        use_local = invalidation_bus.is_healthy()
+
+        if use_local:
+            windows = local_windows.get(local_key, None)
+            if windows is not None:
+                return windows
+
+        version = AvailabilityCacheService.current_versions(
+            enterprise_id, [(worker_id, date_obj)]
+        )[(worker_id, date_obj)]
+
+        key = AvailabilityCacheService.windows_key(worker_id, date_obj)
+        cached_version, _, windows = AvailabilityCacheService.decode_entry(cache.get(key))
+
+        if cached_version != version:
+            if windows is not None and AvailabilityCacheService.stale_for(cached_version, version) <= MAX_STALE_SECONDS:
+                AvailabilityCacheService.refresh_in_background(enterprise_id, worker_id, date_obj, version)
+                return windows
+
+            windows = AvailabilityCacheService.compute_single_flight(
+                enterprise_id, worker_id, date_obj, version
+            )
+
+        if use_local:
+            local_windows.set(local_key, windows)
+        return windows
+
+    # ---------------------------------------------------------
+    # Single-flight / stale-while-revalidate
+    # ---------------------------------------------------------
+    @staticmethod
+    def lock_key(worker_id, date_obj):
+        return f"availability:lock:{worker_id}:{date_obj.isoformat()}"
+
+    @staticmethod
+    def _compute_and_store(enterprise_id, worker_id, date_obj, version):
+        computed = AvailabilityCacheService.compute(enterprise_id, [(worker_id, date_obj)])
+        AvailabilityCacheService.store(computed, {(worker_id, date_obj): version})
+        return computed[(worker_id, date_obj)]
+
+    @staticmethod
+    def _try_lock(worker_id, date_obj):
+        token = uuid.uuid4().hex
+        if cache.add(AvailabilityCacheService.lock_key(worker_id, date_obj), token, timeout=LOCK_TIMEOUT):
+            return token
+        return None
+
+    @staticmethod
+    def _release(worker_id, date_obj, token):
+        key = AvailabilityCacheService.lock_key(worker_id, date_obj)
+        if cache.get(key) == token:
+            cache.delete(key)
+
+    @staticmethod
+    def compute_single_flight(enterprise_id, worker_id, date_obj, version):
+        token = AvailabilityCacheService._try_lock(worker_id, date_obj)
+        if token:
+            try:
+                return AvailabilityCacheService._compute_and_store(enterprise_id, worker_id, date_obj, version)
+            finally:
+                AvailabilityCacheService._release(worker_id, date_obj, token)
+
+        # outra requisição está calculando: espera o resultado dela
+        key = AvailabilityCacheService.windows_key(worker_id, date_obj)
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_POLL_INTERVAL)
+            cached_version, _, windows = AvailabilityCacheService.decode_entry(cache.get(key))
+            if cached_version == version:
+                return windows
+            if cache.get(AvailabilityCacheService.lock_key(worker_id, date_obj)) is None:
+                break
+
+        # quem calculava terminou com outra versão ou demorou demais
+        return AvailabilityCacheService._compute_and_store(enterprise_id, worker_id, date_obj, version)
+
+    @staticmethod
+    def refresh_in_background(enterprise_id, worker_id, date_obj, version):
+        token = AvailabilityCacheService._try_lock(worker_id, date_obj)
+        if not token:
+            return  # já há alguém recalculando
+
+        def refresh():
+            try:
+                AvailabilityCacheService._compute_and_store(enterprise_id, worker_id, date_obj, version)
+            except Exception:
+                logger.exception("Falha ao recalcular disponibilidade de %s em %s", worker_id, date_obj)
+            finally:
+                AvailabilityCacheService._release(worker_id, date_obj, token)
+                connections.close_all()
+
+        threading.Thread(target=refresh, name="availability-refresh", daemon=True).start()
+
+    @staticmethod
+    def get_many_windows(enterprise_id, worker_days):
+        """
+        Janelas de vários profissionais/dias em duas idas ao Redis (um MGET
+        de versões e um das entradas). Pares sem entrada válida ficam None.
+        """
+        worker_days = list(worker_days)
+        versions = AvailabilityCacheService.current_versions(enterprise_id, worker_days)
+        keys = {
+            AvailabilityCacheService.windows_key(worker_id, date_obj): (worker_id, date_obj)
+            for worker_id, date_obj in worker_days
+        }
+        cached = cache.get_many(list(keys))
+
+        result = {}
+        for key, worker_day in keys.items():
+            version, _, windows = AvailabilityCacheService.decode_entry(cached.get(key))
+            result[worker_day] = windows if version == versions[worker_day] else None
+        return result
+
+    @staticmethod
+    def time_ranges(worker_id, date_obj, appointments, enterprise_id):
+        """
+        Mesmo formato de AvailableTimeService.generate_time_ranges, a partir
+        do cache. Só para leitura: a criação continua validando no banco.
+        """
+        windows = AvailabilityCacheService.get_windows(worker_id, date_obj, enterprise_id)
+        total_duration = AvailableTimeService.get_total_duration(appointments)
+        return AvailableTimeService.build_final_response(date_obj, windows, total_duration)
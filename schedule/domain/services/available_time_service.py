@@ -1,7 +1,6 @@
-from organization.models import SchedulingConfig
-from schedule.models import Scheduling, WorkerAvailability, Appointment
+from schedule.models import Scheduling
+from schedule.domain.services.reference_cache import ReferenceCacheService
 from datetime import datetime, timedelta
-from django.db.models import Sum
 
 
 class AvailableTimeService:
@@ -30,17 +29,23 @@ class AvailableTimeService:
     # ---------------------------------------------------------
     @staticmethod
     def get_total_duration(appointments):
-        return Appointment.objects.filter(
-            id__in=appointments
-        ).aggregate(Sum("duration"))["duration__sum"] or 0
+        durations = ReferenceCacheService.appointment_durations(appointments)
+        return sum(d for d in durations.values() if d)
 
     # ---------------------------------------------------------
     # 2. Disponibilidade semanal do trabalhador
     # ---------------------------------------------------------
     @staticmethod
     def get_schedule_window(worker_id, date_obj):
-        availability = WorkerAvailability.objects.filter(worker_id=worker_id).first()
-        if not availability:
+        template = ReferenceCacheService.weekly_templates([worker_id])[worker_id]
+        return AvailableTimeService.window_for_day(template, date_obj)
+
+    @staticmethod
+    def window_for_day(template, date_obj):
+        """
+        `template` é a grade semanal de ReferenceCacheService.weekly_template.
+        """
+        if not template:
             return []
 
         weekday_map = [
@@ -49,7 +54,7 @@ class AvailableTimeService:
         ]
 
         weekday_field = weekday_map[date_obj.weekday()]
-        blocks = getattr(availability, weekday_field, [])
+        blocks = template.get(weekday_field, [])
 
         return [{"start": start, "end": end} for start, end in blocks]
 
@@ -61,7 +66,8 @@ class AvailableTimeService:
         return Scheduling.objects.filter(
             worker_id=worker_id,
             date=date_obj,
-            enterprise_id=enterprise_id
+            enterprise_id=enterprise_id,
+            status__in=Scheduling.ACTIVE_STATUSES,
         ).order_by("start_time")
 
     # ---------------------------------------------------------
@@ -127,9 +133,13 @@ class AvailableTimeService:
     # 6. Ajustar janelas com overlap_tolerance
     # ---------------------------------------------------------
     @staticmethod
-    def apply_overlap_tolerance(free_windows, enterprise_id):
-        config = SchedulingConfig.objects.filter(enterprise_id=enterprise_id).first()
-        overlap_tolerance = config.overlap_tolerance if config else 0
+    def get_overlap_tolerance(enterprise_id):
+        return ReferenceCacheService.overlap_tolerance(enterprise_id)
+
+    @staticmethod
+    def apply_overlap_tolerance(free_windows, enterprise_id, overlap_tolerance=None):
+        if overlap_tolerance is None:
+            overlap_tolerance = AvailableTimeService.get_overlap_tolerance(enterprise_id)
 
         adjusted = []
         for w in free_windows:
@@ -201,6 +211,33 @@ class AvailableTimeService:
 
         return response
 
+    # ---------------------------------------------------------
+    # Horários de um dia a partir de dados já carregados
+    # ---------------------------------------------------------
+    @staticmethod
+    def ranges_for_day(date_obj, schedule_window, existing, total_duration, overlap_tolerance):
+
+        valid_schedulings = filter(
+            lambda s: AvailableTimeService.not_expired(s, date_obj),
+            existing
+        )
+
+        scheduled_items = [
+            {"start": s.start_time.strftime("%H:%M"),
+             "end":   s.end_time.strftime("%H:%M")}
+            for s in valid_schedulings
+        ]
+
+        free_windows = AvailableTimeService.subtract_busy(schedule_window, scheduled_items)
+
+        adjusted_windows = AvailableTimeService.apply_overlap_tolerance(
+            free_windows, None, overlap_tolerance=overlap_tolerance
+        )
+
+        return AvailableTimeService.build_final_response(
+            date_obj, adjusted_windows, total_duration
+        )
+
     # ---------------------------------------------------------
     # MÉTODO PRINCIPAL — orquestra tudo
     # ---------------------------------------------------------
@@ -219,23 +256,155 @@ class AvailableTimeService:
             worker_id, date_obj, enterprise_id
         )
 
-        valid_schedulings = filter(
-            lambda s: AvailableTimeService.not_expired(s, date_obj),
-            existing
+        return AvailableTimeService.ranges_for_day(
+            date_obj,
+            schedule_window,
+            existing,
+            total_duration,
+            AvailableTimeService.get_overlap_tolerance(enterprise_id),
         )
 
-        scheduled_items = [
-            {"start": s.start_time.strftime("%H:%M"),
-             "end":   s.end_time.strftime("%H:%M")}
-            for s in valid_schedulings
-        ]
+    # ---------------------------------------------------------
+    # VÁRIOS DIAS — mesma regra, uma consulta por tabela
+    # ---------------------------------------------------------
+    @staticmethod
+    def generate_time_ranges_for_dates(worker_id, dates, appointments, enterprise_id, total_duration=None):
+        """
+        Retorna {date: horários} para cada data. Os agendamentos de todas as
+        datas vêm de uma única consulta por intervalo.
+        """
+        if not dates:
+            return {}
 
-        free_windows = AvailableTimeService.subtract_busy(schedule_window, scheduled_items)
+        if total_duration is None:
+            total_duration = AvailableTimeService.get_total_duration(appointments)
+        template = ReferenceCacheService.weekly_templates([worker_id])[worker_id]
+        overlap_tolerance = AvailableTimeService.get_overlap_tolerance(enterprise_id)
 
-        adjusted_windows = AvailableTimeService.apply_overlap_tolerance(
-            free_windows, enterprise_id
+        existing_by_date = AvailableTimeService.existing_by_date(worker_id, dates, enterprise_id)
+
+        return {
+            date_obj: AvailableTimeService.ranges_for_day(
+                date_obj,
+                AvailableTimeService.window_for_day(template, date_obj),
+                existing_by_date.get(date_obj, []),
+                total_duration,
+                overlap_tolerance,
+            )
+            for date_obj in dates
+        }
+
+    @staticmethod
+    def existing_by_date(worker_id, dates, enterprise_id):
+        """
+        {date: agendamentos ativos} das datas pedidas, numa consulta por
+        intervalo (o date__gte/lte permite o partition pruning).
+        """
+        existing_by_date = {}
+        existing = Scheduling.objects.filter(
+            worker_id=worker_id,
+            enterprise_id=enterprise_id,
+            date__gte=min(dates),
+            date__lte=max(dates),
+            date__in=dates,
+            status__in=Scheduling.ACTIVE_STATUSES,
+        ).order_by("date", "start_time")
+        for sched in existing:
+            existing_by_date.setdefault(sched.date, []).append(sched)
+        return existing_by_date
+
+    @staticmethod
+    def start_available_on_dates(worker_id, dates, start_time, appointments, enterprise_id, total_duration=None):
+        """
+        {date: bool}: o mesmo início cabe em cada data? Mesma regra do
+        is_slot_available, com os agendamentos de todas as datas numa consulta.
+        """
+        if not dates:
+            return {}
+
+        if total_duration is None:
+            total_duration = AvailableTimeService.get_total_duration(appointments)
+        template = ReferenceCacheService.weekly_templates([worker_id])[worker_id]
+        overlap_tolerance = AvailableTimeService.get_overlap_tolerance(enterprise_id)
+        existing_by_date = AvailableTimeService.existing_by_date(worker_id, dates, enterprise_id)
+
+        return {
+            date_obj: AvailableTimeService.slot_fits(
+                date_obj,
+                start_time,
+                total_duration,
+                AvailableTimeService.window_for_day(template, date_obj),
+                existing_by_date.get(date_obj, []),
+                overlap_tolerance,
+            )
+            for date_obj in dates
+        }
+
+    # ---------------------------------------------------------
+    # VERIFICAÇÃO PONTUAL — um horário escolhido ainda cabe?
+    # ---------------------------------------------------------
+    @staticmethod
+    def slot_fits(date_obj, start_time, total_duration, schedule_window, busy, overlap_tolerance):
+        """
+        [início, início + duração] cabe numa janela livre (com a tolerância)
+        depois de descontar `busy`? Início a menos de 10 minutos de agora
+        ou atravessando a meia-noite não vale.
+        """
+        if not total_duration:
+            return False
+
+        start_dt = datetime.combine(date_obj, start_time)
+        end_dt = start_dt + timedelta(minutes=total_duration)
+        if end_dt.date() != date_obj or start_dt < datetime.now() + timedelta(minutes=10):
+            return False
+
+        free_windows = AvailableTimeService.subtract_busy(
+            schedule_window,
+            [
+                {"start": s.start_time.strftime("%H:%M"), "end": s.end_time.strftime("%H:%M")}
+                for s in busy
+                if s.end_time
+            ],
         )
 
-        return AvailableTimeService.build_final_response(
-            date_obj, adjusted_windows, total_duration
+        start = AvailableTimeService.to_minutes(start_dt.strftime("%H:%M"))
+        end = start + total_duration
+        return any(
+            AvailableTimeService.to_minutes(w["start"]) <= start
+            and end <= AvailableTimeService.to_minutes(w["end"])
+            for w in AvailableTimeService.apply_overlap_tolerance(
+                free_windows, None, overlap_tolerance=overlap_tolerance
+            )
+        )
+
+    @staticmethod
+    def is_slot_available(worker_id, date_obj, start_time, appointments, enterprise_id, exclude_id=None):
+        """
+        Confere só o horário escolhido, sem gerar a lista do dia: o intervalo
+        [início, início + duração] precisa caber numa janela livre (com a
+        tolerância da empresa) considerando apenas os agendamentos que o
+        cruzam. `exclude_id` ignora o próprio agendamento numa edição.
+        É a regra única: o form usa para validar, SchedulingService.create
+        repete a mesma checagem sob o lock do worker e create_series aplica
+        o mesmo slot_fits em cada data (start_available_on_dates).
+        """
+        total_duration = AvailableTimeService.get_total_duration(appointments)
+        end_dt = datetime.combine(date_obj, start_time) + timedelta(minutes=total_duration)
+
+        overlapping = Scheduling.objects.filter(
+            worker_id=worker_id,
+            date=date_obj,
+            enterprise_id=enterprise_id,
+            status__in=Scheduling.ACTIVE_STATUSES,
+            start_time__lt=end_dt.time(),
+            end_time__gt=start_time,
+        ).exclude(pk=exclude_id).only("start_time", "end_time")
+
+        return AvailableTimeService.slot_fits(
+            date_obj,
+            start_time,
+            total_duration,
+            AvailableTimeService.get_schedule_window(worker_id, date_obj),
+            overlapping,
+            AvailableTimeService.get_overlap_tolerance(enterprise_id),
         )
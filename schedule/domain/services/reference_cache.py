@@ -0,0 +1,57 @@
+"""
+Dados de referência da agenda (mudam raramente) servidos pelo
+TwoLevelCache: tolerância da empresa, duração dos atendimentos e grade
+semanal dos profissionais. Invalidados pelos sinais em schedule/signals.py.
+"""
+from core.utils.two_level_cache import TwoLevelCache
+from organization.models import SchedulingConfig
+from schedule.models import Appointment, WorkerAvailability
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+overlap_tolerance_cache = TwoLevelCache("overlap_tolerance")
+appointment_duration_cache = TwoLevelCache("appointment_duration", maxsize=4096)
+weekly_template_cache = TwoLevelCache("weekly_template", maxsize=4096)
+
+
+class ReferenceCacheService:
+
+    # ---------------------------------------------------------
+    # SchedulingConfig → tolerância (minutos)
+    # ---------------------------------------------------------
+    @staticmethod
+    def overlap_tolerance(enterprise_id):
+        def load():
+            config = SchedulingConfig.objects.filter(enterprise_id=enterprise_id).first()
+            return config.overlap_tolerance if config else 0
+
+        return overlap_tolerance_cache.get(enterprise_id, load)
+
+    # ---------------------------------------------------------
+    # Appointment → duração (minutos)
+    # ---------------------------------------------------------
+    @staticmethod
+    def appointment_durations(appointment_ids):
+        def load(missing):
+            return dict(
+                Appointment.objects.filter(id__in=missing).values_list("id", "duration")
+            )
+
+        return appointment_duration_cache.get_many(appointment_ids, load)
+
+    # ---------------------------------------------------------
+    # WorkerAvailability → {weekday: [[início, fim], ...]} ou None
+    # ---------------------------------------------------------
+    @staticmethod
+    def weekly_template(availability):
+        return {day: getattr(availability, day) or [] for day in WEEKDAYS}
+
+    @staticmethod
+    def weekly_templates(worker_ids):
+        def load(missing):
+            return {
+                availability.worker_id: ReferenceCacheService.weekly_template(availability)
+                for availability in WorkerAvailability.objects.filter(worker_id__in=missing)
+            }
+
+        return weekly_template_cache.get_many(worker_ids, load)
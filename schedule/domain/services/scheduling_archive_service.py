@@ -0,0 +1,109 @@
+import logging
+
+from django.db import connection, transaction
+
+from schedule.models import Scheduling, SchedulingArchive
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulingArchiveService:
+
+    # ---------------------------------------------------------
+    # SQL: move um lote da tabela quente para o arquivo
+    # ---------------------------------------------------------
+    @staticmethod
+    def _archive_sql():
+        through = Scheduling.appointments.through._meta
+        sched_col = through.get_field("scheduling").column
+        appt_col = through.get_field("appointment").column
+
+        return f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT s.id, s.enterprise_id, s.worker_id, s.client_id, s.date, s.start_time,
+                       s.end_time, s.duration, s.notes, s.series_id, s.status, s.created_at
+                  FROM "{Scheduling._meta.db_table}" s
+                 WHERE s.date < %s
+                   AND NOT EXISTS (
+                    SELECT 1 FROM "{SchedulingArchive._meta.db_table}" a WHERE a.id = s.id
+                 )
+                 ORDER BY s.date
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+            ),
+            archived AS (
+                INSERT INTO "{SchedulingArchive._meta.db_table}" (
+                    id, enterprise_id, worker_id, client_id, appointment_ids, date,
+                    start_time, end_time, duration, notes, series_id, status, created_at, archived_at
+                )
+                SELECT c.id, c.enterprise_id, c.worker_id, c.client_id,
+                       ARRAY(SELECT t."{appt_col}" FROM "{through.db_table}" t WHERE t."{sched_col}" = c.id),
+                       c.date, c.start_time, c.end_time, c.duration, c.notes,
+                       c.series_id, c.status, c.created_at, NOW()
+                  FROM candidates c
+                ON CONFLICT (id) DO NOTHING
+                RETURNING id
+            ),
+            links AS (
+                DELETE FROM "{through.db_table}" t
+                 USING archived a
+                 WHERE t."{sched_col}" = a.id
+            ),
+            moved AS (
+                DELETE FROM "{Scheduling._meta.db_table}" s
+                 USING archived a
+                 WHERE s.id = a.id
+                RETURNING s.id
+            )
+            SELECT (SELECT COUNT(*) FROM moved),
+                   ARRAY(SELECT c.id FROM candidates c WHERE c.id NOT IN (SELECT id FROM archived))
+        """
+
+    @staticmethod
+    def archive_batch(before_date, batch_size=1000):
+        """
+        Move até `batch_size` agendamentos com data < before_date em uma
+        única instrução (INSERT ... RETURNING + DELETE). Retorna quantos
+        foram arquivados.
+
+        Só sai da tabela quente o que o INSERT gravou de fato. Um id que já
+        existe no arquivo fica na tabela quente (não entra no lote, nem é
+        apagado) e é registrado no log para conferência manual.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(SchedulingArchiveService._archive_sql(), [before_date, batch_size])
+            moved, conflicts = cursor.fetchone()
+
+        if conflicts:
+            logger.warning("Agendamentos não arquivados (id já existe no arquivo): %s", conflicts)
+        return moved
+
+    @staticmethod
+    def archive_before(before_date, batch_size=1000, max_batches=None):
+        """
+        Arquiva em lotes (transações curtas) até esgotar ou atingir max_batches.
+        Gera o total acumulado a cada lote; no fim registra no log os ids que
+        não puderam ser movidos por já existirem no arquivo.
+        """
+        total = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            moved = SchedulingArchiveService.archive_batch(before_date, batch_size)
+            if not moved:
+                break
+
+            total += moved
+            batches += 1
+            yield total
+
+        conflicts = list(
+            Scheduling.objects
+            .filter(date__lt=before_date, id__in=SchedulingArchive.objects.values("id"))
+            .values_list("id", flat=True)
+        )
+        if conflicts:
+            logger.warning(
+                "%s agendamentos anteriores a %s ficaram na tabela quente (id já existe no arquivo): %s",
+                len(conflicts), before_date, conflicts,
+            )
@@ -1,12 +1,57 @@
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 from django.db import transaction
+from django.utils import timezone
 from core.utils.redis_lock import redis_lock
+from outbox.services import OutboxService
 from schedule.models import Scheduling
+from schedule.domain.services.availability_cache import AvailabilityCacheService
 from schedule.domain.services.available_time_service import AvailableTimeService
+from schedule.domain.services.waitlist_service import WaitlistService
+
+
+class SeriesConflictError(ValueError):
+    """
+    Uma ou mais ocorrências da série caem em horário indisponível.
+    `conflicts` traz as datas em conflito.
+    """
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        dates = ", ".join(d.strftime("%d/%m/%Y") for d in conflicts)
+        super().__init__(f"Horário indisponível em: {dates}.")
+
+
+# Eventos de domínio (routing key do outbox)
+SCHEDULING_CREATED = "schedule.scheduling.created"
+
+
+def scheduling_status_event(status):
+    return f"schedule.scheduling.{status}"
+
+
+def scheduling_event_payload(values):
+    """
+    values: Scheduling ou dict com os mesmos campos.
+    """
+    get = values.get if isinstance(values, dict) else lambda field: getattr(values, field)
+    return {
+        "id": str(get("id")),
+        "enterprise_id": str(get("enterprise_id")),
+        "worker_id": str(get("worker_id")),
+        "client_id": str(get("client_id")) if get("client_id") else None,
+        "date": get("date").isoformat(),
+        "start_time": get("start_time").strftime("%H:%M"),
+        "end_time": get("end_time").strftime("%H:%M") if get("end_time") else None,
+        "status": get("status"),
+    }
 
 
 class SchedulingService:
 
+    # Campos que podem ser alterados em lote sem revalidar disponibilidade
+    SERIES_EDITABLE_FIELDS = ("client_id", "notes")
+
     @staticmethod
     def _parse_date(date_value):
         if hasattr(date_value, "year"):  # já é date
@@ -39,16 +84,10 @@ class SchedulingService:
 
         with redis_lock(lock_key):
 
-            available = AvailableTimeService.generate_time_ranges(
-                worker_id=worker_id,
-                date=date_obj.strftime("%d/%m/%Y"),  # seu AvailableTimeService espera string BR
-                appointments=appointments,
-                enterprise_id=enterprise_id,
-            )
-
-            is_valid = any(
-                slot["horario_inicio"] == start_time_obj.strftime("%H:%M")
-                for slot in available.values()
+            # mesma regra do form (SchedulingAdminForm.clean): qualquer início
+            # que caiba numa janela livre, não só os da lista de sugestões
+            is_valid = AvailableTimeService.is_slot_available(
+                worker_id, date_obj, start_time_obj, appointments, enterprise_id,
             )
 
             if not is_valid:
@@ -69,4 +108,195 @@ class SchedulingService:
             scheduling.update_duration_and_end_time()
             scheduling.save(update_fields=["duration", "end_time"])
 
+            # mesmo commit do agendamento; o relay_outbox publica depois
+            OutboxService.record(
+                SCHEDULING_CREATED, "scheduling", scheduling.id, scheduling_event_payload(scheduling)
+            )
+
             return scheduling
+
+    # ---------------------------------------------------------
+    # SÉRIES (agendamentos recorrentes)
+    # ---------------------------------------------------------
+    @staticmethod
+    def series_dates(start_date, interval_days=7, occurrences=None, until=None):
+        """
+        Expande a recorrência: start_date, start_date + interval_days, ...
+        até `occurrences` ocorrências ou até `until` (inclusive).
+        """
+        if interval_days < 1:
+            raise ValueError("O intervalo da série deve ser de pelo menos 1 dia.")
+        if occurrences is None and until is None:
+            raise ValueError("Informe o número de ocorrências ou a data final da série.")
+
+        dates = []
+        current = start_date
+        while (occurrences is None or len(dates) < occurrences) and (until is None or current <= until):
+            dates.append(current)
+            current += timedelta(days=interval_days)
+        return dates
+
+    @staticmethod
+    @transaction.atomic
+    def create_series(worker_id, client_id, appointments, start_date, start_time, enterprise_id,
+                      interval_days=7, occurrences=None, until=None, notes=None,
+                      skip_conflicts=False):
+        """
+        Cria todas as ocorrências de uma série com uma verificação de
+        disponibilidade (uma consulta por intervalo) e um bulk_create.
+
+        Com skip_conflicts=False qualquer conflito cancela a série inteira
+        (SeriesConflictError); com True as datas em conflito são puladas.
+        Retorna {"series_id", "created", "conflicts"}.
+        """
+        start_date = SchedulingService._parse_date(start_date)
+        start_time_obj = SchedulingService._parse_time(start_time)
+        if until is not None:
+            until = SchedulingService._parse_date(until)
+
+        dates = SchedulingService.series_dates(start_date, interval_days, occurrences, until)
+
+        with redis_lock(f"worker:{worker_id}"):
+
+            # mesma regra de create (início livre dentro da janela, não só a
+            # grade de sugestões), com os agendamentos de todas as datas numa consulta
+            total_duration = AvailableTimeService.get_total_duration(appointments)
+            available = AvailableTimeService.start_available_on_dates(
+                worker_id=worker_id,
+                dates=dates,
+                start_time=start_time_obj,
+                appointments=appointments,
+                enterprise_id=enterprise_id,
+                total_duration=total_duration,
+            )
+
+            conflicts = [date_obj for date_obj in dates if not available[date_obj]]
+
+            if conflicts and not skip_conflicts:
+                raise SeriesConflictError(conflicts)
+
+            series_id = uuid.uuid4()
+            conflict_set = set(conflicts)
+
+            schedulings = []
+            for date_obj in dates:
+                if date_obj in conflict_set:
+                    continue
+
+                end_time = None
+                if total_duration > 0:
+                    end_time = (
+                        datetime.combine(date_obj, start_time_obj) + timedelta(minutes=total_duration)
+                    ).time()
+
+                schedulings.append(Scheduling(
+                    worker_id=worker_id,
+                    enterprise_id=enterprise_id,
+                    client_id=client_id,
+                    date=date_obj,
+                    start_time=start_time_obj,
+                    end_time=end_time,
+                    duration=total_duration,
+                    notes=notes,
+                    series_id=series_id,
+                ))
+
+            # bulk_create não chama save(): duração / fim já vão calculados
+            Scheduling.objects.bulk_create(schedulings)
+
+            Through = Scheduling.appointments.through
+            Through.objects.bulk_create([
+                Through(scheduling_id=scheduling.id, appointment_id=appointment_id)
+                for scheduling in schedulings
+                for appointment_id in appointments
+            ])
+
+            OutboxService.record_many([
+                OutboxService.event(
+                    SCHEDULING_CREATED, "scheduling", scheduling.id, scheduling_event_payload(scheduling)
+                )
+                for scheduling in schedulings
+            ])
+
+            # bulk_create não dispara sinais: invalida o cache aqui
+            created_days = [(worker_id, scheduling.date) for scheduling in schedulings]
+            transaction.on_commit(lambda: AvailabilityCacheService.bump_days(created_days))
+
+            return {"series_id": series_id, "created": schedulings, "conflicts": conflicts}
+
+    @staticmethod
+    def _series_queryset(series_id, enterprise_id, from_date=None):
+        qs = Scheduling.objects.filter(series_id=series_id, enterprise_id=enterprise_id)
+        if from_date is not None:
+            qs = qs.filter(date__gte=SchedulingService._parse_date(from_date))
+        return qs
+
+    @staticmethod
+    def update_series(series_id, enterprise_id, from_date=None, **fields):
+        """
+        Altera (em um único UPDATE) as ocorrências da série a partir de
+        `from_date`. Só aceita campos que não mudam a disponibilidade.
+        """
+        invalid = set(fields) - set(SchedulingService.SERIES_EDITABLE_FIELDS)
+        if invalid:
+            raise ValueError(f"Campos não editáveis em lote: {', '.join(sorted(invalid))}.")
+
+        return SchedulingService._series_queryset(series_id, enterprise_id, from_date).update(
+            updated_at=timezone.now(), **fields
+        )
+
+    @staticmethod
+    def cancel_series(series_id, enterprise_id, from_date=None):
+        """
+        Cancela as ocorrências da série a partir de `from_date` (todas se None).
+        """
+        return SchedulingService.change_status(
+            SchedulingService._series_queryset(series_id, enterprise_id, from_date),
+            Scheduling.STATUS_CANCELLED,
+        )
+
+    # ---------------------------------------------------------
+    # STATUS (nada é apagado: cancelar libera o horário)
+    # ---------------------------------------------------------
+    @staticmethod
+    def change_status(queryset, status):
+        """
+        Move para `status` (em um único UPDATE) os agendamentos do queryset
+        que ainda estão agendados e avisa a lista de espera após o commit.
+        Retorna quantos foram alterados.
+        """
+        if status not in dict(Scheduling.STATUS_CHOICES) or status == Scheduling.STATUS_BOOKED:
+            raise ValueError("Status inválido.")
+
+        with transaction.atomic():
+            # Horários liberados (travados até o UPDATE), para a lista de espera
+            freed = list(
+                queryset.filter(status=Scheduling.STATUS_BOOKED)
+                .select_for_update()
+                .values("id", "enterprise_id", "worker_id", "client_id", "date", "start_time", "end_time")
+            )
+            if not freed:
+                return 0
+
+            updated = Scheduling.objects.filter(id__in=[s["id"] for s in freed]).update(
+                status=status, updated_at=timezone.now()
+            )
+
+            OutboxService.record_many([
+                OutboxService.event(
+                    scheduling_status_event(status), "scheduling", s["id"],
+                    scheduling_event_payload({**s, "status": status}),
+                )
+                for s in freed
+            ])
+
+            freed_slots = [
+                {"scheduling_id": s["id"], **{k: v for k, v in s.items() if k not in ("id", "client_id")}}
+                for s in freed
+            ]
+            transaction.on_commit(lambda: AvailabilityCacheService.bump_days(
+                (slot["worker_id"], slot["date"]) for slot in freed_slots
+            ))
+            transaction.on_commit(lambda: WaitlistService.notify_freed_slots(freed_slots))
+
+        return updated
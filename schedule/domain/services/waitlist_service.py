@@ -0,0 +1,184 @@
+import logging
+from datetime import date, datetime, timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from schedule.models import WaitlistEntry, Worker
+
+logger = logging.getLogger(__name__)
+
+WAITLIST_ROUTING_KEY = "schedule.waitlist.slot_freed"
+
+# Entrada avisada há menos que isso não recebe outro aviso
+NOTIFY_COOLDOWN = timedelta(hours=1)
+
+
+class WaitlistService:
+
+    # ---------------------------------------------------------
+    # Horário liberado por um agendamento
+    # ---------------------------------------------------------
+    @staticmethod
+    def freed_slot(scheduling):
+        return {
+            "scheduling_id": scheduling.id,
+            "enterprise_id": scheduling.enterprise_id,
+            "worker_id": scheduling.worker_id,
+            "date": scheduling.date,
+            "start_time": scheduling.start_time,
+            "end_time": scheduling.end_time,
+        }
+
+    @staticmethod
+    def slot_minutes(slot):
+        start = datetime.combine(slot["date"], slot["start_time"])
+        end = datetime.combine(slot["date"], slot["end_time"])
+        return int((end - start).total_seconds() // 60)
+
+    # ---------------------------------------------------------
+    # 1. Candidatas: só entradas que cruzam o intervalo liberado
+    # ---------------------------------------------------------
+    @staticmethod
+    def overlap_q(slot):
+        """
+        Entradas ativas do profissional (ou de "qualquer profissional" da
+        empresa) cuja faixa de datas contém o dia e cuja preferência de
+        horário cruza o intervalo. Usa os índices parciais da lista.
+        """
+        return (
+            (Q(worker_id=slot["worker_id"])
+             | Q(worker__isnull=True, enterprise_id=slot["enterprise_id"]))
+            & Q(date_end__gte=slot["date"], date_start__lte=slot["date"])
+            & (Q(preferred_start__isnull=True) | Q(preferred_start__lt=slot["end_time"]))
+            & (Q(preferred_end__isnull=True) | Q(preferred_end__gt=slot["start_time"]))
+        )
+
+    @staticmethod
+    def not_recently_notified_q(now=None):
+        cutoff = (now or timezone.now()) - NOTIFY_COOLDOWN
+        return Q(notified_at__isnull=True) | Q(notified_at__lt=cutoff)
+
+    @staticmethod
+    def candidate_entries(slots):
+        return (
+            WaitlistEntry.objects
+            .filter(is_active=True)
+            .filter(WaitlistService.not_recently_notified_q())
+            .filter(reduce(or_, (WaitlistService.overlap_q(slot) for slot in slots)))
+            .prefetch_related("appointments")
+        )
+
+    # ---------------------------------------------------------
+    # 2. Casamento em memória (atendimentos + duração)
+    # ---------------------------------------------------------
+    @staticmethod
+    def entry_matches(entry, slot, entry_appointments, worker_appointment_ids):
+        if entry.worker_id not in (None, slot["worker_id"]):
+            return False
+        if entry.worker_id is None and entry.enterprise_id != slot["enterprise_id"]:
+            return False
+        if not (entry.date_start <= slot["date"] <= entry.date_end):
+            return False
+        if entry.preferred_start and entry.preferred_start >= slot["end_time"]:
+            return False
+        if entry.preferred_end and entry.preferred_end <= slot["start_time"]:
+            return False
+
+        # o profissional precisa oferecer todos os atendimentos pedidos
+        if any(a.id not in worker_appointment_ids for a in entry_appointments):
+            return False
+
+        return sum(a.duration for a in entry_appointments) <= WaitlistService.slot_minutes(slot)
+
+    @staticmethod
+    def match(slots):
+        """
+        Retorna [(entry, slot)] — cada entrada casa com no máximo um horário.
+        """
+        slots = [
+            s for s in slots
+            if s["end_time"] and s["date"] >= date.today()
+        ]
+        if not slots:
+            return []
+
+        worker_ids = {s["worker_id"] for s in slots}
+        Through = Worker.appointments.through
+        worker_appointments = {}
+        for worker_id, appointment_id in Through.objects.filter(
+            worker_id__in=worker_ids
+        ).values_list("worker_id", "appointment_id"):
+            worker_appointments.setdefault(worker_id, set()).add(appointment_id)
+
+        matches = []
+        for entry in WaitlistService.candidate_entries(slots):
+            entry_appointments = list(entry.appointments.all())
+            for slot in slots:
+                if WaitlistService.entry_matches(
+                    entry, slot, entry_appointments, worker_appointments.get(slot["worker_id"], set())
+                ):
+                    matches.append((entry, slot))
+                    break
+
+        return matches
+
+    # ---------------------------------------------------------
+    # 3. Aviso em lote (uma mensagem para todos os casamentos)
+    # ---------------------------------------------------------
+    @staticmethod
+    def build_notifications(matches):
+        return [
+            {
+                "waitlist_entry_id": str(entry.id),
+                "enterprise_id": str(entry.enterprise_id),
+                "client_id": str(entry.client_id),
+                "worker_id": str(slot["worker_id"]),
+                "date": slot["date"].isoformat(),
+                "start_time": slot["start_time"].strftime("%H:%M"),
+                "end_time": slot["end_time"].strftime("%H:%M"),
+            }
+            for entry, slot in matches
+        ]
+
+    @staticmethod
+    def claim(matches):
+        """
+        Marca notified_at só nas entradas ainda fora do cooldown (travadas,
+        pulando as que outro aviso concorrente já pegou). Retorna os
+        casamentos reivindicados.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            claimed = set(
+                WaitlistEntry.objects
+                .select_for_update(skip_locked=True)
+                .filter(id__in=[entry.id for entry, _ in matches])
+                .filter(WaitlistService.not_recently_notified_q(now))
+                .values_list("id", flat=True)
+            )
+            WaitlistEntry.objects.filter(id__in=claimed).update(notified_at=now)
+        return [(entry, slot) for entry, slot in matches if entry.id in claimed]
+
+    @staticmethod
+    def notify_freed_slots(slots):
+        matches = WaitlistService.claim(WaitlistService.match(slots))
+        if not matches:
+            return 0
+
+        # import tardio: kombu / JWT só quando há o que publicar
+        from infra.messaging.async_publisher import enqueue_message
+
+        notifications = WaitlistService.build_notifications(matches)
+        if not enqueue_message({"notifications": notifications}, WAITLIST_ROUTING_KEY):
+            logger.warning("Falha ao enfileirar %s avisos da lista de espera", len(notifications))
+            # aviso não saiu: libera as entradas para o próximo horário
+            WaitlistEntry.objects.filter(
+                id__in=[entry.id for entry, _ in matches]
+            ).update(notified_at=None)
+            return 0
+
+        return len(notifications)
@@ -2,6 +2,7 @@ from datetime import datetime
 from django import forms
 from decimal import Decimal, InvalidOperation
 from django.forms import CheckboxSelectMultiple
+from django.urls import reverse
 
 from schedule.domain.services.available_time_service import AvailableTimeService
 
@@ -210,10 +211,18 @@ class WorkerAvailabilityForm(forms.ModelForm):
 
 
 class SchedulingAdminForm(forms.ModelForm):
+    """
+    As opções de horário e os atendimentos do profissional são preenchidos
+    no navegador (scheduling-filter-by-worker.js) pelos endpoints JSON do
+    SchedulingAdmin; o form só confere o horário escolhido.
+    """
 
-    schedule_option = forms.ChoiceField(
+    EMPTY_OPTION = ("", "Selecione um horário")
+
+    schedule_option = forms.CharField(
         label="Horário do Atendimento",
-        required=False
+        required=False,
+        widget=forms.Select(choices=[EMPTY_OPTION]),
     )
 
     class Meta:
@@ -226,59 +235,66 @@ class SchedulingAdminForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.fields["schedule_option"].choices = [
-            ("", "Selecione um horário")
-        ]
-
-        request = getattr(self, "request", None)
-        if not request:
-            return
-
-        worker_id = request.GET.get("worker")
-        date = request.GET.get("date")
-        appointments = request.GET.get("appointments", "")
-
-        appointments_list = (
-            [] if appointments in ("", None, "null") else appointments.split(",")
-        )
+        # Atendimentos do profissional escolhido (POST, ?worker= ou instância)
+        if "appointments" in self.fields:
+            worker_id = self["worker"].value() if "worker" in self.fields else self.instance.worker_id
+            self.fields["appointments"].queryset = (
+                Appointment.objects.filter(workers__id=worker_id).distinct()
+                if worker_id else Appointment.objects.none()
+            )
 
-        if not worker_id or not date or not appointments_list:
-            return
+        # Mantém o horário enviado ao reexibir o form com erros
+        option = self["schedule_option"].value()
+        choices = [self.EMPTY_OPTION]
+        if option:
+            choices.append((option, option))
+        self.fields["schedule_option"].widget.choices = choices
+        self.fields["schedule_option"].widget.attrs.update({
+            "data-slots-url": reverse("admin:schedule_scheduling_slots"),
+            "data-appointments-url": reverse("admin:schedule_scheduling_worker_appointments"),
+        })
+
+    def clean_schedule_option(self):
+        horario = self.cleaned_data.get("schedule_option")
+        if not horario:
+            return None
+        try:
+            return datetime.strptime(horario, "%H:%M").time()
+        except ValueError:
+            raise forms.ValidationError("Horário inválido.")
 
-        if request.user.is_superuser:
-            try:
-                worker = Worker.objects.get(id=worker_id)
-                enterprise_id = worker.enterprise_id
-            except Worker.DoesNotExist:
-                return
-        else:
-            enterprise_id = request.session.get("enterprise_id")
-
-        sequences = AvailableTimeService.generate_time_ranges(
-            worker_id,
-            date,
-            appointments_list,
-            enterprise_id,
-        )
-
-        self.fields["schedule_option"].choices = [
-            ("", "Selecione um horário")
-        ] + [
-            (
-                value["horario_inicio"],
-                f"das {value['horario_inicio']} às {value['horario_fim']}"
-            )
-            for value in sequences.values()
-        ]
+    def _enterprise_id(self, worker):
+        request = getattr(self, "request", None)
+        if request is None or request.user.is_superuser:
+            return worker.enterprise_id
+        return request.session.get("enterprise_id")
 
     def clean(self):
         cleaned = super().clean()
 
-        horario = cleaned.get("schedule_option")
+        start_time = cleaned.get("schedule_option")
+        if not start_time:
+            if not self.instance.pk:
+                self.add_error("schedule_option", "Selecione um horário.")
+            return cleaned
+
+        worker = cleaned.get("worker")
+        appointments = cleaned.get("appointments")
+        date = cleaned.get("date")
+
+        if worker and date and appointments:
+            available = AvailableTimeService.is_slot_available(
+                worker.pk,
+                date,
+                start_time,
+                [a.pk for a in appointments],
+                self._enterprise_id(worker),
+                exclude_id=self.instance.pk,
+            )
+            if not available:
+                self.add_error("schedule_option", "Este horário não está mais disponível.")
 
-        if horario:
-            from datetime import datetime
-            # escreve diretamente no objeto (garantido)
-            self.instance.start_time = datetime.strptime(horario, "%H:%M").time()
+        # escreve diretamente no objeto (garantido)
+        self.instance.start_time = start_time
 
         return cleaned
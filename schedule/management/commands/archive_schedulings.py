@@ -0,0 +1,66 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from schedule.domain.services.scheduling_archive_service import SchedulingArchiveService
+from schedule.models import Scheduling
+
+
+class Command(BaseCommand):
+    help = (
+        "Move agendamentos antigos (e seus vínculos com atendimentos) para a "
+        "tabela de arquivo, em lotes com DELETE ... RETURNING."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=365,
+            help="Arquiva agendamentos com data anterior a hoje - N dias (padrão: 365).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Agendamentos por lote/transação (padrão: 1000).",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Para depois de N lotes (útil para rodar em janelas curtas).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Só conta o que seria arquivado.",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] < 0 or options["batch_size"] <= 0:
+            raise CommandError("--older-than-days e --batch-size devem ser positivos.")
+
+        before_date = date.today() - timedelta(days=options["older_than_days"])
+
+        if options["dry_run"]:
+            pending = Scheduling.objects.filter(date__lt=before_date).count()
+            self.stdout.write(f"Arquivaria {pending} agendamentos anteriores a {before_date}.")
+            return
+
+        started = time.monotonic()
+        total = 0
+
+        for total in SchedulingArchiveService.archive_before(
+            before_date,
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        ):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{total} arquivados ({total / elapsed:.0f}/s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} agendamentos anteriores a {before_date} arquivados "
+            f"em {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,75 @@
+import pickle
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.utils import interval_codec
+from schedule.domain.services.availability_cache import AvailabilityCacheService
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara o formato binário do cache de disponibilidade com o pickle "
+        'dos dicts "HH:MM": bytes por entrada e tempo de decodificação.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entries", type=int, default=20000, help="Profissionais-dia simulados.")
+        parser.add_argument("--windows", type=int, default=4, help="Janelas livres por entrada (máximo).")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def _fake_windows(self, rng, max_windows):
+        windows, cursor = [], rng.randrange(6 * 60, 9 * 60, 5)
+        for _ in range(rng.randint(0, max_windows)):
+            start = cursor + rng.randrange(0, 90, 5)
+            end = start + rng.randrange(15, 180, 5)
+            if end >= 24 * 60:
+                break
+            windows.append({
+                "start": f"{start // 60:02d}:{start % 60:02d}",
+                "end": f"{end // 60:02d}:{end % 60:02d}",
+            })
+            cursor = end
+        return windows
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        entries = [
+            (".".join(AvailabilityCacheService.new_version() for _ in range(3)),
+             self._fake_windows(rng, options["windows"]))
+            for _ in range(options["entries"])
+        ]
+
+        pickled = [
+            pickle.dumps({"version": version, "windows": windows}, protocol=pickle.HIGHEST_PROTOCOL)
+            for version, windows in entries
+        ]
+        packed = [
+            AvailabilityCacheService.encode_entry(version, windows, computed_at=0)
+            for version, windows in entries
+        ]
+
+        results = []
+
+        started = time.perf_counter()
+        for data in pickled:
+            pickle.loads(data)
+        results.append(("pickle (dict HH:MM)", pickled, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        for data in packed:
+            interval_codec.decode(data)
+        results.append(("uint16 (minutos)", packed, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        for data in packed:
+            AvailabilityCacheService.decode_entry(data)
+        results.append(("uint16 → HH:MM", packed, time.perf_counter() - started))
+
+        self.stdout.write(f"{len(entries)} entradas (versão como metadado de texto)")
+        for label, blobs, elapsed in results:
+            self.stdout.write(
+                f"{label:<22} {sum(map(len, blobs)) / len(blobs):8.1f} bytes/entrada "
+                f"{elapsed / len(blobs) * 1e6:8.2f} µs/decodificação"
+            )
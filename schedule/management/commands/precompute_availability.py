@@ -0,0 +1,94 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from schedule.domain.services.availability_cache import AvailabilityCacheService
+from schedule.models import Worker
+
+
+def _init_process():
+    # Necessário quando o start method é spawn/forkserver (no fork é no-op)
+    import django
+    django.setup()
+
+
+def _precompute(enterprise_id, start_date, days, incremental):
+    try:
+        return enterprise_id, AvailabilityCacheService.precompute_enterprise(
+            enterprise_id, start_date, days, incremental=incremental
+        )
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Pré-calcula as janelas livres de todos os profissionais ativos para "
+        "os próximos N dias e grava no cache de disponibilidade."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Quantos dias a partir de hoje (padrão: 30).",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Processos em paralelo (padrão: número de CPUs).",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Recalcula só os profissionais/dias cuja versão mudou.",
+        )
+        parser.add_argument(
+            "--enterprise",
+            action="append",
+            default=None,
+            help="Limita a uma empresa (pode repetir).",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        if days <= 0:
+            raise CommandError("--days deve ser positivo.")
+
+        enterprise_ids = options["enterprise"] or list(
+            Worker.objects.filter(is_active=True)
+            .values_list("enterprise_id", flat=True)
+            .distinct()
+        )
+        start_date = date.today()
+        incremental = options["incremental"]
+
+        # o pai não leva conexões abertas para os filhos
+        connections.close_all()
+
+        started = time.monotonic()
+        computed = total = 0
+
+        with ProcessPoolExecutor(max_workers=options["processes"], initializer=_init_process) as pool:
+            futures = [
+                pool.submit(_precompute, enterprise_id, start_date, days, incremental)
+                for enterprise_id in enterprise_ids
+            ]
+            for future in as_completed(futures):
+                enterprise_id, (enterprise_computed, enterprise_total) = future.result()
+                computed += enterprise_computed
+                total += enterprise_total
+                self.stdout.write(
+                    f"Empresa {enterprise_id}: {enterprise_computed}/{enterprise_total} profissionais-dia"
+                )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{computed} de {total} profissionais-dia calculados para {len(enterprise_ids)} "
+            f"empresas em {elapsed:.1f}s ({computed / elapsed if elapsed else 0:.0f}/s)."
+        ))
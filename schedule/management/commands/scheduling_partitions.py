@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from schedule import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Mantém as partições mensais da tabela de agendamentos: cria os meses "
+        "futuros e desanexa/arquiva os meses antigos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Converte a tabela atual em particionada (lock exclusivo, rodar em janela de manutenção).",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Quantos meses futuros devem ter partição criada (padrão: 3).",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            default=None,
+            help="Desanexa partições que terminaram há mais de N meses.",
+        )
+        parser.add_argument(
+            "--archive-tablespace",
+            default=None,
+            help="Move as partições desanexadas para este tablespace.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Só lista o que seria feito.",
+        )
+
+    def handle(self, *args, **options):
+        months_ahead = options["months_ahead"]
+        dry_run = options["dry_run"]
+
+        if options["convert"]:
+            if partitioning.is_partitioned():
+                raise CommandError("A tabela de agendamentos já é particionada.")
+            if dry_run:
+                self.stdout.write("Converteria a tabela de agendamentos para particionada.")
+                return
+
+            self.stdout.write("Convertendo a tabela de agendamentos (pode demorar)...")
+            partitioning.convert_to_partitioned(months_ahead=months_ahead)
+            self.stdout.write(self.style.SUCCESS("Tabela convertida para particionada."))
+
+        if not partitioning.is_partitioned():
+            raise CommandError(
+                "A tabela de agendamentos não é particionada. Rode com --convert primeiro."
+            )
+
+        # Meses futuros
+        if dry_run:
+            self.stdout.write(f"Garantiria partições para os próximos {months_ahead} meses.")
+        else:
+            created = partitioning.ensure_future_partitions(months_ahead)
+            self.stdout.write(f"Partições garantidas: {', '.join(created)}")
+
+        # Meses antigos
+        if options["retain_months"] is None:
+            return
+
+        old = partitioning.partitions_older_than(options["retain_months"])
+        if not old:
+            self.stdout.write("Nenhuma partição antiga para desanexar.")
+            return
+
+        for name in old:
+            if dry_run:
+                self.stdout.write(f"Desanexaria {name}")
+                continue
+
+            partitioning.detach_partition(name, tablespace=options["archive_tablespace"])
+            self.stdout.write(self.style.WARNING(f"Partição desanexada: {name}"))
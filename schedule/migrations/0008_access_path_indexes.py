@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:50
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0003_access_path_indexes'),
+        ('organization', '0009_access_path_indexes'),
+        ('schedule', '0007_remove_schedulingwindowinterval_window_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='scheduling',
+            index=models.Index(fields=['worker', 'date', 'start_time'], name='sched_worker_date_start_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='scheduling',
+            index=models.Index(fields=['enterprise', 'date', 'start_time', 'id'], name='sched_ent_date_start_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='worker',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['enterprise'], name='worker_active_enterprise_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:52
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0003_access_path_indexes'),
+        ('organization', '0009_access_path_indexes'),
+        ('schedule', '0008_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulingArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('appointment_ids', django.contrib.postgres.fields.ArrayField(base_field=models.UUIDField(), blank=True, default=list, size=None, verbose_name='Tipos de Atendimento')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('start_time', models.TimeField(verbose_name='Início')),
+                ('end_time', models.TimeField(blank=True, null=True, verbose_name='Horário de Fim')),
+                ('duration', models.PositiveIntegerField(default=0, verbose_name='Duração Total (min)')),
+                ('notes', models.TextField(blank=True, null=True, verbose_name='Observações')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arquivado em')),
+                ('client', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='clientes.client', verbose_name='Cliente')),
+                ('enterprise', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='organization.enterprise', verbose_name='Empresa')),
+                ('worker', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='schedule.worker', verbose_name='Profissional / Agenda')),
+            ],
+            options={
+                'verbose_name': 'Agendamento Arquivado',
+                'verbose_name_plural': 'Agendamentos Arquivados',
+                'db_table': 'schedule_scheduling_archive',
+                'ordering': ['date', 'start_time'],
+                'indexes': [models.Index(fields=['enterprise', 'date', 'start_time', 'id'], name='sched_arch_ent_date_idx')],
+            },
+        ),
+    ]
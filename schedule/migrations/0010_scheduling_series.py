@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:55
+
+from django.db import migrations, models
+
+from core.utils.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0003_access_path_indexes'),
+        ('organization', '0009_access_path_indexes'),
+        ('schedule', '0009_scheduling_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduling',
+            name='series_id',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='Série'),
+        ),
+        migrations.AddField(
+            model_name='schedulingarchive',
+            name='series_id',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Série'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='scheduling',
+            index=models.Index(condition=models.Q(('series_id__isnull', False)), fields=['series_id', 'date'], name='sched_series_date_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:56
+
+from django.db import migrations, models
+
+from core.utils.migration_operations import (
+    AddIndexConcurrentlyIfSupported,
+    RemoveIndexConcurrentlyIfSupported,
+)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0003_access_path_indexes'),
+        ('organization', '0009_access_path_indexes'),
+        ('schedule', '0010_scheduling_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduling',
+            name='status',
+            field=models.CharField(choices=[('booked', 'Agendado'), ('cancelled', 'Cancelado'), ('no_show', 'Não compareceu'), ('done', 'Concluído')], default='booked', max_length=10, verbose_name='Status'),
+        ),
+        migrations.AddField(
+            model_name='schedulingarchive',
+            name='status',
+            field=models.CharField(default='booked', max_length=10, verbose_name='Status'),
+        ),
+        # Novo índice parcial antes de remover o antigo: a consulta de
+        # disponibilidade nunca fica sem índice
+        AddIndexConcurrentlyIfSupported(
+            model_name='scheduling',
+            index=models.Index(condition=models.Q(('status__in', ('booked', 'done'))), fields=['worker', 'date', 'start_time'], name='sched_active_worker_date_idx'),
+        ),
+        RemoveIndexConcurrentlyIfSupported(
+            model_name='scheduling',
+            name='sched_worker_date_start_idx',
+        ),
+    ]
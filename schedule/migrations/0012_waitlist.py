@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:57
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0003_access_path_indexes'),
+        ('organization', '0009_access_path_indexes'),
+        ('schedule', '0011_scheduling_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('date_start', models.DateField(verbose_name='A partir de')),
+                ('date_end', models.DateField(verbose_name='Até')),
+                ('preferred_start', models.TimeField(blank=True, null=True, verbose_name='Preferência: início')),
+                ('preferred_end', models.TimeField(blank=True, null=True, verbose_name='Preferência: fim')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Ativo')),
+                ('notified_at', models.DateTimeField(blank=True, null=True, verbose_name='Último aviso')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('appointments', models.ManyToManyField(related_name='waitlist', to='schedule.appointment', verbose_name='Tipos de Atendimento')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='clientes.client', verbose_name='Cliente')),
+                ('enterprise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='organization.enterprise', verbose_name='Empresa')),
+                ('worker', models.ForeignKey(blank=True, help_text='Vazio = qualquer profissional.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='schedule.worker', verbose_name='Profissional / Agenda')),
+            ],
+            options={
+                'verbose_name': 'Lista de Espera',
+                'verbose_name_plural': 'Lista de Espera',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(condition=models.Q(('is_active', True)), fields=['worker', 'date_end', 'date_start'], name='waitlist_worker_date_idx'), models.Index(condition=models.Q(('is_active', True), ('worker__isnull', True)), fields=['enterprise', 'date_end', 'date_start'], name='waitlist_any_worker_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:40
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# auth.User não declara índices próprios: os do autocomplete de
+# profissionais (istartswith -> UPPER(col) LIKE 'X%') vão em SQL direto
+USER_PREFIX_COLUMNS = ("first_name", "last_name", "username")
+
+
+def user_prefix_index(column):
+    return migrations.RunSQL(
+        sql=(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "auth_user_{column}_upper_idx" '
+            f'ON "auth_user" (UPPER("{column}") text_pattern_ops)'
+        ),
+        reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS "auth_user_{column}_upper_idx"',
+    )
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação
+    atomic = False
+
+    dependencies = [
+        ('organization', '0009_access_path_indexes'),
+        ('schedule', '0012_waitlist'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='appointment',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='appointment_name_upper_idx'),
+        ),
+        *(user_prefix_index(column) for column in USER_PREFIX_COLUMNS),
+    ]
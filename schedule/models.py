@@ -1,7 +1,10 @@
 from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
 import uuid
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 from django.contrib.auth.models import User
 from organization.models import Enterprise
@@ -57,6 +60,10 @@ class Appointment(models.Model):
         verbose_name_plural = "Tipos de Atendimentos"
         ordering = ["name"]
         unique_together = ("enterprise", "name")
+        indexes = [
+            # autocomplete do admin: name__istartswith vira UPPER(name) LIKE 'X%'
+            models.Index(OpClass(Upper("name"), name="text_pattern_ops"), name="appointment_name_upper_idx"),
+        ]
 
     def clean(self):
         if not self.slug:
@@ -133,6 +140,13 @@ class Worker(models.Model):
         verbose_name = "Agenda"
         verbose_name_plural = "Agendas"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["enterprise"],
+                condition=models.Q(is_active=True),
+                name="worker_active_enterprise_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.user.get_full_name() or self.user.username
@@ -196,6 +210,21 @@ class WorkerAvailability(models.Model):
 # ============================================================
 class Scheduling(models.Model):
 
+    STATUS_BOOKED = "booked"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_NO_SHOW = "no_show"
+    STATUS_DONE = "done"
+
+    STATUS_CHOICES = [
+        (STATUS_BOOKED, "Agendado"),
+        (STATUS_CANCELLED, "Cancelado"),
+        (STATUS_NO_SHOW, "Não compareceu"),
+        (STATUS_DONE, "Concluído"),
+    ]
+
+    # Status que ocupam o horário do profissional
+    ACTIVE_STATUSES = (STATUS_BOOKED, STATUS_DONE)
+
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -244,6 +273,21 @@ class Scheduling(models.Model):
         verbose_name="Duração Total (min)"
     )
 
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_BOOKED,
+        verbose_name="Status",
+    )
+
+    # Agendamentos criados juntos por SchedulingService.create_series
+    series_id = models.UUIDField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Série",
+    )
+
     notes = models.TextField(blank=True, null=True, verbose_name="Observações")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
@@ -252,6 +296,25 @@ class Scheduling(models.Model):
         verbose_name = "Agendamento"
         verbose_name_plural = "Agendamentos"
         ordering = ["date", "start_time"]
+        indexes = [
+            # AvailableTimeService.get_existing_schedulings (só status ativos)
+            models.Index(
+                fields=["worker", "date", "start_time"],
+                name="sched_active_worker_date_idx",
+                condition=models.Q(status__in=("booked", "done")),  # ACTIVE_STATUSES
+            ),
+            # Changelist do admin (filtro por data + paginação keyset)
+            models.Index(
+                fields=["enterprise", "date", "start_time", "id"],
+                name="sched_ent_date_start_id_idx",
+            ),
+            # Edição / cancelamento em lote de uma série
+            models.Index(
+                fields=["series_id", "date"],
+                name="sched_series_date_idx",
+                condition=models.Q(series_id__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.worker} - {self.date} {self.start_time}"
@@ -292,3 +355,169 @@ class Scheduling(models.Model):
 
         # Salva novamente se end_time mudou
         super().save(update_fields=["duration", "end_time"])
+
+
+# ============================================================
+# LISTA DE ESPERA
+# ============================================================
+class WaitlistEntry(models.Model):
+    """
+    Cliente aguardando um horário: com um profissional específico (ou
+    qualquer um, se `worker` vazio), entre duas datas e, opcionalmente,
+    dentro de uma faixa de horário preferida.
+    """
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        unique=True
+    )
+
+    enterprise = models.ForeignKey(
+        Enterprise,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+        verbose_name="Empresa",
+    )
+
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+        verbose_name="Cliente",
+    )
+
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+        blank=True,
+        null=True,
+        verbose_name="Profissional / Agenda",
+        help_text="Vazio = qualquer profissional.",
+    )
+
+    appointments = models.ManyToManyField(
+        Appointment,
+        related_name="waitlist",
+        verbose_name="Tipos de Atendimento",
+    )
+
+    date_start = models.DateField(verbose_name="A partir de")
+    date_end = models.DateField(verbose_name="Até")
+
+    preferred_start = models.TimeField(blank=True, null=True, verbose_name="Preferência: início")
+    preferred_end = models.TimeField(blank=True, null=True, verbose_name="Preferência: fim")
+
+    is_active = models.BooleanField(default=True, verbose_name="Ativo")
+    notified_at = models.DateTimeField(blank=True, null=True, verbose_name="Último aviso")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Lista de Espera"
+        verbose_name_plural = "Lista de Espera"
+        ordering = ["created_at"]
+        indexes = [
+            # WaitlistService: entradas de um profissional ainda válidas
+            models.Index(
+                fields=["worker", "date_end", "date_start"],
+                name="waitlist_worker_date_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # ... e as de "qualquer profissional" da empresa
+            models.Index(
+                fields=["enterprise", "date_end", "date_start"],
+                name="waitlist_any_worker_date_idx",
+                condition=models.Q(is_active=True, worker__isnull=True),
+            ),
+        ]
+
+    def clean(self):
+        super().clean()
+
+        if self.date_start and self.date_end and self.date_end < self.date_start:
+            raise ValidationError("A data final deve ser igual ou posterior à inicial.")
+
+        if self.preferred_start and self.preferred_end and self.preferred_end <= self.preferred_start:
+            raise ValidationError("O fim da preferência deve ser posterior ao início.")
+
+    def __str__(self):
+        return f"{self.client} - {self.date_start} a {self.date_end}"
+
+
+# ============================================================
+# AGENDAMENTO ARQUIVADO (cold storage)
+# ============================================================
+class SchedulingArchive(models.Model):
+    """
+    Agendamentos antigos movidos pelo comando `archive_schedulings`.
+    Sem M2M: os ids dos atendimentos ficam inline em um array e as
+    referências não têm constraint (o histórico sobrevive a exclusões).
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False)
+
+    enterprise = models.ForeignKey(
+        Enterprise,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name="Empresa",
+    )
+
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name="Profissional / Agenda",
+    )
+
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+        verbose_name="Cliente",
+    )
+
+    appointment_ids = ArrayField(
+        models.UUIDField(),
+        default=list,
+        blank=True,
+        verbose_name="Tipos de Atendimento",
+    )
+
+    date = models.DateField(verbose_name="Data")
+    start_time = models.TimeField(verbose_name="Início")
+    end_time = models.TimeField(verbose_name="Horário de Fim", blank=True, null=True)
+    duration = models.PositiveIntegerField(default=0, verbose_name="Duração Total (min)")
+    notes = models.TextField(blank=True, null=True, verbose_name="Observações")
+    series_id = models.UUIDField(blank=True, null=True, verbose_name="Série")
+    status = models.CharField(max_length=10, default="booked", verbose_name="Status")
+
+    created_at = models.DateTimeField(verbose_name="Criado em")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arquivado em")
+
+    class Meta:
+        verbose_name = "Agendamento Arquivado"
+        verbose_name_plural = "Agendamentos Arquivados"
+        db_table = "schedule_scheduling_archive"
+        ordering = ["date", "start_time"]
+        indexes = [
+            models.Index(
+                fields=["enterprise", "date", "start_time", "id"],
+                name="sched_arch_ent_date_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.worker_id} - {self.date} {self.start_time}"
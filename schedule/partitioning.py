@@ -0,0 +1,240 @@
+"""
+Particionamento declarativo (RANGE por `date`, mensal) da tabela de agendamentos.
+
+A conversão é opt-in (`manage.py scheduling_partitions --convert`) porque exige
+lock exclusivo e cópia da tabela. Depois dela:
+
+- a PK física passa a ser (id, date) — exigência do PostgreSQL para
+  unicidade em tabela particionada; o Django continua usando `id`;
+- as FKs que apontavam para `schedule_scheduling` (ex: tabela M2M de
+  appointments) são removidas, pois não há unique só em `id`. A remoção em
+  cascata continua sendo feita pelo ORM;
+- consultas com filtro por `date` fazem partition pruning.
+"""
+import re
+from datetime import date
+
+from django.db import connections, transaction
+
+from core.utils.migration_operations import is_partitioned_table
+from schedule.models import Scheduling
+
+PARENT_TABLE = Scheduling._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+LEGACY_TABLE = f"{PARENT_TABLE}_legacy"
+
+
+# ============================================================
+# HELPERS DE DATA / NOME
+# ============================================================
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name):
+    """
+    Inverso de partition_name; None para nomes fora do padrão (ex: default).
+    """
+    match = re.fullmatch(rf"{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})", name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def month_range(first, last):
+    """
+    Meses de `first` até `last` (inclusive), ambos normalizados para o dia 1.
+    """
+    current, last = month_start(first), month_start(last)
+    while current <= last:
+        yield current
+        current = add_months(current, 1)
+
+
+# ============================================================
+# INTROSPECÇÃO
+# ============================================================
+def is_partitioned(using="default"):
+    return is_partitioned_table(connections[using], PARENT_TABLE)
+
+
+def list_partitions(using="default"):
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+              FROM pg_inherits i
+              JOIN pg_class parent ON parent.oid = i.inhparent
+              JOIN pg_class child ON child.oid = i.inhrelid
+             WHERE parent.relname = %s
+             ORDER BY child.relname
+            """,
+            [PARENT_TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+# ============================================================
+# MANUTENÇÃO DE PARTIÇÕES
+# ============================================================
+def table_exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [f'"{name}"'])
+    return cursor.fetchone()[0]
+
+
+def create_partition(month, using="default"):
+    """
+    Cria a partição do mês. Se a DEFAULT já guarda linhas desse mês
+    (agendamento além de --months-ahead), o CREATE ... PARTITION OF falharia
+    ("updated partition constraint for default partition would be
+    violated"): com a tabela travada, a DEFAULT é desanexada, a partição é
+    criada, as linhas do mês migram para ela e a DEFAULT volta.
+    """
+    start, end = month_start(month), add_months(month, 1)
+    name = partition_name(start)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        if table_exists(cursor, name):
+            return name
+
+        if not table_exists(cursor, DEFAULT_PARTITION):
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{PARENT_TABLE}" {bounds}')
+            return name
+
+        # bloqueia inserts na DEFAULT enquanto as linhas do mês mudam de lugar
+        cursor.execute(f'LOCK TABLE "{PARENT_TABLE}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+        cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{PARENT_TABLE}" {bounds}')
+        cursor.execute(
+            f'WITH moved AS ('
+            f'  DELETE FROM "{DEFAULT_PARTITION}" WHERE date >= %s AND date < %s RETURNING *'
+            f') INSERT INTO "{PARENT_TABLE}" SELECT * FROM moved',
+            [start, end],
+        )
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+    return name
+
+
+def detach_partition(name, tablespace=None, using="default"):
+    """
+    Desanexa a partição (a tabela continua existindo, fora das consultas).
+    Opcionalmente move para um tablespace de arquivo (storage mais barato).
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"')
+        if tablespace:
+            cursor.execute(f'ALTER TABLE "{name}" SET TABLESPACE "{tablespace}"')
+
+
+def ensure_future_partitions(months_ahead, today=None, using="default"):
+    today = today or date.today()
+    return [
+        create_partition(month, using=using)
+        for month in month_range(today, add_months(today, months_ahead))
+    ]
+
+
+def partitions_older_than(retain_months, today=None, using="default"):
+    """
+    Partições mensais que terminam antes de (mês atual - retain_months).
+    """
+    cutoff = add_months(month_start(today or date.today()), -retain_months)
+    old = []
+    for name in list_partitions(using=using):
+        month = partition_month(name)
+        if month and add_months(month, 1) <= cutoff:
+            old.append(name)
+    return old
+
+
+# ============================================================
+# CONVERSÃO DA TABELA EXISTENTE
+# ============================================================
+def convert_to_partitioned(months_ahead=3, today=None, using="default"):
+    """
+    Converte `schedule_scheduling` em tabela particionada por mês.
+    Roda em uma única transação (lock exclusivo durante a cópia).
+    """
+    connection = connections[using]
+    today = today or date.today()
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{PARENT_TABLE}" IN ACCESS EXCLUSIVE MODE')
+
+        # 1) FKs que referenciam a tabela (M2M etc.) não sobrevivem à nova PK
+        cursor.execute(
+            """
+            SELECT conrelid::regclass::text, conname
+              FROM pg_constraint
+             WHERE confrelid = %s::regclass AND contype = 'f'
+            """,
+            [PARENT_TABLE],
+        )
+        for table, constraint in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"')
+
+        # 2) Tabela antiga sai do caminho (índices renomeados liberam os nomes)
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" RENAME TO "{LEGACY_TABLE}"')
+
+        cursor.execute(
+            """
+            SELECT indexname, indexdef
+              FROM pg_indexes
+             WHERE tablename = %s AND indexdef NOT LIKE 'CREATE UNIQUE%%'
+            """,
+            [LEGACY_TABLE],
+        )
+        indexes = cursor.fetchall()
+        for index_name, _ in indexes:
+            cursor.execute(f'ALTER INDEX "{index_name}" RENAME TO "{index_name[:56]}_legacy"')
+
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+              FROM pg_constraint
+             WHERE conrelid = %s::regclass AND contype = 'f'
+            """,
+            [LEGACY_TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+
+        # 3) Nova tabela particionada com PK (id, date)
+        cursor.execute(
+            f'CREATE TABLE "{PARENT_TABLE}" (LIKE "{LEGACY_TABLE}" '
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) "
+            f"PARTITION BY RANGE (date)"
+        )
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ADD PRIMARY KEY (id, date)')
+
+        for constraint, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ADD CONSTRAINT "{constraint}" {definition}')
+
+        legacy_ref = re.compile(rf'ON (?:\S+\.)?"?{LEGACY_TABLE}"? ')
+        for _, index_def in indexes:
+            cursor.execute(legacy_ref.sub(f'ON "{PARENT_TABLE}" ', index_def, count=1))
+
+        # 4) Partições cobrindo o histórico + meses futuros + default
+        cursor.execute(f'SELECT MIN(date) FROM "{LEGACY_TABLE}"')
+        first_day = cursor.fetchone()[0] or today
+
+        for month in month_range(first_day, add_months(today, months_ahead)):
+            create_partition(month, using=using)
+
+        cursor.execute(
+            f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{PARENT_TABLE}" DEFAULT'
+        )
+
+        # 5) Copia os dados e remove a tabela antiga
+        cursor.execute(f'INSERT INTO "{PARENT_TABLE}" SELECT * FROM "{LEGACY_TABLE}"')
+        cursor.execute(f'DROP TABLE "{LEGACY_TABLE}"')
+        cursor.execute(f'ANALYZE "{PARENT_TABLE}"')
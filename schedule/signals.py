@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core.utils.commit_batch import on_commit_batch
+from organization.models import SchedulingConfig
+from schedule.domain.services.availability_cache import AvailabilityCacheService
+from schedule.domain.services.reference_cache import (
+    appointment_duration_cache,
+    overlap_tolerance_cache,
+    weekly_template_cache,
+)
+from schedule.domain.services.waitlist_service import WaitlistService
+from schedule.models import Appointment, Scheduling, WorkerAvailability
+
+
+# Um lote por transação: delete em cascata / queryset.delete() dispara um
+# sinal por linha, mas o aviso e a invalidação rodam uma vez no commit
+def _notify_freed_slots(slots):
+    # slot de savepoint desfeito: o agendamento voltou a ocupar o horário
+    still_booked = set(
+        Scheduling.objects.filter(
+            id__in=[slot["scheduling_id"] for slot in slots],
+            status__in=Scheduling.ACTIVE_STATUSES,
+        ).values_list("id", flat=True)
+    )
+    freed = [slot for slot in slots if slot["scheduling_id"] not in still_booked]
+    if freed:
+        WaitlistService.notify_freed_slots(freed)
+
+
+def _notify_waitlist(scheduling):
+    on_commit_batch("waitlist_freed_slots", [WaitlistService.freed_slot(scheduling)], _notify_freed_slots)
+
+
+def _bump_availability(*worker_days):
+    # após o commit: antes disso uma leitura recalcularia com dados velhos
+    worker_days = [wd for wd in worker_days if None not in wd]
+    on_commit_batch("availability_days", worker_days, AvailabilityCacheService.bump_days)
+
+
+# =====================================
+# 🔥 Estado carregado (para detectar mudanças no save)
+# =====================================
+@receiver(post_init, sender=Scheduling)
+def remember_loaded_status(sender, instance, **kwargs):
+    instance._loaded_status = instance.__dict__.get("status")
+    instance._loaded_worker_day = (
+        instance.__dict__.get("worker_id"),
+        instance.__dict__.get("date"),
+    )
+
+
+# =====================================
+# 🔥 Horário liberado → lista de espera / cache de disponibilidade
+# =====================================
+@receiver(post_save, sender=Scheduling)
+def notify_waitlist_on_status_change(sender, instance, created, update_fields=None, **kwargs):
+    _bump_availability(instance._loaded_worker_day, (instance.worker_id, instance.date))
+    instance._loaded_worker_day = (instance.worker_id, instance.date)
+
+    if created or (update_fields and "status" not in update_fields):
+        return
+
+    was_active = instance._loaded_status in Scheduling.ACTIVE_STATUSES
+    if was_active and instance.status not in Scheduling.ACTIVE_STATUSES:
+        _notify_waitlist(instance)
+
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Scheduling)
+def notify_waitlist_on_delete(sender, instance, **kwargs):
+    _bump_availability((instance.worker_id, instance.date))
+
+    if instance.status in Scheduling.ACTIVE_STATUSES:
+        _notify_waitlist(instance)
+
+
+# =====================================
+# 🔥 Grade semanal / tolerância / durações → invalida os caches
+# =====================================
+@receiver([post_save, post_delete], sender=WorkerAvailability)
+def invalidate_worker_availability(sender, instance, **kwargs):
+    worker_id = instance.worker_id
+
+    def invalidate():
+        weekly_template_cache.invalidate(worker_id)
+        AvailabilityCacheService.bump_worker(worker_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver([post_save, post_delete], sender=SchedulingConfig)
+def invalidate_scheduling_config(sender, instance, **kwargs):
+    enterprise_id = instance.enterprise_id
+
+    def invalidate():
+        overlap_tolerance_cache.invalidate(enterprise_id)
+        AvailabilityCacheService.bump_enterprise(enterprise_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver([post_save, post_delete], sender=Appointment)
+def invalidate_appointment_duration(sender, instance, **kwargs):
+    appointment_id = instance.id
+    transaction.on_commit(lambda: appointment_duration_cache.invalidate(appointment_id))
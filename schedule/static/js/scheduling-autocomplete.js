@@ -0,0 +1,13 @@
+// static/js/scheduling-autocomplete.js
+
+(function ($) {
+    $(function () {
+
+        // 🔥 select2 dispara apenas o "change" do jQuery; os scripts da tela
+        // usam addEventListener, então repassamos como evento nativo.
+        $("select.admin-autocomplete").on("select2:select select2:clear", function () {
+            this.dispatchEvent(new Event("change"));
+        });
+
+    });
+})(django.jQuery);
@@ -1,23 +1,125 @@
-(function() {
+// static/js/scheduling-filter-by-worker.js
+//
+// Preenche atendimentos do profissional e horários livres via JSON
+// (endpoints do SchedulingAdmin), sem recarregar a página do admin.
+
+(function () {
     document.addEventListener("DOMContentLoaded", function () {
-  
+
         const workerSelect = document.getElementById("id_worker");
-  
-        if (!workerSelect) return;
-  
-        workerSelect.addEventListener("change", function () {
-            const workerId = this.value;
-            const url = new URL(window.location.href);
-  
-            if (workerId) {
-                url.searchParams.set("worker", workerId);
-            } else {
-                url.searchParams.delete("worker");
+        const dateInput = document.getElementById("id_date");
+        const appointmentsBox = document.getElementById("id_appointments");
+        const scheduleOption = document.getElementById("id_schedule_option");
+
+        if (!workerSelect || !scheduleOption) return;
+
+        const slotsUrl = scheduleOption.dataset.slotsUrl;
+        const appointmentsUrl = scheduleOption.dataset.appointmentsUrl;
+
+        let lastSlotsQuery = null;
+        let slotsRequest = 0;
+
+        function selectedAppointments() {
+            if (!appointmentsBox) return [];
+            return Array.from(appointmentsBox.querySelectorAll("input[type=checkbox]:checked"))
+                .map(cb => cb.value);
+        }
+
+        function fillOptions(results, keep) {
+            scheduleOption.innerHTML = "";
+
+            const empty = document.createElement("option");
+            empty.value = "";
+            empty.textContent = "Selecione um horário";
+            scheduleOption.appendChild(empty);
+
+            results.forEach(function (item) {
+                const opt = document.createElement("option");
+                opt.value = item.id;
+                opt.textContent = item.text;
+                opt.selected = item.id === keep;
+                scheduleOption.appendChild(opt);
+            });
+        }
+
+        // ------------------------------------------------------
+        // Horários livres (profissional + data + atendimentos)
+        // ------------------------------------------------------
+        function loadSlots() {
+            const appointments = selectedAppointments();
+            const dateVal = dateInput ? dateInput.value : "";
+            const params = new URLSearchParams({
+                worker: workerSelect.value,
+                date: dateVal,
+                appointments: appointments.join(","),
+            });
+
+            if (params.toString() === lastSlotsQuery) return;
+            lastSlotsQuery = params.toString();
+
+            const keep = scheduleOption.value;
+            if (!workerSelect.value || !dateVal || appointments.length === 0) {
+                fillOptions([], keep);
+                return;
             }
-  
-            window.location.href = url.toString();
-        });
-  
+
+            // respostas fora de ordem são descartadas
+            const current = ++slotsRequest;
+            fetch(`${slotsUrl}?${params}`, { credentials: "same-origin" })
+                .then(response => response.json())
+                .then(function (data) {
+                    if (current === slotsRequest) fillOptions(data.results, keep);
+                });
+        }
+
+        // ------------------------------------------------------
+        // Atendimentos do profissional (recria os checkboxes)
+        // ------------------------------------------------------
+        function loadAppointments() {
+            if (!appointmentsBox) return;
+
+            appointmentsBox.innerHTML = "";
+            fillOptions([], "");
+            lastSlotsQuery = null;
+
+            if (!workerSelect.value) return;
+
+            const params = new URLSearchParams({ worker: workerSelect.value });
+            fetch(`${appointmentsUrl}?${params}`, { credentials: "same-origin" })
+                .then(response => response.json())
+                .then(function (data) {
+                    data.results.forEach(function (item, index) {
+                        const id = `id_appointments_${index}`;
+                        const wrapper = document.createElement("div");
+                        const label = document.createElement("label");
+                        const input = document.createElement("input");
+
+                        label.htmlFor = id;
+                        input.type = "checkbox";
+                        input.name = "appointments";
+                        input.value = item.id;
+                        input.id = id;
+
+                        label.appendChild(input);
+                        label.appendChild(document.createTextNode(` ${item.text}`));
+                        wrapper.appendChild(label);
+                        appointmentsBox.appendChild(wrapper);
+                    });
+                });
+        }
+
+        workerSelect.addEventListener("change", loadAppointments);
+
+        if (appointmentsBox) {
+            appointmentsBox.addEventListener("change", loadSlots);
+        }
+
+        if (dateInput) {
+            dateInput.addEventListener("change", loadSlots);
+            dateInput.addEventListener("blur", loadSlots);
+        }
+
+        // form reexibido (erro de validação / edição): carrega com o que já está marcado
+        loadSlots();
     });
-  })();
-  
\ No newline at end of file
+})();
@@ -0,0 +1,119 @@
+from datetime import date
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from schedule.domain.services.availability_cache import CACHE_TIMEOUT, MAX_STALE_SECONDS, AvailabilityCacheService
+
+
+@pytest.fixture
+def local_cache():
+    with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}), \
+            patch("core.utils.invalidation_bus.publish"):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+def test_only_bumped_worker_days_are_stale(local_cache):
+    day = date(2025, 3, 3)
+    worker_days = [("w1", day), ("w2", day)]
+
+    versions = AvailabilityCacheService.current_versions("e1", worker_days)
+    AvailabilityCacheService.store({wd: [] for wd in worker_days}, versions)
+    assert AvailabilityCacheService.stale_worker_days(versions) == []
+
+    AvailabilityCacheService.bump_days([("w2", day)])
+    versions = AvailabilityCacheService.current_versions("e1", worker_days)
+    assert AvailabilityCacheService.stale_worker_days(versions) == [("w2", day)]
+
+    AvailabilityCacheService.bump_enterprise("e1")
+    versions = AvailabilityCacheService.current_versions("e1", worker_days)
+    assert AvailabilityCacheService.stale_worker_days(versions) == worker_days
+
+
+def test_stale_entry_is_served_while_refreshing(local_cache):
+    day = date(2025, 3, 3)
+    stale = [{"start": "08:00", "end": "12:00"}]
+
+    versions = AvailabilityCacheService.current_versions("e1", [("w1", day)])
+    AvailabilityCacheService.store({("w1", day): stale}, versions)
+    AvailabilityCacheService.bump_days([("w1", day)])
+
+    with patch.object(AvailabilityCacheService, "refresh_in_background") as refresh, \
+            patch.object(AvailabilityCacheService, "compute") as compute:
+        assert AvailabilityCacheService.get_windows("w1", day, "e1") == stale
+
+    refresh.assert_called_once()
+    compute.assert_not_called()
+
+
+def test_waiter_uses_result_of_lock_holder(local_cache):
+    day = date(2025, 3, 3)
+    fresh = [{"start": "09:00", "end": "10:00"}]
+    version = AvailabilityCacheService.current_versions("e1", [("w1", day)])[("w1", day)]
+
+    # outra requisição já calcula este profissional/dia
+    assert AvailabilityCacheService._try_lock("w1", day)
+
+    def holder_finishes(_):
+        AvailabilityCacheService.store({("w1", day): fresh}, {("w1", day): version})
+
+    with patch("schedule.domain.services.availability_cache.time.sleep", side_effect=holder_finishes), \
+            patch.object(AvailabilityCacheService, "compute") as compute:
+        assert AvailabilityCacheService.compute_single_flight("e1", "w1", day, version) == fresh
+
+    compute.assert_not_called()
+
+
+def test_evicted_version_does_not_revive_old_entry(local_cache):
+    """
+    Sem a chave de versão (despejada pelo Redis) a leitura cria uma marca
+    nova: a entrada calculada antes não volta a ser considerada atual.
+    """
+    day = date(2025, 3, 3)
+    versions = AvailabilityCacheService.current_versions("e1", [("w1", day)])
+    AvailabilityCacheService.store({("w1", day): []}, versions)
+
+    cache.delete(AvailabilityCacheService.day_version_key("w1", day))
+
+    versions = AvailabilityCacheService.current_versions("e1", [("w1", day)])
+    assert AvailabilityCacheService.stale_worker_days(versions) == [("w1", day)]
+
+
+def test_stale_window_counts_from_invalidation(local_cache):
+    day = date(2025, 3, 3)
+    stale = [{"start": "08:00", "end": "12:00"}]
+    versions = AvailabilityCacheService.current_versions("e1", [("w1", day)])
+
+    # calculada há uma hora, invalidada agora: ainda pode ser servida
+    cache.set(
+        AvailabilityCacheService.windows_key("w1", day),
+        AvailabilityCacheService.encode_entry(versions[("w1", day)], stale, computed_at=time.time() - 3600),
+    )
+    AvailabilityCacheService.bump_days([("w1", day)])
+
+    with patch.object(AvailabilityCacheService, "refresh_in_background"):
+        assert AvailabilityCacheService.get_windows("w1", day, "e1") == stale
+
+    # invalidada além de MAX_STALE_SECONDS: recalcula antes de responder
+    later = time.time() + MAX_STALE_SECONDS + 1
+    with patch("schedule.domain.services.availability_cache.time.time", return_value=later), \
+            patch.object(AvailabilityCacheService, "compute_single_flight", return_value=[]) as compute:
+        assert AvailabilityCacheService.get_windows("w1", day, "e1") == []
+
+    compute.assert_called_once()
+
+
+def test_version_marks_expire(local_cache):
+    day = date(2025, 3, 3)
+
+    with patch.object(cache, "add", wraps=cache.add) as add, patch.object(cache, "set", wraps=cache.set) as set_:
+        AvailabilityCacheService.current_versions("e1", [("w1", day)])
+        AvailabilityCacheService.bump_days([("w1", day)])
+
+    timeouts = [call.kwargs["timeout"] for call in [*add.call_args_list, *set_.call_args_list]]
+    assert timeouts and all(t is not None and t >= CACHE_TIMEOUT for t in timeouts)
@@ -0,0 +1,204 @@
+import random
+from datetime import date, time, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+
+from clientes.models import Client
+from core.utils.query_plan import explain, iter_plan_nodes, scanned_relations, seq_scanned_relations
+from management.models import Contract
+from organization.models import Member
+from schedule import partitioning
+from schedule.domain.services.available_time_service import AvailableTimeService
+from schedule.models import Scheduling, Worker
+
+
+ENTERPRISES = 5
+WORKERS_PER_ENTERPRISE = 5
+CLIENTS_PER_ENTERPRISE = 400
+MEMBERS_PER_ENTERPRISE = 1000
+DAYS = 365
+FIRST_DAY = date(2025, 1, 1)
+
+
+@pytest.fixture
+def seeded_dataset(db):
+    """
+    Massa de dados com seletividade parecida com produção:
+    várias empresas, profissionais, clientes e um ano de agendamentos.
+    """
+    rng = random.Random(42)
+    roles = [r for r, _ in Member.ROLE_CHOICES if r != "owner"]
+    enterprises, workers = [], []
+
+    for e in range(ENTERPRISES):
+        owner = User.objects.create(username=f"owner{e}", email=f"owner{e}@x.com")
+        enterprise = Contract.objects.create(domain=f"empresa-{e}", user=owner).enterprise
+        enterprises.append(enterprise)
+
+        Member.objects.bulk_create([
+            Member(
+                enterprise=enterprise,
+                name=f"Membro {i}",
+                email=f"m{i}@e{e}.com",
+                role=rng.choice(roles),
+            )
+            for i in range(MEMBERS_PER_ENTERPRISE)
+        ])
+
+        clients = Client.objects.bulk_create([
+            Client(enterprise=enterprise, name=f"Cliente {i:05d}", name_search=f"cliente {i:05d}")
+            for i in range(CLIENTS_PER_ENTERPRISE)
+        ])
+
+        enterprise_workers = [
+            Worker.objects.create(
+                enterprise=enterprise,
+                user=User.objects.create(username=f"w{e}-{w}"),
+            )
+            for w in range(WORKERS_PER_ENTERPRISE)
+        ]
+        workers.extend(enterprise_workers)
+
+        Scheduling.objects.bulk_create([
+            Scheduling(
+                enterprise=enterprise,
+                worker=worker,
+                client=rng.choice(clients),
+                date=FIRST_DAY + timedelta(days=d),
+                start_time=time(hour),
+                end_time=time(hour, 30),
+                duration=30,
+            )
+            for worker in enterprise_workers
+            for d in range(DAYS)
+            for hour in rng.sample(range(8, 18), 3)
+        ], batch_size=5000)
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return {"enterprises": enterprises, "workers": workers}
+
+
+def convert_to_partitioned(**kwargs):
+    # O comando roda em transação própria; aqui as FKs adiadas dos inserts do
+    # teste ainda estão pendentes e o ALTER TABLE seria recusado
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    partitioning.convert_to_partitioned(**kwargs)
+
+
+def assert_no_seq_scan(queryset, table):
+    scanned = seq_scanned_relations(queryset)
+    assert table not in scanned, f"Seq Scan em {table}: {queryset.query}"
+
+
+@pytest.mark.django_db
+def test_availability_lookup_uses_index(seeded_dataset):
+    worker = seeded_dataset["workers"][0]
+    qs = AvailableTimeService.get_existing_schedulings(
+        worker.id, FIRST_DAY + timedelta(days=100), worker.enterprise_id
+    )
+    assert_no_seq_scan(qs, "schedule_scheduling")
+
+
+@pytest.mark.django_db
+def test_availability_lookup_uses_partial_index_with_cancellations(seeded_dataset):
+    worker = seeded_dataset["workers"][0]
+    Scheduling.objects.filter(worker=worker, date__lt=FIRST_DAY + timedelta(days=DAYS // 2)).update(
+        status=Scheduling.STATUS_CANCELLED
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE schedule_scheduling")
+
+    qs = AvailableTimeService.get_existing_schedulings(
+        worker.id, FIRST_DAY + timedelta(days=100), worker.enterprise_id
+    )
+    assert not qs.exists()
+    assert "sched_active_worker_date_idx" in {
+        node.get("Index Name") for node in iter_plan_nodes(explain(qs))
+    }
+
+
+@pytest.mark.django_db
+def test_admin_scheduling_changelist_uses_index(seeded_dataset):
+    enterprise = seeded_dataset["enterprises"][0]
+    day = FIRST_DAY + timedelta(days=200)
+    qs = Scheduling.objects.filter(
+        enterprise_id=enterprise.id,
+        date__gte=day,
+        date__lt=day + timedelta(days=1),
+    ).order_by("date", "start_time", "id")[:101]
+    assert_no_seq_scan(qs, "schedule_scheduling")
+
+
+@pytest.mark.django_db
+def test_client_keyset_page_uses_index(seeded_dataset):
+    enterprise = seeded_dataset["enterprises"][0]
+    qs = Client.objects.filter(enterprise_id=enterprise.id).order_by("name", "id")[:101]
+    assert_no_seq_scan(qs, "clientes_client")
+
+
+@pytest.mark.django_db
+def test_member_lookups_use_index(seeded_dataset):
+    enterprise = seeded_dataset["enterprises"][0]
+    owner = enterprise.contract.user
+
+    assert_no_seq_scan(Member.objects.filter(user=owner), "organization_member")
+    assert_no_seq_scan(
+        Member.objects.filter(enterprise=enterprise, role="owner"),
+        "organization_member",
+    )
+
+
+@pytest.mark.django_db
+def test_date_filtered_queries_prune_to_one_partition(seeded_dataset):
+    convert_to_partitioned(months_ahead=1, today=FIRST_DAY + timedelta(days=DAYS))
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    worker = seeded_dataset["workers"][0]
+    day = FIRST_DAY + timedelta(days=100)
+    expected = {partitioning.partition_name(day)}
+
+    availability = AvailableTimeService.get_existing_schedulings(
+        worker.id, day, worker.enterprise_id
+    )
+    assert scanned_relations(availability) == expected
+
+    changelist = Scheduling.objects.filter(
+        enterprise_id=worker.enterprise_id,
+        date__gte=day,
+        date__lt=day + timedelta(days=1),
+    ).order_by("date", "start_time", "id")[:101]
+    assert scanned_relations(changelist) == expected
+
+
+@pytest.mark.django_db
+def test_new_partition_takes_rows_already_in_default():
+    owner = User.objects.create(username="owner-default-partition")
+    enterprise = Contract.objects.create(domain="empresa-default-partition", user=owner).enterprise
+    worker = Worker.objects.create(enterprise=enterprise, user=User.objects.create(username="w-default"))
+    client = Client.objects.create(enterprise=enterprise, name="Cliente Default")
+
+    today = date(2025, 1, 15)
+    far = date(2025, 12, 10)  # além de months_ahead: cai na DEFAULT
+    booking = Scheduling.objects.create(
+        enterprise=enterprise, worker=worker, client=client, date=far, start_time=time(9),
+    )
+
+    convert_to_partitioned(months_ahead=1, today=today)
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM "{partitioning.DEFAULT_PARTITION}"')
+        assert cursor.fetchone()[0] == 1
+
+    partitioning.ensure_future_partitions(months_ahead=11, today=today)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM "{partitioning.DEFAULT_PARTITION}"')
+        assert cursor.fetchone()[0] == 0
+        cursor.execute(f'SELECT id FROM "{partitioning.partition_name(far)}"')
+        assert [row[0] for row in cursor.fetchall()] == [booking.id]
+    assert partitioning.DEFAULT_PARTITION in partitioning.list_partitions()
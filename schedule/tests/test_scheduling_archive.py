@@ -0,0 +1,71 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from clientes.models import Client
+from management.models import Contract
+from schedule.domain.services.scheduling_archive_service import SchedulingArchiveService
+from schedule.models import Appointment, Scheduling, SchedulingArchive, Worker
+
+
+@pytest.mark.django_db
+def test_archive_moves_old_schedulings_with_appointment_ids():
+    owner = User.objects.create(username="owner-archive")
+    enterprise = Contract.objects.create(domain="empresa-arquivo", user=owner).enterprise
+    worker = Worker.objects.create(enterprise=enterprise, user=User.objects.create(username="w-archive"))
+    client = Client.objects.create(enterprise=enterprise, name="Cliente Arquivo")
+    appointment = Appointment.objects.create(enterprise=enterprise, name="Corte", duration=30, price=Decimal("30.00"))
+
+    cutoff = date(2025, 6, 1)
+    old = Scheduling.objects.create(
+        enterprise=enterprise, worker=worker, client=client,
+        date=cutoff - timedelta(days=30), start_time=time(9),
+    )
+    old.appointments.set([appointment])
+    recent = Scheduling.objects.create(
+        enterprise=enterprise, worker=worker, client=client,
+        date=cutoff, start_time=time(9),
+    )
+
+    totals = list(SchedulingArchiveService.archive_before(cutoff, batch_size=1))
+
+    assert totals == [1]
+    assert list(Scheduling.objects.values_list("id", flat=True)) == [recent.id]
+    assert not Scheduling.appointments.through.objects.filter(scheduling_id=old.id).exists()
+
+    archived = SchedulingArchive.objects.get(id=old.id)
+    assert archived.appointment_ids == [appointment.id]
+    assert archived.client_id == client.id
+
+
+@pytest.mark.django_db
+def test_archive_keeps_live_row_when_id_already_archived(caplog):
+    owner = User.objects.create(username="owner-archive-conflict")
+    enterprise = Contract.objects.create(domain="empresa-arquivo-conflito", user=owner).enterprise
+    worker = Worker.objects.create(enterprise=enterprise, user=User.objects.create(username="w-archive-conflict"))
+    client = Client.objects.create(enterprise=enterprise, name="Cliente Conflito")
+
+    cutoff = date(2025, 6, 1)
+    conflicting, other = (
+        Scheduling.objects.create(
+            enterprise=enterprise, worker=worker, client=client,
+            date=cutoff - timedelta(days=days), start_time=time(9),
+        )
+        for days in (30, 20)
+    )
+    SchedulingArchive.objects.create(
+        id=conflicting.id, enterprise=enterprise, date=conflicting.date,
+        start_time=time(8), notes="cópia antiga", created_at=timezone.now(),
+    )
+
+    with caplog.at_level("WARNING"):
+        totals = list(SchedulingArchiveService.archive_before(cutoff, batch_size=1))
+
+    assert totals == [1]
+    assert list(Scheduling.objects.values_list("id", flat=True)) == [conflicting.id]
+    assert SchedulingArchive.objects.get(id=conflicting.id).notes == "cópia antiga"
+    assert SchedulingArchive.objects.filter(id=other.id).exists()
+    assert str(conflicting.id) in caplog.text
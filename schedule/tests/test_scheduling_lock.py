@@ -25,11 +25,6 @@ def test_redis_lock_blocks_concurrent_creates():
     # captura de timestamps para validar ordem de execução
     execution_order = []
 
-    # mock de retorno do generate_time_ranges
-    fake_ranges = {
-        1: {"horario_inicio": "10:00", "horario_fim": "10:30"}
-    }
-
     # simula delay no agendamento para que o lock faça efeito
     def fake_create_side_effect(*args, **kwargs):
         execution_order.append("enter")
@@ -40,11 +35,13 @@ def test_redis_lock_blocks_concurrent_creates():
         return mock_sched
 
     with patch(
-        "schedule.domain.services.scheduling_service.AvailableTimeService.generate_time_ranges",
-        return_value=fake_ranges
+        "schedule.domain.services.scheduling_service.AvailableTimeService.is_slot_available",
+        return_value=True
     ), patch(
         "schedule.models.Scheduling.objects.create",
         side_effect=fake_create_side_effect
+    ), patch(
+        "schedule.domain.services.scheduling_service.OutboxService.record"
     ):
 
         # --- THREAD 1 ---
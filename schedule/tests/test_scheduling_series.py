@@ -0,0 +1,95 @@
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from schedule.domain.services.scheduling_service import SchedulingService, SeriesConflictError
+
+
+def test_series_dates_by_occurrences_and_until():
+    start = date(2025, 3, 4)  # terça
+
+    assert SchedulingService.series_dates(start, occurrences=3) == [
+        date(2025, 3, 4), date(2025, 3, 11), date(2025, 3, 18),
+    ]
+    assert SchedulingService.series_dates(start, until=date(2025, 3, 17)) == [
+        date(2025, 3, 4), date(2025, 3, 11),
+    ]
+
+    with pytest.raises(ValueError):
+        SchedulingService.series_dates(start)
+
+
+@pytest.mark.django_db(transaction=False)
+def test_create_series_reports_all_conflicts_before_writing():
+    available = {
+        date(2025, 3, 4): True,
+        date(2025, 3, 11): False,
+        date(2025, 3, 18): True,
+        date(2025, 3, 25): False,
+    }
+
+    with patch(
+        "schedule.domain.services.scheduling_service.redis_lock"
+    ), patch(
+        "schedule.domain.services.scheduling_service.AvailableTimeService.get_total_duration",
+        return_value=30,
+    ), patch(
+        "schedule.domain.services.scheduling_service.AvailableTimeService.start_available_on_dates",
+        return_value=available,
+    ), patch(
+        "schedule.models.Scheduling.objects.bulk_create"
+    ) as bulk_create:
+
+        with pytest.raises(SeriesConflictError) as exc:
+            SchedulingService.create_series(
+                "worker", "client", ["appt"], date(2025, 3, 4), "10:00", "enterprise",
+                occurrences=4,
+            )
+
+    assert exc.value.conflicts == [date(2025, 3, 11), date(2025, 3, 25)]
+    bulk_create.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=False)
+def test_create_series_accepts_off_grid_start_that_fits():
+    """
+    09:20 não está na grade de sugestões (primeiro horário + horas cheias),
+    mas cabe na janela livre: aceito na série como em create. Na data em
+    que um agendamento cobre o intervalo, vira conflito.
+    """
+    first = date.today() + timedelta(days=7)
+    dates = [first, first + timedelta(days=7)]
+    busy = {dates[1]: [SimpleNamespace(start_time=time(9), end_time=time(10))]}
+
+    with patch(
+        "schedule.domain.services.scheduling_service.redis_lock"
+    ), patch(
+        "schedule.domain.services.available_time_service.AvailableTimeService.get_total_duration",
+        return_value=30,
+    ), patch(
+        "schedule.domain.services.available_time_service.ReferenceCacheService.weekly_templates",
+        return_value={"worker": None},
+    ), patch(
+        "schedule.domain.services.available_time_service.AvailableTimeService.window_for_day",
+        return_value=[{"start": "08:00", "end": "12:00"}],
+    ), patch(
+        "schedule.domain.services.available_time_service.AvailableTimeService.get_overlap_tolerance",
+        return_value=0,
+    ), patch(
+        "schedule.domain.services.available_time_service.AvailableTimeService.existing_by_date",
+        return_value=busy,
+    ), patch(
+        "schedule.models.Scheduling.objects.bulk_create"
+    ), patch(
+        "schedule.domain.services.scheduling_service.OutboxService.record_many"
+    ):
+        result = SchedulingService.create_series(
+            "worker", "client", [], first, "09:20", "enterprise",
+            occurrences=2, skip_conflicts=True,
+        )
+
+    assert [s.date for s in result["created"]] == [first]
+    assert result["created"][0].start_time == time(9, 20)
+    assert result["conflicts"] == [dates[1]]
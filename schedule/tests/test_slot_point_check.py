@@ -0,0 +1,50 @@
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from schedule.domain.services.available_time_service import AvailableTimeService
+
+DAY = date.today() + timedelta(days=7)
+
+
+def check(start, overlapping, duration=60, tolerance=0):
+    booked = [SimpleNamespace(start_time=s, end_time=e) for s, e in overlapping]
+
+    with patch.object(AvailableTimeService, "get_total_duration", return_value=duration), \
+            patch.object(AvailableTimeService, "get_schedule_window",
+                         return_value=[{"start": "08:00", "end": "12:00"}]), \
+            patch.object(AvailableTimeService, "get_overlap_tolerance", return_value=tolerance), \
+            patch("schedule.models.Scheduling.objects.filter") as filter_:
+        filter_.return_value.exclude.return_value.only.return_value = booked
+        return AvailableTimeService.is_slot_available("w1", DAY, start, ["a1"], "e1")
+
+
+@pytest.mark.parametrize("start, overlapping, tolerance, expected", [
+    (time(9, 0), [], 0, True),
+    (time(11, 30), [], 0, False),                        # passa do fim da janela
+    (time(7, 30), [], 0, False),                         # antes da janela
+    (time(9, 0), [(time(9, 30), time(10, 0))], 0, False),
+    (time(9, 0), [(time(9, 50), time(10, 30))], 10, True),  # cabe na tolerância
+])
+def test_point_check(start, overlapping, tolerance, expected):
+    assert check(start, overlapping, tolerance=tolerance) is expected
+
+
+@pytest.mark.django_db
+def test_create_uses_the_same_point_check_as_the_form():
+    from schedule.domain.services.scheduling_service import SchedulingService
+
+    with patch.object(AvailableTimeService, "is_slot_available", return_value=True) as point_check, \
+            patch("schedule.models.Scheduling.objects.create") as create, \
+            patch("schedule.domain.services.scheduling_service.OutboxService.record"):
+        SchedulingService.create("w1", None, ["a1"], DAY, "09:20", "e1")
+
+    # 09:20 não está na grade de sugestões, mas cabe numa janela livre
+    point_check.assert_called_once_with("w1", DAY, time(9, 20), ["a1"], "e1")
+    assert create.call_args.kwargs["start_time"] == time(9, 20)
+
+    with patch.object(AvailableTimeService, "is_slot_available", return_value=False), \
+            pytest.raises(ValueError):
+        SchedulingService.create("w1", None, ["a1"], DAY, "09:20", "e1")
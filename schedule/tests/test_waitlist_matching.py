@@ -0,0 +1,129 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth.models import User
+
+from clientes.models import Client
+from management.models import Contract
+from schedule.domain.services.waitlist_service import WaitlistService
+from schedule.models import Appointment, Scheduling, WaitlistEntry, Worker
+from schedule.domain.services.availability_cache import AvailabilityCacheService
+
+
+SLOT = {
+    "scheduling_id": "s1",
+    "enterprise_id": "e1",
+    "worker_id": "w1",
+    "date": date(2025, 5, 6),
+    "start_time": time(10),
+    "end_time": time(11),
+}
+
+
+def make_entry(**overrides):
+    fields = dict(
+        enterprise_id="e1",
+        worker_id=None,
+        date_start=date(2025, 5, 1),
+        date_end=date(2025, 5, 31),
+        preferred_start=None,
+        preferred_end=None,
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def appointment(id, duration):
+    return SimpleNamespace(id=id, duration=duration)
+
+
+def test_entry_matches_overlapping_slot():
+    entry = make_entry(preferred_start=time(9), preferred_end=time(10, 30))
+    assert WaitlistService.entry_matches(entry, SLOT, [appointment("a", 60)], {"a"})
+
+
+def test_entry_rejected_by_worker_hours_services_or_duration():
+    services = [appointment("a", 30)]
+
+    assert not WaitlistService.entry_matches(make_entry(worker_id="w2"), SLOT, services, {"a"})
+    assert not WaitlistService.entry_matches(make_entry(preferred_end=time(10)), SLOT, services, {"a"})
+    assert not WaitlistService.entry_matches(make_entry(), SLOT, services, {"b"})
+    assert not WaitlistService.entry_matches(make_entry(), SLOT, [appointment("a", 90)], {"a"})
+
+
+@pytest.mark.django_db
+def test_two_freed_slots_notify_an_entry_once():
+    owner = User.objects.create(username="owner-waitlist")
+    enterprise = Contract.objects.create(domain="empresa-waitlist", user=owner).enterprise
+    service = Appointment.objects.create(enterprise=enterprise, name="Corte", duration=30, price=Decimal("30.00"))
+    worker = Worker.objects.create(enterprise=enterprise, user=User.objects.create(username="w-waitlist"))
+    worker.appointments.set([service])
+    client = Client.objects.create(enterprise=enterprise, name="Cliente Espera")
+
+    day = date.today() + timedelta(days=3)
+    entry = WaitlistEntry.objects.create(
+        enterprise=enterprise, client=client, worker=worker, date_start=day, date_end=day,
+    )
+    entry.appointments.set([service])
+
+    def slot(start, end):
+        return {
+            "scheduling_id": "s", "enterprise_id": enterprise.id, "worker_id": worker.id,
+            "date": day, "start_time": start, "end_time": end,
+        }
+
+    with patch("infra.messaging.async_publisher.enqueue_message", return_value=True) as enqueue:
+        assert WaitlistService.notify_freed_slots([slot(time(9), time(10))]) == 1
+        assert WaitlistService.notify_freed_slots([slot(time(14), time(15))]) == 0
+
+    enqueue.assert_called_once()
+    entry.refresh_from_db()
+    assert entry.notified_at is not None
+
+
+def test_status_is_read_only_in_the_change_form():
+    """
+    Salvar o form não passa por change_status (sem outbox nem aviso à lista
+    de espera): o status só muda pelas ações do changelist.
+    """
+    model_admin = admin.site._registry[Scheduling]
+    request = SimpleNamespace(user=SimpleNamespace(is_superuser=True))
+
+    assert "status" in model_admin.get_readonly_fields(request, obj=Scheduling())
+    assert "status" not in model_admin.get_readonly_fields(request, obj=None)
+    assert {"mark_cancelled", "mark_no_show", "mark_done"} <= set(model_admin.actions)
+
+
+@pytest.mark.django_db
+def test_cascade_delete_notifies_waitlist_once_per_transaction(django_capture_on_commit_callbacks):
+    """
+    Apagar o profissional apaga os agendamentos em cascata (um post_delete
+    por linha): o aviso à lista de espera e a invalidação do cache saem
+    num único lote no commit.
+    """
+    owner = User.objects.create(username="owner-cascade")
+    enterprise = Contract.objects.create(domain="empresa-cascade", user=owner).enterprise
+    worker = Worker.objects.create(enterprise=enterprise, user=User.objects.create(username="w-cascade"))
+    client = Client.objects.create(enterprise=enterprise, name="Cliente Cascata")
+
+    day = date.today() + timedelta(days=3)
+    with django_capture_on_commit_callbacks(execute=True):
+        for hour in (9, 10, 11):
+            Scheduling.objects.create(
+                enterprise=enterprise, worker=worker, client=client,
+                date=day, start_time=time(hour), end_time=time(hour, 30),
+            )
+
+    with patch.object(WaitlistService, "notify_freed_slots") as notify, \
+            patch.object(AvailabilityCacheService, "bump_days") as bump, \
+            django_capture_on_commit_callbacks(execute=True) as callbacks:
+        worker.delete()
+
+    assert len(callbacks) == 2
+    notify.assert_called_once()
+    assert sorted(slot["start_time"] for slot in notify.call_args.args[0]) == [time(9), time(10), time(11)]
+    bump.assert_called_once()
@@ -0,0 +1,25 @@
+from django import forms
+from django.contrib.admin.widgets import AutocompleteSelect
+
+
+class EnterpriseAutocompleteSelect(AutocompleteSelect):
+    """
+    Select2 do admin apontando para um endpoint próprio (escopado pela
+    enterprise da sessão) em vez do `admin:autocomplete` padrão.
+
+    Só renderiza a opção selecionada; as demais vêm paginadas via AJAX,
+    então o HTML não cresce com o tamanho do tenant.
+    """
+
+    def __init__(self, field, admin_site, url, attrs=None, choices=(), using=None):
+        super().__init__(field, admin_site, attrs=attrs, choices=choices, using=using)
+        self.url = url
+
+    def get_url(self):
+        return self.url
+
+    @property
+    def media(self):
+        return super().media + forms.Media(
+            js=("admin/js/jquery.init.js", "js/scheduling-autocomplete.js")
+        )